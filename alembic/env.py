@@ -3,6 +3,7 @@ from sqlalchemy import create_engine
 from alembic import context
 from app.db.base import Base
 from app.core.config import settings
+from app.db.partitioning import is_partition
 import app.models.users # Import all models here
 import app.models.events 
 import app.models.venues
@@ -11,12 +12,22 @@ import app.models.event_seats
 import app.models.bookings
 import app.models.booking_seats
 import app.models.payments
+import app.models.event_archives
+import app.models.booking_seat_archives
+import app.models.seat_holds
+import app.models.outbox_events
 # Alembic Config
 config = context.config
 fileConfig(config.config_file_name)
 
 target_metadata = Base.metadata
 
+def include_object(object, name, type_, reflected, compare_to):
+    # Hash partitions are created by migrations, not declared as models
+    if type_ == "table" and reflected and compare_to is None and is_partition(name):
+        return False
+    return True
+
 DATABASE_URL = (
     f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
     f"@{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
@@ -26,6 +37,7 @@ def run_migrations_offline():
     context.configure(
         url=DATABASE_URL,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
     )
     with context.begin_transaction():
@@ -34,7 +46,7 @@ def run_migrations_offline():
 def run_migrations_online():
     engine = create_engine(DATABASE_URL)
     with engine.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
         with context.begin_transaction():
             context.run_migrations()
 
@@ -0,0 +1,48 @@
+"""add archive tables
+
+Revision ID: 10476e5dd26b
+Revises: 8b1e6f0d2c57
+Create Date: 2026-10-19 15:21:09.604417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '10476e5dd26b'
+down_revision: Union[str, Sequence[str], None] = '8b1e6f0d2c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_archives',
+    sa.Column('event_id', sa.UUID(), nullable=False),
+    sa.Column('total_seats', sa.Integer(), nullable=False),
+    sa.Column('booked_seats', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('purged_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('event_id')
+    )
+    op.create_table('booking_seat_archives',
+    sa.Column('booking_id', sa.UUID(), nullable=False),
+    sa.Column('event_id', sa.UUID(), nullable=False),
+    sa.Column('seat_labels', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('booking_id')
+    )
+    op.create_index('ix_booking_seat_archives_event_id', 'booking_seat_archives', ['event_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_booking_seat_archives_event_id', table_name='booking_seat_archives')
+    op.drop_table('booking_seat_archives')
+    op.drop_table('event_archives')
@@ -0,0 +1,64 @@
+"""add hot path indexes
+
+Revision ID: 3f9d2c41a7e8
+Revises: 57cfe8c03bbc
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9d2c41a7e8'
+down_revision: Union[str, Sequence[str], None] = '57cfe8c03bbc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns) for the lookups the services run on every request.
+# booking_seats(booking_id) is already served by the unique_booking_seat
+# (booking_id, event_seat_id) index, so it gets no index of its own.
+HOT_PATH_INDEXES = [
+    ('ix_event_seats_event_id_status', 'event_seats', ['event_id', 'status']),
+    ('ix_booking_seats_event_seat_id', 'booking_seats', ['event_seat_id']),
+    ('ix_bookings_user_id', 'bookings', ['user_id']),
+    ('ix_bookings_status_created_at', 'bookings', ['status', 'created_at']),
+    ('ix_payments_booking_id', 'payments', ['booking_id']),
+    ('ix_seats_venue_id_row_no', 'seats', ['venue_id', 'row_no']),
+    ('ix_events_venue_id_start_time', 'events', ['venue_id', 'start_time']),
+]
+
+# Plain indexes on primary keys, duplicating the primary key's own index
+DUPLICATE_PK_INDEXES = [
+    ('ix_users_id', 'users'),
+    ('ix_venues_id', 'venues'),
+    ('ix_events_id', 'events'),
+    ('ix_seats_id', 'seats'),
+    ('ix_bookings_id', 'bookings'),
+    ('ix_event_seats_id', 'event_seats'),
+    ('ix_booking_seats_id', 'booking_seats'),
+    ('ix_payments_id', 'payments'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the tables writable while the indexes build, but it
+    # cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in HOT_PATH_INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+        for name, table in DUPLICATE_PK_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table in DUPLICATE_PK_INDEXES:
+            op.create_index(name, table, ['id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, columns in reversed(HOT_PATH_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,37 @@
+"""add seat holds
+
+Revision ID: 4d8b3a6e1f25
+Revises: c7a4e2b91d03
+Create Date: 2026-10-19 17:21:44.903118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d8b3a6e1f25'
+down_revision: Union[str, Sequence[str], None] = 'c7a4e2b91d03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('seat_holds',
+    sa.Column('event_id', sa.UUID(), nullable=False),
+    sa.Column('seat_id', sa.UUID(), nullable=False),
+    sa.Column('owner', sa.String(length=100), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('event_id', 'seat_id')
+    )
+    op.create_index('ix_seat_holds_expires_at', 'seat_holds', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_seat_holds_expires_at', table_name='seat_holds')
+    op.drop_table('seat_holds')
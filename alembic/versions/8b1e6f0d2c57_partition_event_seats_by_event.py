@@ -0,0 +1,138 @@
+"""partition event seats by event
+
+Revision ID: 8b1e6f0d2c57
+Revises: 3f9d2c41a7e8
+Create Date: 2026-10-19 14:03:27.511902
+
+Rebuilds event_seats and booking_seats as tables hash-partitioned on
+event_id. The rows are copied over while both tables are locked, so run this
+in a maintenance window on large databases.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e6f0d2c57'
+down_revision: Union[str, Sequence[str], None] = '3f9d2c41a7e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITION_COUNT = 16
+
+# Indexes (including constraint-backed ones) whose names must be freed before
+# the replacement table can reuse them. Foreign keys are named explicitly below
+# so Postgres does not pick suffixed names while both copies exist.
+EVENT_SEAT_INDEXES = ['event_seats_pkey', 'unique_event_seat', 'ix_event_seats_event_id_status']
+BOOKING_SEAT_INDEXES = ['booking_seats_pkey', 'unique_booking_seat', 'ix_booking_seats_event_seat_id']
+
+
+def _move_aside(table: str, indexes: list, suffix: str) -> None:
+    op.rename_table(table, f'{table}_{suffix}')
+    for index in indexes:
+        op.execute(f'ALTER INDEX {index} RENAME TO {index}_{suffix}')
+
+
+def _create_partitions(table: str) -> None:
+    for remainder in range(PARTITION_COUNT):
+        op.execute(
+            f'CREATE TABLE {table}_p{remainder} PARTITION OF {table} '
+            f'FOR VALUES WITH (MODULUS {PARTITION_COUNT}, REMAINDER {remainder})'
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _move_aside('booking_seats', BOOKING_SEAT_INDEXES, 'unpartitioned')
+    _move_aside('event_seats', EVENT_SEAT_INDEXES, 'unpartitioned')
+
+    op.create_table('event_seats',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('event_id', sa.UUID(), nullable=False),
+    sa.Column('seat_id', sa.UUID(), nullable=False),
+    sa.Column('price', sa.NUMERIC(precision=10, scale=2), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.CheckConstraint("status IN ('AVAILABLE', 'BOOKED', 'LOCKED')", name='check_seat_status'),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], name='event_seats_event_id_fkey', ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['seat_id'], ['seats.id'], name='event_seats_seat_id_fkey', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', 'event_id'),
+    sa.UniqueConstraint('event_id', 'seat_id', name='unique_event_seat'),
+    postgresql_partition_by='HASH (event_id)'
+    )
+    _create_partitions('event_seats')
+    op.execute(
+        'INSERT INTO event_seats (id, event_id, seat_id, price, status) '
+        'SELECT id, event_id, seat_id, price, status FROM event_seats_unpartitioned'
+    )
+    op.create_index('ix_event_seats_event_id_status', 'event_seats', ['event_id', 'status'], unique=False)
+
+    op.create_table('booking_seats',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('booking_id', sa.UUID(), nullable=False),
+    sa.Column('event_seat_id', sa.UUID(), nullable=False),
+    sa.Column('event_id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], name='booking_seats_booking_id_fkey', ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['event_seat_id', 'event_id'], ['event_seats.id', 'event_seats.event_id'], name='booking_seats_event_seat_fkey', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', 'event_id'),
+    sa.UniqueConstraint('booking_id', 'event_seat_id', 'event_id', name='unique_booking_seat'),
+    postgresql_partition_by='HASH (event_id)'
+    )
+    _create_partitions('booking_seats')
+    op.execute(
+        'INSERT INTO booking_seats (id, booking_id, event_seat_id, event_id) '
+        'SELECT bs.id, bs.booking_id, bs.event_seat_id, es.event_id '
+        'FROM booking_seats_unpartitioned bs '
+        'JOIN event_seats_unpartitioned es ON es.id = bs.event_seat_id'
+    )
+    op.create_index('ix_booking_seats_event_seat_id', 'booking_seats', ['event_seat_id'], unique=False)
+
+    op.drop_table('booking_seats_unpartitioned')
+    op.drop_table('event_seats_unpartitioned')
+    op.execute('ANALYZE event_seats')
+    op.execute('ANALYZE booking_seats')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _move_aside('booking_seats', BOOKING_SEAT_INDEXES, 'partitioned')
+    _move_aside('event_seats', EVENT_SEAT_INDEXES, 'partitioned')
+
+    op.create_table('event_seats',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('event_id', sa.UUID(), nullable=False),
+    sa.Column('seat_id', sa.UUID(), nullable=False),
+    sa.Column('price', sa.NUMERIC(precision=10, scale=2), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.CheckConstraint("status IN ('AVAILABLE', 'BOOKED', 'LOCKED')", name='check_seat_status'),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], name='event_seats_event_id_fkey', ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['seat_id'], ['seats.id'], name='event_seats_seat_id_fkey', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('event_id', 'seat_id', name='unique_event_seat')
+    )
+    op.execute(
+        'INSERT INTO event_seats (id, event_id, seat_id, price, status) '
+        'SELECT id, event_id, seat_id, price, status FROM event_seats_partitioned'
+    )
+    op.create_index('ix_event_seats_event_id_status', 'event_seats', ['event_id', 'status'], unique=False)
+
+    op.create_table('booking_seats',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('booking_id', sa.UUID(), nullable=False),
+    sa.Column('event_seat_id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], name='booking_seats_booking_id_fkey', ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['event_seat_id'], ['event_seats.id'], name='booking_seats_event_seat_id_fkey', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('booking_id', 'event_seat_id', name='unique_booking_seat')
+    )
+    op.execute(
+        'INSERT INTO booking_seats (id, booking_id, event_seat_id) '
+        'SELECT id, booking_id, event_seat_id FROM booking_seats_partitioned'
+    )
+    op.create_index('ix_booking_seats_event_seat_id', 'booking_seats', ['event_seat_id'], unique=False)
+
+    # Dropping the parents drops their partitions too
+    op.drop_table('booking_seats_partitioned')
+    op.drop_table('event_seats_partitioned')
@@ -0,0 +1,47 @@
+"""add refunded payment status
+
+Revision ID: c7a4e2b91d03
+Revises: 10476e5dd26b
+Create Date: 2026-10-19 15:48:06.274519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a4e2b91d03'
+down_revision: Union[str, Sequence[str], None] = '10476e5dd26b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Bulk cancellation records refunds as REFUNDED payment rows
+    op.drop_constraint('check_payment_status', 'payments', type_='check')
+    op.create_check_constraint(
+        'check_payment_status',
+        'payments',
+        "status IN ('PENDING', 'SUCCESS', 'FAILED', 'REFUNDED')"
+    )
+
+    # Event-wide cancellation walks an event's open bookings
+    with op.get_context().autocommit_block():
+        op.create_index('ix_bookings_event_id_status', 'bookings', ['event_id', 'status'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_bookings_event_id_status', table_name='bookings', postgresql_concurrently=True, if_exists=True)
+
+    op.execute("DELETE FROM payments WHERE status = 'REFUNDED'")
+    op.drop_constraint('check_payment_status', 'payments', type_='check')
+    op.create_check_constraint(
+        'check_payment_status',
+        'payments',
+        "status IN ('PENDING', 'SUCCESS', 'FAILED')"
+    )
@@ -1,17 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.deps import get_db
+from app.db.deps import get_read_db
 from app.processor.analytics_processor import AnalyticsProcessor
-from app.schemas.analytics import PopularEvent, CapacityUtilization
+from app.schemas.analytics import AdminAnalytics, PopularEvent, CapacityUtilization, EventReach
 from app.middleware.authenticated import get_current_user
-from typing import List
+from typing import List, Optional
 
 router = APIRouter()
 
 
 @router.get("/admin/total-bookings")
 async def get_total_bookings_endpoint(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -32,7 +32,7 @@ async def get_total_bookings_endpoint(
 @router.get("/admin/popular-events", response_model=List[PopularEvent])
 async def get_popular_events_endpoint(
     limit: int = 10,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -52,19 +52,68 @@ async def get_popular_events_endpoint(
 
 @router.get("/admin/capacity-utilization", response_model=List[CapacityUtilization])
 async def get_capacity_utilization_endpoint(
-    db: AsyncSession = Depends(get_db),
+    skip: int = 0,
+    limit: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
-    Get capacity utilization for all events (admin only)
+    Get capacity utilization for active events, optionally paginated (admin only)
     """
     try:
         if current_user['role'] != 'ADMIN':
             raise HTTPException(status_code=403, detail="Forbidden")
         
-        capacity_utilization = await AnalyticsProcessor.get_capacity_utilization(db)
+        capacity_utilization = await AnalyticsProcessor.get_capacity_utilization(db, skip=skip, limit=limit)
         return capacity_utilization
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/admin/dashboard", response_model=AdminAnalytics)
+async def get_admin_dashboard_endpoint(
+    skip: int = 0,
+    limit: int = 20,
+    refresh: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get the combined admin analytics snapshot (admin only)
+
+    Sub-queries run concurrently and the result is cached for
+    ANALYTICS_CACHE_TTL_SECONDS; pass refresh=true to rebuild it.
+    """
+    try:
+        if current_user['role'] != 'ADMIN':
+            raise HTTPException(status_code=403, detail="Forbidden")
+        
+        return await AnalyticsProcessor.get_admin_analytics(skip=skip, limit=limit, refresh=refresh)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/admin/events/{event_id}/reach", response_model=EventReach)
+async def get_event_reach_endpoint(
+    event_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get approximate unique viewers and buyers for an event (admin only)
+    """
+    try:
+        if current_user['role'] != 'ADMIN':
+            raise HTTPException(status_code=403, detail="Forbidden")
+        
+        return await AnalyticsProcessor.get_event_reach(event_id)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
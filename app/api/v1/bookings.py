@@ -11,12 +11,13 @@ For payment processing, use /payments endpoints.
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 from app.db.deps import get_db
 from app.middleware.authenticated import get_current_user
 from app.schemas.bookings import SeatBookingRequest, CancelBookingRequest, BookingOut
 from app.processor.booking_processor import BookingProcessor
 from app.processor.payment_processor import PaymentProcessor
+from app.processor.lock_processor import LockProcessor
 from app.core.redis import redis
 
 router = APIRouter()
@@ -56,30 +57,19 @@ async def cancel_booking_api(payload: CancelBookingRequest, db: AsyncSession = D
 
 
 @router.get("/debug/redis-locks")
-async def debug_redis_locks_api():
-    """Debug endpoint to see all Redis lock keys"""
+async def debug_redis_locks_api(cursor: int = 0, count: int = 100, event_id: Optional[str] = None):
+    """Debug endpoint to page through Redis lock keys"""
     try:
-        # Test Redis connection
         await redis.ping()
-        
-        # Get all lock keys
-        lock_keys = await redis.keys("lock:*")
-        lock_details = []
-        
-        for key in lock_keys:
-            value = await redis.get(key)
-            ttl = await redis.ttl(key)
-            lock_details.append({
-                "key": key,
-                "value": value,
-                "ttl": ttl
-            })
-        
+        page = await LockProcessor.list_locks(cursor, count, event_id)
         return {
             "redis_connection": "OK",
-            "total_locks": len(lock_keys),
-            "lock_details": lock_details
+            "cursor": page["cursor"],
+            "total_locks": len(page["locks"]),
+            "lock_details": page["locks"]
         }
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         return {"redis_connection": "ERROR", "error": str(e)}
 
@@ -97,15 +87,10 @@ async def create_test_lock():
 
 
 @router.delete("/debug/clear-all-locks")
-async def clear_all_locks():
-    """Clear all Redis locks (for testing)"""
+async def clear_all_locks(event_id: Optional[str] = None):
+    """Clear all Redis locks, or one event's (for testing)"""
     try:
-        lock_keys = await redis.keys("lock:*")
-        if lock_keys:
-            await redis.delete(*lock_keys)
-            return {"message": f"Cleared {len(lock_keys)} locks", "cleared_keys": lock_keys}
-        else:
-            return {"message": "No locks found to clear"}
+        return await LockProcessor.clear_locks(event_id)
     except Exception as e:
         return {"error": str(e)}
 
@@ -1,21 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from app.schemas.event_seats import EventSeatOut, EventSeatWithSeatOut, RowPriceUpdate, RowPriceUpdateResponse
 from app.processor.event_seat_processor import EventSeatProcessor
-from app.db.deps import get_db
-from app.middleware.authenticated import get_current_user
+from app.db.deps import get_db, get_read_db
+from app.middleware.authenticated import get_current_user, get_optional_user
 
 router = APIRouter()
 
 
+def _viewer_id(request: Request, current_user: Optional[dict]) -> Optional[str]:
+    """Identify a seat-map viewer: the user when signed in, else the client address"""
+    if current_user:
+        return current_user["user_id"]
+    if request.client:
+        return f"anon:{request.client.host}"
+    return None
+
+
 @router.get("/event/{event_id}", response_model=list[EventSeatWithSeatOut])
 async def get_event_seats_api(
     event_id: str, 
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Optional[dict] = Depends(get_optional_user)
 ):
     """Get all event seats for an event"""
     try:
-        return await EventSeatProcessor.get_event_seats_by_event(db, event_id)
+        return await EventSeatProcessor.get_event_seats_by_event(db, event_id, _viewer_id(request, current_user))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
@@ -25,11 +37,13 @@ async def get_event_seats_api(
 @router.get("/event/{event_id}/available", response_model=list[EventSeatOut])
 async def get_available_event_seats_api(
     event_id: str, 
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Optional[dict] = Depends(get_optional_user)
 ):
     """Get all available event seats for an event"""
     try:
-        return await EventSeatProcessor.get_available_event_seats(db, event_id)
+        return await EventSeatProcessor.get_available_event_seats(db, event_id, _viewer_id(request, current_user))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
@@ -40,7 +54,7 @@ async def get_available_event_seats_api(
 async def get_event_seats_by_row_api(
     event_id: str, 
     row_no: str, 
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all event seats for a specific row in an event"""
     try:
@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, HTTPException, status
 from app.schemas.events import EventCreate, EventUpdate, EventOut, EventStatusUpdate
 from app.processor.event_processor import EventProcessor
-from app.db.deps import get_db
+from app.db.deps import get_db, get_read_db
 from app.middleware.authenticated import get_current_user
 
 router = APIRouter()
@@ -24,7 +24,7 @@ async def create_event_api(event: EventCreate, db: AsyncSession = Depends(get_db
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 @router.get("/upcoming", status_code=200)
-async def get_upcoming_events_api(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)):
+async def get_upcoming_events_api(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_read_db)):
     """Get upcoming events with capacity details"""
     try:
         return await EventProcessor.get_upcoming_events_with_capacity(db, skip, limit)
@@ -34,7 +34,7 @@ async def get_upcoming_events_api(skip: int = 0, limit: int = 10, db: AsyncSessi
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 @router.get("/{event_id}", status_code=200)
-async def get_event_api(event_id: str, db: AsyncSession = Depends(get_db)) -> EventOut:
+async def get_event_api(event_id: str, db: AsyncSession = Depends(get_read_db)) -> EventOut:
     """Get event by ID"""
     try:
         event = await EventProcessor.get_event_by_id(db, event_id)
@@ -47,7 +47,7 @@ async def get_event_api(event_id: str, db: AsyncSession = Depends(get_db)) -> Ev
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 @router.get("/", status_code=200)
-async def get_events_api(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db))-> list[EventOut]:
+async def get_events_api(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_read_db))-> list[EventOut]:
     """Get all events"""
     try:
         return await EventProcessor.get_events(db, skip, limit)
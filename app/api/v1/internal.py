@@ -0,0 +1,195 @@
+"""Internal operations endpoints
+
+Runtime diagnostics for operators (admin only):
+- Database connection pool usage
+- Read replica lag
+- Compiled statement cache hit rates
+- Slowest statements, with sampled query plans
+- Archival of finished events
+- Bulk booking cancellation
+- Seat hold (lock) inspection
+- Outbox backlog
+- Request profiles (flamegraph input)
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.db.deps import get_db
+from app.db.session import all_engines
+from app.db.replicas import replica_router
+from app.db.statement_cache import statement_cache_stats
+from app.middleware.authenticated import get_current_user
+from app.processor.archive_processor import ArchiveProcessor
+from app.processor.booking_processor import BookingProcessor
+from app.processor.lock_processor import LockProcessor
+from app.schemas.bookings import BulkCancelRequest
+from app.service.outbox import Outbox
+from app.service.profile_service import ProfileService
+from app.service.slow_query_service import SlowQueryService
+
+router = APIRouter()
+
+
+def require_admin(current_user: dict = Depends(get_current_user)) -> dict:
+    if current_user['role'] != 'ADMIN':
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
+
+
+@router.get("/db/pool")
+async def get_pool_stats(current_user: dict = Depends(require_admin)):
+    """Live connection pool usage for every engine in this worker"""
+    return {
+        name: engine.pool.stats() if hasattr(engine.pool, "stats") else {"status": engine.pool.status()}
+        for name, engine in all_engines().items()
+    }
+
+
+@router.get("/db/replicas")
+async def get_replica_status(current_user: dict = Depends(require_admin)):
+    """Last measured replication lag of each read replica"""
+    return {"replicas": replica_router.status()}
+
+
+@router.get("/db/statement-cache")
+async def get_statement_cache_stats(current_user: dict = Depends(require_admin)):
+    """Compiled statement cache hits and misses for every engine in this worker"""
+    return {name: statement_cache_stats(engine) for name, engine in all_engines().items()}
+
+
+@router.get("/db/slow-queries")
+async def get_slow_queries(order: str = "total", limit: int = 20, current_user: dict = Depends(require_admin)):
+    """Slowest statement shapes, ranked by total time, worst duration or count"""
+    try:
+        return {"order": order, "statements": await SlowQueryService.top(order, limit)}
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.delete("/db/slow-queries")
+async def clear_slow_queries(current_user: dict = Depends(require_admin)):
+    """Forget every recorded slow statement"""
+    try:
+        return {"cleared_statements": await SlowQueryService.reset()}
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.post("/archive")
+async def archive_finished_events(
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_events: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """Move finished events' seat rows into the archive tables"""
+    try:
+        return await ArchiveProcessor.archive_finished_events(db, older_than_days, batch_size, max_events)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.post("/bookings/cancel")
+async def bulk_cancel_bookings(
+    payload: BulkCancelRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """Cancel a list of bookings, or every open booking of an event, refunding payments"""
+    try:
+        result = await BookingProcessor.bulk_cancel_bookings(db, payload.booking_ids, payload.event_id)
+        if result is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+        return result
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.get("/locks")
+async def list_locks(
+    cursor: int = 0,
+    count: int = 100,
+    event_id: Optional[str] = None,
+    current_user: dict = Depends(require_admin)
+):
+    """One page of seat holds; repeat with the returned cursor until it is 0"""
+    try:
+        return await LockProcessor.list_locks(cursor, count, event_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.get("/locks/count")
+async def count_event_locks(event_id: str, current_user: dict = Depends(require_admin)):
+    """Number of live seat holds for an event"""
+    try:
+        return await LockProcessor.count_event_locks(event_id)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.delete("/locks")
+async def clear_locks(event_id: Optional[str] = None, current_user: dict = Depends(require_admin)):
+    """Delete all seat holds, or one event's"""
+    try:
+        return await LockProcessor.clear_locks(event_id)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.get("/outbox")
+async def get_outbox_stats(db: AsyncSession = Depends(get_db), current_user: dict = Depends(require_admin)):
+    """Outbox entries waiting for the relay, and entries out of retries"""
+    try:
+        return await Outbox.stats(db)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.post("/profiles/token")
+async def issue_profile_token(ttl_seconds: Optional[int] = None, current_user: dict = Depends(require_admin)):
+    """Token for the X-Profile header; requests carrying it are profiled"""
+    try:
+        return ProfileService.issue_token(ttl_seconds)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/profiles")
+async def list_profiles(current_user: dict = Depends(require_admin)):
+    """Profiled routes with their request and sample counts"""
+    try:
+        return {"routes": await ProfileService.list_routes()}
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.get("/profiles/download", response_class=PlainTextResponse)
+async def download_profiles(route: Optional[str] = None, current_user: dict = Depends(require_admin)):
+    """Collapsed stacks of one route ("GET /events/{event_id}"), or of all routes"""
+    try:
+        return await ProfileService.collapsed(route)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.delete("/profiles")
+async def clear_profiles(current_user: dict = Depends(require_admin)):
+    """Delete every stored profile"""
+    try:
+        return {"cleared_routes": await ProfileService.reset()}
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -8,7 +8,7 @@ This module handles payment-specific operations:
 For booking operations (create/cancel), use /bookings endpoints instead.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.deps import get_db
 from app.processor.payment_processor import PaymentProcessor
@@ -48,6 +48,7 @@ router = APIRouter()
 @router.post("/process/{booking_id}")
 async def process_payment(
     booking_id: str,
+    response: Response,
     payment_data: Dict[str, Any] = None,
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -66,11 +67,16 @@ async def process_payment(
         result = await PaymentProcessor.process_payment(db, booking_id, payment_data)
         
         if not result["success"]:
+            # A declined payment has a message instead of an error
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=result["error"]
+                detail=result.get("error") or result.get("message")
             )
         
+        # Async payment mode: the attempt is queued, poll status_url for the outcome
+        if result.get("queued"):
+            response.status_code = status.HTTP_202_ACCEPTED
+        
         return result
     except HTTPException:
         raise
@@ -117,10 +123,11 @@ async def process_payment(
 @router.get("/status/{booking_id}")
 async def get_booking_status(
     booking_id: str,
+    wait: int = 0,
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get booking and payment status"""
+    """Get booking and payment status; wait long-polls a queued payment for up to that many seconds"""
     try:
         # Validate booking_id format
         try:
@@ -131,7 +138,7 @@ async def get_booking_status(
                 detail="Invalid booking ID format"
             )
         
-        result = await PaymentProcessor.get_booking_status(db, booking_id)
+        result = await PaymentProcessor.get_booking_status(db, booking_id, wait)
         
         if not result["success"]:
             raise HTTPException(
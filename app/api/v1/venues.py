@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, HTTPException, status
 from app.schemas.venues import VenueCreate, VenueUpdate, VenueOut
 from app.processor.venue_processor import VenueProcessor
-from app.db.deps import get_db
+from app.db.deps import get_db, get_read_db
 from app.middleware.authenticated import get_current_user
 
 router = APIRouter()
@@ -24,7 +24,7 @@ async def create_venue_api(venue: VenueCreate, db: AsyncSession = Depends(get_db
 
 
 @router.get("/{venue_id}", status_code=200, response_model=VenueOut)
-async def get_venue_api(venue_id: str, db: AsyncSession = Depends(get_db)):
+async def get_venue_api(venue_id: str, db: AsyncSession = Depends(get_read_db)):
     """Get venue by ID"""
     try:
         venue = await VenueProcessor.get_venue_by_id(db, venue_id)
@@ -38,7 +38,7 @@ async def get_venue_api(venue_id: str, db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/", status_code=200, response_model=list[VenueOut])
-async def get_venues_api(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)):
+async def get_venues_api(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_read_db)):
     """Get all venues"""
     try:
         return await VenueProcessor.get_venues(db, skip, limit)
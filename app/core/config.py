@@ -8,9 +8,127 @@ class Settings(BaseSettings):
     POSTGRES_SERVER: str
     POSTGRES_PORT: str
 
+    # Engine and pool profile, applied per worker process. A pod running W
+    # workers can open up to W * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections
+    # to each database.
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # SQLAlchemy compiled statement cache entries per engine
+    DB_QUERY_CACHE_SIZE: int = 500
+    # Server-side statement_timeout in milliseconds, 0 disables it
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    # Serve seat maps and seat claims with hand-written SQL on the raw asyncpg
+    # connection instead of the ORM (see app/service/seat_fastpath.py)
+    DB_FASTPATH_ENABLED: bool = True
+    # Report per-request statement count and DB time in X-DB-Query-Count /
+    # X-DB-Query-Time-Ms response headers; meant for development
+    QUERY_STATS_HEADERS: bool = False
+    # Warn when one statement shape runs more than this many times in a
+    # request (a likely N+1); 0 disables the warning
+    QUERY_REPEAT_WARN_THRESHOLD: int = 10
+    # Statements taking at least this long are logged and ranked in
+    # GET /internal/db/slow-queries; 0 disables the slow statement log
+    SLOW_QUERY_THRESHOLD_MS: float = 500.0
+    # Share of slow SELECTs re-run under EXPLAIN (ANALYZE, BUFFERS) to capture
+    # their plan, and the statement_timeout of that re-run
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.0
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = 10000
+    # Ranked slow statements expire this long after their last slow run
+    SLOW_QUERY_RETENTION_SECONDS: int = 604800
+    # Share of requests profiled with the sampling profiler (0 disables
+    # sampling; requests with a valid X-Profile token are always profiled),
+    # optionally only under these comma-separated path prefixes
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_PATHS: str = ""
+    # Milliseconds between stack samples of a profiled request
+    PROFILE_INTERVAL_MS: float = 5.0
+    # Stored profiles expire this long after the last profiled request
+    PROFILE_RETENTION_SECONDS: int = 604800
+    # Default lifetime of tokens from POST /internal/profiles/token
+    PROFILE_TOKEN_TTL_SECONDS: int = 3600
+
+    # Where seat holds live: "redis", "postgres" (seat_holds table) or
+    # "failover" (Redis, switching to Postgres while Redis is down)
+    SEAT_HOLD_BACKEND: str = "failover"
+
+    # Comma-separated SQLAlchemy URLs of read replicas (postgresql+asyncpg://...).
+    # Empty means read-only endpoints use the primary as well.
+    POSTGRES_REPLICA_URLS: str = ""
+    # Replicas lagging further than this behind the primary are skipped
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 5.0
+
+    # Share of requests traced (0 disables). A sampled `traceparent` header
+    # from the caller is followed while this is above 0, or always with
+    # TRACE_TRUST_INBOUND (callers are trusted services). Spans are exported
+    # as OTLP/JSON to TRACE_FILE ("file"), to TRACE_OTLP_ENDPOINT ("otlp"), or not at all ("none")
+    TRACE_SAMPLE_RATE: float = 0.0
+    TRACE_TRUST_INBOUND: bool = False
+    TRACE_EXPORTER: str = "file"
+    TRACE_FILE: str = "traces.jsonl"
+    TRACE_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACE_SERVICE_NAME: str = "eventify-api"
+    # Finished spans waiting for export; further spans are dropped
+    TRACE_QUEUE_SIZE: int = 10000
+    TRACE_BATCH_SIZE: int = 512
+    TRACE_EXPORT_INTERVAL_SECONDS: float = 2.0
+
+    # Event loop lag is sampled every LOOP_MONITOR_INTERVAL_MS; a loop blocked
+    # longer than LOOP_BLOCK_THRESHOLD_MS has its stack logged
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_MS: float = 100.0
+    LOOP_BLOCK_THRESHOLD_MS: float = 250.0
+
+    # Root log level, per-module overrides ("app.service.payment_service=DEBUG,
+    # app.db=WARNING") and output format, "json" or "text" (see app/core/log.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: str = ""
+    LOG_FORMAT: str = "json"
+
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # How long a cached admin analytics snapshot may be served before it is rebuilt
+    ANALYTICS_CACHE_TTL_SECONDS: int = 30
+
+    # Events that ended more than this many days ago have their seat rows moved
+    # to the archive tables, deleting at most ARCHIVE_BATCH_SIZE rows per statement
+    ARCHIVE_AFTER_DAYS: int = 30
+    ARCHIVE_BATCH_SIZE: int = 5000
+
+    # Bulk cancellation cancels this many bookings per transaction
+    BULK_CANCEL_CHUNK_SIZE: int = 1000
+
+    # "sync" calls the payment gateway inside POST /payments/process; "async"
+    # queues the attempt for the payment workers and answers 202
+    PAYMENT_MODE: str = "sync"
+    # Gateway calls in flight per payment worker process
+    PAYMENT_WORKER_CONCURRENCY: int = 16
+    # How long payment outcomes stay pollable, and the longest status long-poll
+    PAYMENT_RESULT_TTL_SECONDS: int = 3600
+    PAYMENT_STATUS_MAX_WAIT_SECONDS: int = 30
+
+    # Run the outbox relay inside each API process; turn off when running
+    # app/workers/outbox_relay.py separately
+    OUTBOX_RELAY_IN_PROCESS: bool = True
+    OUTBOX_BATCH_SIZE: int = 100
+    # Pause between polls once the outbox is drained
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 0.5
+    # Entries that failed this many times are left for an operator
+    OUTBOX_MAX_ATTEMPTS: int = 10
+    OUTBOX_RETENTION_HOURS: int = 24
+    # Approximate length cap of each outbox:{topic} Redis stream
+    OUTBOX_STREAM_MAXLEN: int = 100000
+
     class Config:
         env_file = ".env"
 
+    @property
+    def replica_urls(self) -> list[str]:
+        return [url.strip() for url in self.POSTGRES_REPLICA_URLS.split(",") if url.strip()]
+
 settings = Settings()
@@ -0,0 +1,95 @@
+"""Structured logging off the event loop
+
+configure_logging() puts a single QueueHandler on the root logger. Logging a
+record only appends it to an in-memory queue; a QueueListener thread formats it
+(message interpolation, tracebacks, JSON) and writes it to stdout, so a slow
+stdout or log shipper never blocks the event loop.
+
+Levels come from LOG_LEVEL, with per-module overrides in LOG_LEVELS
+("app.service.payment_service=DEBUG,app.db=WARNING"). Per-request and per-seat
+messages are logged at DEBUG, so the default INFO level writes nothing from
+hot paths. Extra fields (`logger.info("...", extra={"booking_id": ...})`) are
+included in the JSON output. Uvicorn's loggers are routed through the same
+queue; its per-request access log is at WARNING unless LOG_LEVELS says otherwise.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from app.core.config import settings
+
+# Attributes every LogRecord has; anything else was passed through extra=
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+# Uvicorn installs its own synchronous stdout handlers on these
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+# Per-request access lines and the trace exporter's per-batch HTTP lines
+DEFAULT_LEVELS = {"uvicorn.access": "WARNING", "httpx": "WARNING"}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS})
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queues the record as is; the listener thread does all the formatting"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() formats on the calling thread to make records
+        # picklable, which an in-process queue doesn't need
+        return record
+
+
+def _parse_levels(spec: str) -> dict[str, str]:
+    levels = {}
+    for part in spec.split(","):
+        name, _, level = part.strip().partition("=")
+        if name and level:
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging() -> None:
+    """Route all logging through the background writer; safe to call again"""
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [_DeferredQueueHandler(records)]
+    root.setLevel(settings.LOG_LEVEL.upper())
+    for name in UVICORN_LOGGERS:
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+    for name, level in {**DEFAULT_LEVELS, **_parse_levels(settings.LOG_LEVELS)}.items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    # Flush what is still queued when the process exits
+    atexit.register(_listener.stop)
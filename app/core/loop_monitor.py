@@ -0,0 +1,100 @@
+"""Event loop lag and stall detection
+
+Anything that runs on the event loop without awaiting (password hashing, JWT
+decoding, hydrating thousands of ORM rows, synchronous I/O) stalls every other
+request in the worker. Two cheap probes watch for it:
+
+- a callback re-scheduled every LOOP_MONITOR_INTERVAL_MS records how late it
+  ran in the event_loop_lag_seconds histogram
+- a watchdog thread notices when that callback has not run for longer than
+  LOOP_BLOCK_THRESHOLD_MS and logs the stack the loop thread is stuck in,
+  starting from the coroutine of the task that is running, once per stall
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+from app.core.config import settings
+from app.core.metrics import EVENT_LOOP_LAG_SECONDS, EVENT_LOOP_STALLS
+
+logger = logging.getLogger(__name__)
+
+
+def _task_stack(frame, task: Optional[asyncio.Task]) -> traceback.StackSummary:
+    """The loop thread's stack, from the running task's coroutine down if it is on it"""
+    frames = []
+    root = getattr(task.get_coro(), "cr_frame", None) if task else None
+    while frame is not None:
+        frames.append(frame)
+        if frame is root:
+            break
+        frame = frame.f_back
+    frames.reverse()
+    return traceback.StackSummary.extract((frame, frame.f_lineno) for frame in frames)
+
+
+class LoopMonitor:
+    """Measures the lag of one event loop and reports where it is blocked"""
+
+    def __init__(self):
+        self._loop = None
+        self._thread_id = None
+        self._handle = None
+        self._watchdog = None
+        self._stop = threading.Event()
+        self._last_tick = 0.0
+        self._expected = 0.0
+
+    def start(self) -> None:
+        """Start monitoring the running loop; call from the loop's thread"""
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._stop.clear()
+        self._last_tick = self._expected = time.monotonic()
+        self._handle = self._loop.call_soon(self._tick)
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        if self._handle:
+            self._handle.cancel()
+        self._stop.set()
+        if self._watchdog:
+            self._watchdog.join()
+
+    def _tick(self) -> None:
+        now = time.monotonic()
+        EVENT_LOOP_LAG_SECONDS.observe(max(0.0, now - self._expected))
+        self._last_tick = now
+        interval = settings.LOOP_MONITOR_INTERVAL_MS / 1000
+        self._expected = now + interval
+        self._handle = self._loop.call_later(interval, self._tick)
+
+    def _watch(self) -> None:
+        threshold = settings.LOOP_BLOCK_THRESHOLD_MS / 1000
+        reported_tick = None
+        while not self._stop.wait(min(settings.LOOP_MONITOR_INTERVAL_MS / 1000, threshold) / 2):
+            last_tick = self._last_tick
+            blocked = time.monotonic() - self._expected
+            if blocked < threshold or last_tick == reported_tick:
+                continue
+            reported_tick = last_tick
+            EVENT_LOOP_STALLS.inc()
+            self._report(blocked)
+
+    def _report(self, blocked: float) -> None:
+        task = asyncio.tasks._current_tasks.get(self._loop)
+        frame = sys._current_frames().get(self._thread_id)
+        stack = "".join(_task_stack(frame, task).format()) if frame is not None else ""
+        task_name = task.get_name() if task else None
+        logger.warning(
+            "Event loop blocked for %.0f ms so far in task %s:\n%s", blocked * 1000, task_name or "-", stack,
+            extra={"blocked_ms": round(blocked * 1000), "task": task_name},
+        )
+
+
+loop_monitor = LoopMonitor()
@@ -0,0 +1,118 @@
+"""Prometheus metrics
+
+Request latency per route template, database query time and pool waits, Redis
+command latency, event loop lag and stalls, seat hold outcomes and payment
+outcomes. They are served in
+Prometheus text format on GET /metrics.
+
+Each process has its own registry. When several uvicorn workers share a port,
+set PROMETHEUS_MULTIPROC_DIR to an empty directory writable by all of them, and
+/metrics will aggregate every worker.
+"""
+
+import os
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Sub-millisecond buckets for database and Redis round trips
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    multiprocess_mode="livesum",
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "Database statement execution time by engine and statement type",
+    ["engine", "operation"],
+    buckets=FAST_BUCKETS,
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    ["engine"],
+    buckets=FAST_BUCKETS,
+)
+REDIS_COMMAND_SECONDS = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency; pipelines are timed as a whole",
+    ["command"],
+    buckets=FAST_BUCKETS,
+)
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop ran a callback scheduled for a fixed time",
+    buckets=FAST_BUCKETS,
+)
+EVENT_LOOP_STALLS = Counter(
+    "event_loop_stalls_total",
+    "Times the event loop was blocked longer than LOOP_BLOCK_THRESHOLD_MS",
+)
+SEAT_HOLD_ATTEMPTS = Counter(
+    "seat_hold_attempts_total",
+    "Seat hold attempts per event, by outcome (acquired or conflict)",
+    ["event_id", "outcome"],
+)
+PAYMENT_OUTCOMES = Counter(
+    "payment_outcomes_total",
+    "Settled payment attempts by outcome (success, failed or error)",
+    ["outcome"],
+)
+
+# Statement types reported as-is; everything else is "OTHER"
+_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+def track_query_time(engine: AsyncEngine, name: str) -> None:
+    """Record the execution time of every statement run on an engine"""
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+        DB_QUERY_SECONDS.labels(name, operation if operation in _OPERATIONS else "OTHER").observe(elapsed)
+
+    def failed(context):
+        # after_cursor_execute doesn't run for a failing statement
+        started = context.connection.info.get("query_started")
+        if started:
+            started.pop()
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before)
+    event.listen(engine.sync_engine, "after_cursor_execute", after)
+    event.listen(engine.sync_engine, "handle_error", failed)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Current metrics in Prometheus text format, plus their content type"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this process's live gauges from the multiprocess directory on shutdown"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
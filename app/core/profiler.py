@@ -0,0 +1,117 @@
+"""Wall-clock sampling profiler for individual requests
+
+A daemon thread wakes every PROFILE_INTERVAL_MS while at least one request is
+being profiled and records one stack per profiled request:
+
+- if the request's task is the one running on the event loop, the loop
+  thread's current Python stack from the task's coroutine down
+- otherwise the chain of coroutines the task is suspended in, ending in a
+  "(waiting)" frame, so time spent awaiting the database or Redis shows up too
+
+Stacks are collapsed to "module:function;module:function" strings and counted,
+the input format of flamegraph.pl and speedscope. Nothing runs while no
+request is profiled.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from app.core.config import settings
+
+WAITING_FRAME = "(waiting)"
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _await_chain(coro) -> list:
+    """Frames of a suspended coroutine and everything it awaits, outermost first"""
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frames
+
+
+def _thread_stack(frame, root) -> list:
+    """A thread's frames from root (the task's coroutine) down, outermost first"""
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        if frame is root:
+            break
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+class _Profile:
+    def __init__(self, task: asyncio.Task, loop: asyncio.AbstractEventLoop, thread_id: int):
+        self.task = task
+        self.loop = loop
+        self.thread_id = thread_id
+        self.stacks: Counter = Counter()
+
+
+class Sampler:
+    """Samples the stacks of the registered request tasks"""
+
+    def __init__(self):
+        self._profiles: dict[int, _Profile] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self) -> int:
+        """Profile the calling task until stop(); returns a handle"""
+        profile = _Profile(asyncio.current_task(), asyncio.get_running_loop(), threading.get_ident())
+        with self._lock:
+            self._profiles[id(profile)] = profile
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return id(profile)
+
+    def stop(self, handle: int) -> Counter:
+        """Stop profiling and return the collapsed stacks and their sample counts"""
+        with self._lock:
+            profile = self._profiles.pop(handle)
+        return profile.stacks
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                profiles = list(self._profiles.values())
+            if not profiles:
+                self._wake.clear()
+                self._wake.wait()
+                continue
+            time.sleep(settings.PROFILE_INTERVAL_MS / 1000)
+            thread_frames = sys._current_frames()
+            for profile in profiles:
+                stack = self._sample(profile, thread_frames)
+                if stack:
+                    profile.stacks[stack] += 1
+
+    @staticmethod
+    def _sample(profile: _Profile, thread_frames: dict) -> str:
+        coro = profile.task.get_coro()
+        running = asyncio.tasks._current_tasks.get(profile.loop) is profile.task
+        if running:
+            frames = _thread_stack(thread_frames.get(profile.thread_id), getattr(coro, "cr_frame", None))
+            return ";".join(_frame_name(frame) for frame in frames)
+        frames = _await_chain(coro)
+        if not frames:
+            return ""
+        return ";".join([*(_frame_name(frame) for frame in frames), WAITING_FRAME])
+
+
+sampler = Sampler()
@@ -1,4 +1,36 @@
+import time
 import redis.asyncio as aioredis
+from redis.asyncio.client import Pipeline
 from app.core.config import settings
+from app.core.metrics import REDIS_COMMAND_SECONDS
+from app.core.tracing import CLIENT, start_span
 
-redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+
+class InstrumentedPipeline(Pipeline):
+    """Pipeline whose round trip is recorded as one PIPELINE command"""
+
+    async def execute(self, raise_on_error: bool = True):
+        start = time.perf_counter()
+        try:
+            with start_span("PIPELINE", CLIENT, **{"db.system": "redis", "db.redis.commands": len(self.command_stack)}):
+                return await super().execute(raise_on_error)
+        finally:
+            REDIS_COMMAND_SECONDS.labels("PIPELINE").observe(time.perf_counter() - start)
+
+
+class InstrumentedRedis(aioredis.Redis):
+    """Redis client that records the latency of every command"""
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            with start_span(str(args[0]).upper(), CLIENT, **{"db.system": "redis"}):
+                return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_SECONDS.labels(str(args[0]).upper()).observe(time.perf_counter() - start)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+redis = InstrumentedRedis.from_url(settings.REDIS_URL, decode_responses=True)
@@ -0,0 +1,302 @@
+"""Request tracing across the API, processors, services, SQL and Redis
+
+A trace starts where work enters the system: an HTTP request (TracingMiddleware),
+an outbox entry being relayed or a queued payment attempt. New traces are
+sampled at TRACE_SAMPLE_RATE. A request carrying a W3C `traceparent` header
+follows the caller's decision. Work that continues elsewhere carries the
+traceparent with it: outbox payloads and payment attempts store it, and tasks
+started with asyncio.create_task() inherit the current span through the
+context.
+
+Inside a sampled trace, every Processor/Service method decorated with
+@traced, every SQL statement and every Redis command or pipeline becomes a
+span. Outside one, all hooks return after a single context variable lookup.
+
+Finished spans go onto a bounded in-memory queue. A background thread exports
+them in batches as OTLP/JSON, either to TRACE_FILE (one export request per
+line, like the OpenTelemetry collector's file exporter) or to an OTLP/HTTP
+endpoint such as a local Jaeger or collector. When the queue is full, spans
+are dropped rather than blocking the event loop.
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+import httpx
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# OTLP span kinds
+INTERNAL, SERVER, CLIENT, PRODUCER, CONSUMER = 1, 2, 3, 4, 5
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+# Longest SQL text kept on a span
+MAX_STATEMENT_LENGTH = 2000
+
+
+class Span:
+    """One timed operation in a trace"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "attributes", "start_ns", "end_ns", "error")
+
+    def __init__(self, trace_id: str, parent_id: Optional[str], name: str, kind: int, attributes: dict):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def child(self, name: str, kind: int = INTERNAL, **attributes) -> "Span":
+        return Span(self.trace_id, self.span_id, name, kind, attributes)
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        exporter.submit(self)
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def current_traceparent() -> Optional[str]:
+    """traceparent of the current span, for handing work to another process"""
+    span = _current.get()
+    return span.traceparent if span else None
+
+
+@contextmanager
+def _activate(span: Optional[Span]):
+    token = _current.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        if span is not None:
+            span.end(e)
+            span = None
+        raise
+    finally:
+        _current.reset(token)
+        if span is not None:
+            span.end()
+
+
+def start_trace(name: str, traceparent: Optional[str] = None, kind: int = SERVER,
+                sample_new: bool = True, trust_sampled: bool = True, **attributes):
+    """Start a trace, or continue the one described by traceparent
+
+    A valid traceparent's sampled flag decides when trust_sampled is set;
+    otherwise the trace is sampled at TRACE_SAMPLE_RATE, or not at all when
+    sample_new is False. An untrusted traceparent still supplies the trace id.
+    Yields the root span, or None when the work is not traced.
+    """
+    match = _TRACEPARENT.match(traceparent.strip().lower()) if traceparent else None
+    if match:
+        trace_id, parent_id, flags = match.groups()
+        if trust_sampled:
+            sampled = int(flags, 16) & 1
+        else:
+            sampled = sample_new and random.random() < settings.TRACE_SAMPLE_RATE
+    else:
+        trace_id, parent_id = os.urandom(16).hex(), None
+        sampled = sample_new and random.random() < settings.TRACE_SAMPLE_RATE
+    return _activate(Span(trace_id, parent_id, name, kind, attributes) if sampled else None)
+
+
+@contextmanager
+def start_span(name: str, kind: int = INTERNAL, **attributes):
+    """A child of the current span for the block; a no-op outside a sampled trace"""
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    with _activate(parent.child(name, kind, **attributes)) as span:
+        yield span
+
+
+def traced(layer: str):
+    """Class decorator: every public async method becomes a span named Class.method"""
+
+    def decorate(cls):
+        for name, member in list(vars(cls).items()):
+            if name.startswith("_"):
+                continue
+            is_static = isinstance(member, staticmethod)
+            func = member.__func__ if is_static else member
+            if not inspect.iscoroutinefunction(func):
+                continue
+            wrapper = _traced_function(func, f"{cls.__name__}.{name}", layer)
+            setattr(cls, name, staticmethod(wrapper) if is_static else wrapper)
+        return cls
+
+    return decorate
+
+
+def _traced_function(func, span_name: str, layer: str):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        parent = _current.get()
+        if parent is None:
+            return await func(*args, **kwargs)
+        with _activate(parent.child(span_name, INTERNAL, **{"code.layer": layer})):
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
+def statement_span(statement: str, db_instance: str) -> Optional[Span]:
+    """A span for one SQL statement, ended by the caller; None outside a trace"""
+    parent = _current.get()
+    if parent is None:
+        return None
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    return parent.child(operation, CLIENT, **{
+        "db.system": "postgresql",
+        "db.instance": db_instance,
+        "db.statement": statement[:MAX_STATEMENT_LENGTH],
+    })
+
+
+def track_traces(engine: AsyncEngine, name: str) -> None:
+    """Record a span for every statement an engine runs inside a trace"""
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._trace_span = statement_span(statement, name)
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            context._trace_span = None
+            span.end()
+
+    def error(exception_context):
+        span = getattr(exception_context.execution_context, "_trace_span", None)
+        if span is not None:
+            exception_context.execution_context._trace_span = None
+            span.end(exception_context.original_exception)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before)
+    event.listen(engine.sync_engine, "after_cursor_execute", after)
+    event.listen(engine.sync_engine, "handle_error", error)
+
+
+class SpanExporter:
+    """Batches finished spans on a background thread and writes them out"""
+
+    def __init__(self):
+        self.service_name = settings.TRACE_SERVICE_NAME
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=settings.TRACE_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, span: Span) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + settings.TRACE_EXPORT_INTERVAL_SECONDS
+            while len(batch) < settings.TRACE_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            self._export(batch)
+
+    def flush(self) -> None:
+        """Export what is still queued; called at exit"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._export(batch)
+
+    def _export(self, spans: list) -> None:
+        request = {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": [span.to_otlp() for span in spans]}],
+        }]}
+        try:
+            if settings.TRACE_EXPORTER == "otlp":
+                httpx.post(settings.TRACE_OTLP_ENDPOINT, json=request, timeout=5.0).raise_for_status()
+            elif settings.TRACE_EXPORTER == "file":
+                with open(settings.TRACE_FILE, "a") as f:
+                    f.write(json.dumps(request) + "\n")
+        except Exception as e:
+            logger.warning("Error exporting %d spans: %s", len(spans), e)
+
+
+exporter = SpanExporter()
+
+
+def configure_tracing(service_name: str) -> None:
+    """Name the process in exported traces (service.name)"""
+    exporter.service_name = service_name
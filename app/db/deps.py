@@ -1,6 +1,13 @@
 from typing import AsyncGenerator
 from app.db.session import async_session_maker
+from app.db.replicas import replica_router
 
 async def get_db() -> AsyncGenerator:
     async with async_session_maker() as session:
         yield session
+
+async def get_read_db() -> AsyncGenerator:
+    """Session for pure-read endpoints, served by a replica when one is healthy"""
+    session_maker = await replica_router.choose()
+    async with session_maker() as session:
+        yield session
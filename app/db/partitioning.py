@@ -0,0 +1,37 @@
+"""Hash partitioning for the per-event tables"""
+
+import re
+from sqlalchemy import DDL, Table, event
+
+# event_seats and booking_seats are split by HASH(event_id) into this many
+# partitions, so a per-event query reads one partition and its indexes
+EVENT_PARTITION_COUNT = 16
+
+PARTITIONED_TABLES = ("event_seats", "booking_seats")
+
+_PARTITION_NAME = re.compile(rf"^({'|'.join(PARTITIONED_TABLES)})_p\d+$")
+
+
+def partition_name(table_name: str, remainder: int) -> str:
+    """Name of one hash partition of a table"""
+    return f"{table_name}_p{remainder}"
+
+
+def create_partition_statements(table_name: str, count: int = EVENT_PARTITION_COUNT) -> list[str]:
+    """CREATE TABLE ... PARTITION OF statements for every hash partition"""
+    return [
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table_name, remainder)} "
+        f"PARTITION OF {table_name} FOR VALUES WITH (MODULUS {count}, REMAINDER {remainder})"
+        for remainder in range(count)
+    ]
+
+
+def attach_hash_partitions(table: Table, count: int = EVENT_PARTITION_COUNT) -> None:
+    """Create the table's partitions whenever metadata creates the parent table"""
+    for statement in create_partition_statements(table.name, count):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+
+def is_partition(table_name: str) -> bool:
+    """Whether a reflected table is one of the hash partitions, not a model table"""
+    return bool(_PARTITION_NAME.match(table_name))
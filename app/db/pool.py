@@ -0,0 +1,59 @@
+"""Connection pool with checkout wait statistics"""
+
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.core.metrics import DB_POOL_WAIT_SECONDS
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long checkouts wait for a connection"""
+
+    # Engine name used as the metrics label; set by build_engine
+    name = "primary"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.waiting = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+
+    def connect(self):
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waiting -= 1
+            waited = time.perf_counter() - start
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            DB_POOL_WAIT_SECONDS.labels(self.name).observe(waited)
+        self.checkouts += 1
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.name = self.name
+        return pool
+
+    def stats(self) -> dict:
+        """Snapshot of live pool usage and accumulated checkout waits"""
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "waiting": self.waiting,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "total_wait_seconds": round(self.total_wait_seconds, 6),
+            "avg_wait_seconds": round(self.total_wait_seconds / self.checkouts, 6) if self.checkouts else 0.0,
+            "max_wait_seconds": round(self.max_wait_seconds, 6),
+        }
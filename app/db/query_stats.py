@@ -0,0 +1,131 @@
+"""Per-request SQL statement counts
+
+While collect_queries() is active, every statement sent by an instrumented
+engine is counted together with its execution time and its shape (the SQL
+text with bind placeholders collapsed). The stats live in a context variable,
+so concurrent requests in one worker never mix. SQLAlchemy runs its event
+hooks in a greenlet that inherits the caller's context.
+
+The same shape repeating many times in one request is the signature of an N+1
+loop: QueryStatsMiddleware warns about it, and query_budget() fails a check
+that goes over its statement budget.
+"""
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.tracing import statement_span
+
+# Runs of positional placeholders ($1, $2, ...) collapse to one, so IN lists of
+# different lengths share a shape
+_PLACEHOLDERS = re.compile(r"\$\d+(?:\s*,\s*\$\d+)*")
+
+
+def statement_shape(statement: str) -> str:
+    return " ".join(_PLACEHOLDERS.sub("?", statement).split())
+
+
+class QueryStats:
+    """Statements, time and shapes seen in one request"""
+
+    def __init__(self, parent: Optional["QueryStats"] = None, scope: Optional[dict] = None):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+        # Enclosing collect_queries() block, which counts the same statements
+        self.parent = parent
+        # ASGI scope of the request being counted, if any
+        self.scope = scope if scope is not None or parent is None else parent.scope
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+        if self.parent is not None:
+            self.parent.record(statement, seconds)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Shapes that ran more than threshold times, most frequent first"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_route() -> Optional[str]:
+    """Method and route template of the request being counted, e.g. GET /events/{event_id}"""
+    stats = _current.get()
+    if stats is None or stats.scope is None:
+        return None
+    route = stats.scope.get("route")
+    return f"{stats.scope['method']} {route.path if route else stats.scope['path']}"
+
+
+@contextmanager
+def collect_queries(scope: Optional[dict] = None):
+    """Count the statements run inside the block; blocks may nest"""
+    stats = QueryStats(_current.get(), scope)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed_query(statement: str):
+    """Count and trace a statement sent straight through the driver, bypassing SQLAlchemy"""
+    stats = _current.get()
+    span = statement_span(statement, "fastpath")
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        if stats is not None:
+            stats.record(statement, time.perf_counter() - start)
+        if span is not None:
+            span.end(error)
+
+
+def track_request_queries(engine: AsyncEngine) -> None:
+    """Count an engine's statements into the active collect_queries() block"""
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and _current.get() is not None:
+            context._query_stats_started = time.perf_counter()
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        started = getattr(context, "_query_stats_started", None)
+        if stats is not None and started is not None:
+            stats.record(statement, time.perf_counter() - started)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before)
+    event.listen(engine.sync_engine, "after_cursor_execute", after)
+
+
+@contextmanager
+def query_budget(max_statements: int, max_repeats: Optional[int] = None):
+    """Fail with AssertionError when the block runs more statements than budgeted
+
+    max_repeats additionally caps how often any one statement shape may run,
+    which catches an N+1 loop even when the total is still within budget.
+    """
+    with collect_queries() as stats:
+        yield stats
+    problems = []
+    if stats.count > max_statements:
+        problems.append(f"{stats.count} statements, budget {max_statements}")
+    if max_repeats is not None:
+        problems.extend(f"ran {count}x: {shape[:200]}" for shape, count in stats.repeated(max_repeats))
+    if problems:
+        raise AssertionError("Query budget exceeded: " + "; ".join(problems))
@@ -0,0 +1,86 @@
+"""Routing of read-only sessions to replicas with lag-aware fallback"""
+
+import itertools
+import logging
+import time
+from sqlalchemy import text
+from app.core.config import settings
+from app.db.session import async_session_maker, replica_engines, replica_session_makers
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica is behind the primary, or NULL if it isn't streaming WAL
+# from the primary: a disconnected replica replays everything it received and
+# would otherwise look current forever. A streaming replica that has replayed
+# everything it received reports 0 even if no writes happened for a while.
+# Reading pg_stat_wal_receiver.status needs the pg_read_all_stats role.
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReplicaRouter:
+    """Round-robin over healthy replicas, falling back to the primary"""
+
+    def __init__(self, engines, session_makers, primary_session_maker, max_lag: float, check_interval: float):
+        self.engines = engines
+        self.session_makers = session_makers
+        self.primary_session_maker = primary_session_maker
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lag = [None] * len(engines)
+        self._checked_at = [0.0] * len(engines)
+        self._next = itertools.cycle(range(len(engines)))
+
+    async def _is_healthy(self, index: int) -> bool:
+        """Check a replica's lag, re-measuring at most once per check interval"""
+        now = time.monotonic()
+        if now - self._checked_at[index] >= self.check_interval:
+            # Stamp first so concurrent requests don't all run the lag query
+            self._checked_at[index] = now
+            try:
+                async with self.engines[index].connect() as conn:
+                    lag = (await conn.execute(REPLICA_LAG_QUERY)).scalar()
+                if lag is None:
+                    logger.warning("Replica %d is not streaming from the primary", index)
+                self._lag[index] = float(lag) if lag is not None else None
+            except Exception as e:
+                logger.warning("Replica %d health check failed: %s", index, e)
+                self._lag[index] = None
+        lag = self._lag[index]
+        return lag is not None and lag <= self.max_lag
+
+    async def choose(self):
+        """Return the sessionmaker for the next healthy replica, or the primary"""
+        for _ in range(len(self.engines)):
+            index = next(self._next)
+            if await self._is_healthy(index):
+                return self.session_makers[index]
+        return self.primary_session_maker
+
+    def status(self) -> list[dict]:
+        """Last measured lag of each replica"""
+        return [
+            {
+                "replica": index,
+                "lag_seconds": self._lag[index],
+                "healthy": self._lag[index] is not None and self._lag[index] <= self.max_lag,
+            }
+            for index in range(len(self.engines))
+        ]
+
+
+replica_router = ReplicaRouter(
+    replica_engines,
+    replica_session_makers,
+    async_session_maker,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+)
@@ -1,14 +1,54 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import track_query_time
+from app.core.tracing import track_traces
+from app.db.pool import InstrumentedAsyncPool
+from app.db.query_stats import track_request_queries
+from app.db.slow_queries import track_slow_queries
+from app.db.statement_cache import track_statement_cache
 
 DATABASE_URL = (
     f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
     f"@{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
 )
 
+
+def build_engine(url: str, name: str):
+    """Create an async engine using the pool and driver settings; name labels its metrics"""
+    connect_args = {
+        # asyncpg's own statement cache and SQLAlchemy's prepared statement
+        # cache; both must be 0 behind a transaction-pooling PgBouncer
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        future=True,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    engine.pool.name = name
+    track_statement_cache(engine)
+    track_query_time(engine, name)
+    track_request_queries(engine)
+    track_traces(engine, name)
+    track_slow_queries(engine, name)
+    return engine
+
+
 # Async engine
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
+engine = build_engine(DATABASE_URL, "primary")
 
 # Async sessionmaker
 async_session_maker = sessionmaker(
@@ -18,3 +58,25 @@ async_session_maker = sessionmaker(
     autoflush=False,
     autocommit=False,
 )
+
+# Read replicas, one engine and sessionmaker per configured URL
+replica_engines = [build_engine(url, f"replica-{index}") for index, url in enumerate(settings.replica_urls)]
+
+replica_session_makers = [
+    sessionmaker(
+        bind=replica_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+        autocommit=False,
+    )
+    for replica_engine in replica_engines
+]
+
+
+def all_engines() -> dict:
+    """Every engine in this process, keyed by a readable name"""
+    engines = {"primary": engine}
+    for index, replica_engine in enumerate(replica_engines):
+        engines[f"replica-{index}"] = replica_engine
+    return engines
@@ -0,0 +1,155 @@
+"""Slow statement log with sampled EXPLAIN capture
+
+Any statement taking SLOW_QUERY_THRESHOLD_MS or longer is logged with its
+shape (bind values replaced by placeholders, never the values themselves),
+its duration, the calling app function and the request route. It is then added
+to the ranked slow statement view (SlowQueryService). For a sampled fraction
+(SLOW_QUERY_EXPLAIN_SAMPLE_RATE) of slow read-only SELECTs, the statement is
+re-run under EXPLAIN (ANALYZE, BUFFERS) on a separate pooled connection, in a
+background task and a rolled-back transaction. The plan is stored with the
+statement. Fast statements cost one comparison.
+"""
+
+import asyncio
+import contextvars
+import logging
+import random
+import re
+import sys
+import time
+from contextlib import contextmanager
+from typing import Optional
+import greenlet
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.config import settings
+from app.db.query_stats import current_route, statement_shape
+from app.service.slow_query_service import SlowQueryService
+
+logger = logging.getLogger(__name__)
+
+# A statement shape is explained at most once per this many seconds per process
+EXPLAIN_MIN_INTERVAL_SECONDS = 60
+
+# Only plain reads are re-run under EXPLAIN ANALYZE, which executes them
+_EXPLAINABLE = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+_NOT_EXPLAINABLE = re.compile(r"\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE)\b|\bnextval\s*\(", re.IGNORECASE)
+# Frames in these packages are plumbing, not the caller to report
+_PLUMBING = ("app.core.", "app.db.")
+
+_explained_at: dict[str, float] = {}
+# Strong references to the background recording tasks until they finish
+_background: set = set()
+
+
+def calling_function() -> Optional[str]:
+    """The innermost public app function (module:qualname) on the stack, outside app.core/app.db
+
+    SQLAlchemy runs statement hooks in a greenlet. The coroutine that awaited
+    the statement is suspended in the parent greenlet, so the search starts there.
+    """
+    current = greenlet.getcurrent()
+    frame = current.parent.gr_frame if current.parent is not None else sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        qualname = frame.f_code.co_qualname
+        # Private helpers such as SeatFastPath._fetch report their caller instead
+        private = qualname.rsplit(".", 1)[-1].startswith("_")
+        if module.startswith("app.") and not module.startswith(_PLUMBING) and not private:
+            return f"{module}:{qualname}"
+        frame = frame.f_back
+    return None
+
+
+def _explainable(statement: str) -> bool:
+    return bool(_EXPLAINABLE.match(statement)) and not _NOT_EXPLAINABLE.search(statement)
+
+
+def _spawn(coro) -> None:
+    # A fresh context keeps the recording out of the request's trace and query counts
+    task = asyncio.get_running_loop().create_task(coro, context=contextvars.Context())
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+def observe(statement: str, parameters, seconds: float, engine_name: Optional[str] = None) -> None:
+    """Log and record a statement if it crossed the slow threshold"""
+    threshold_ms = settings.SLOW_QUERY_THRESHOLD_MS
+    duration_ms = seconds * 1000
+    if threshold_ms <= 0 or duration_ms < threshold_ms or statement.lstrip()[:7].upper() == "EXPLAIN":
+        return
+
+    shape = statement_shape(statement)
+    route = current_route()
+    caller = calling_function()
+    logger.warning(
+        "Slow statement (%.1f ms) in %s from %s: %s", duration_ms, route or "-", caller or "-", shape[:500],
+        extra={"duration_ms": round(duration_ms, 2), "route": route, "caller": caller,
+               "engine": engine_name, "statement": shape},
+    )
+
+    explain = False
+    if settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE > 0 and parameters is not None and _explainable(statement):
+        now = time.monotonic()
+        if (now - _explained_at.get(shape, -EXPLAIN_MIN_INTERVAL_SECONDS) >= EXPLAIN_MIN_INTERVAL_SECONDS
+                and random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE):
+            _explained_at[shape] = now
+            explain = True
+
+    try:
+        _spawn(_record(shape, duration_ms, route, caller, statement if explain else None, parameters, engine_name))
+    except RuntimeError:
+        pass  # no running event loop (sync tooling); the log line is enough
+
+
+async def _record(shape: str, duration_ms: float, route, caller, statement, parameters, engine_name) -> None:
+    try:
+        await SlowQueryService.record(shape, duration_ms, route, caller)
+        if statement is not None:
+            plan = await _explain(statement, parameters, engine_name)
+            await SlowQueryService.record_plan(shape, plan)
+    except Exception as e:
+        logger.warning("Error recording slow statement: %s", e)
+
+
+async def _explain(statement: str, parameters, engine_name: Optional[str]) -> list:
+    """EXPLAIN (ANALYZE, BUFFERS) of a statement on a fresh pooled connection"""
+    from app.db.session import all_engines, engine as primary
+
+    engine = all_engines().get(engine_name, primary)
+    async with engine.connect() as conn:
+        try:
+            await conn.execute(text(f"SET LOCAL statement_timeout = {int(settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)}"))
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", tuple(parameters)
+            )
+            return result.scalar()
+        finally:
+            await conn.rollback()
+
+
+def track_slow_queries(engine: AsyncEngine, name: str) -> None:
+    """Watch an engine's statements for the slow statement log"""
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_started", None)
+        if started is not None:
+            # executemany parameters are a list of rows; those are never explained
+            observe(statement, None if executemany else parameters, time.perf_counter() - started, name)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before)
+    event.listen(engine.sync_engine, "after_cursor_execute", after)
+
+
+@contextmanager
+def watch_statement(statement: str, parameters: tuple = ()):
+    """Slow statement check for a statement sent straight through the driver"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(statement, parameters, time.perf_counter() - start)
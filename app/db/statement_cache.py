@@ -0,0 +1,53 @@
+"""Compiled statement cache statistics
+
+SQLAlchemy caches the compiled SQL of every statement by its cache key. A miss
+pays full compilation; a hit skips it. These counters show whether the
+service-layer queries are being reused as intended.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.engine import default
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+_OUTCOMES = {
+    default.CACHE_HIT: "hits",
+    default.CACHE_MISS: "misses",
+}
+
+
+class StatementCacheStats:
+    """Per-engine counts of compiled cache hits, misses and uncached statements"""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.counts = {"hits": 0, "misses": 0, "uncached": 0}
+        event.listen(engine.sync_engine, "before_cursor_execute", self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        if context is None:
+            return
+        # Plain text / driver SQL and statements without a cache key count as uncached
+        self.counts[_OUTCOMES.get(context.cache_hit, "uncached")] += 1
+
+    def snapshot(self) -> dict:
+        cached = self.counts["hits"] + self.counts["misses"]
+        compiled_cache = self.engine.sync_engine._compiled_cache
+        return {
+            **self.counts,
+            "hit_ratio": round(self.counts["hits"] / cached, 4) if cached else None,
+            "cached_statements": len(compiled_cache) if compiled_cache is not None else 0,
+            "cache_capacity": compiled_cache.capacity if compiled_cache is not None else 0,
+        }
+
+
+_stats: dict[int, StatementCacheStats] = {}
+
+
+def track_statement_cache(engine: AsyncEngine) -> None:
+    """Start counting compiled cache outcomes for an engine"""
+    _stats[id(engine.sync_engine)] = StatementCacheStats(engine)
+
+
+def statement_cache_stats(engine: AsyncEngine) -> dict:
+    stats = _stats.get(id(engine.sync_engine))
+    return stats.snapshot() if stats else {}
@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.api.v1.users import router as users_router  # <-- import router
 from app.api.v1.events import router as events_router  # <-- import route
@@ -6,8 +8,42 @@ from app.api.v1.event_seats import router as event_seats_router  # <-- import ro
 from app.api.v1.bookings import router as bookings_router 
 from app.api.v1.analytics import router as analytics_router  # <-- import router
 from app.api.v1.payments import router as payments_router  # <-- import router
+from app.api.v1.internal import router as internal_router
+from app.api.v1.metrics import router as metrics_router
+from app.core.config import settings
+from app.core.log import configure_logging
+from app.core.loop_monitor import loop_monitor
+from app.core.metrics import mark_process_dead
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.middleware.tracing import TracingMiddleware
+from app.service.outbox import run_relay
 
-app = FastAPI(title="Eventify Backend")
+configure_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    # Publish outbox entries (seat hold release, analytics) in the background
+    stop = asyncio.Event()
+    relay = asyncio.create_task(run_relay(stop)) if settings.OUTBOX_RELAY_IN_PROCESS else None
+    yield
+    stop.set()
+    if relay:
+        await relay
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.stop()
+    mark_process_dead()
+
+
+app = FastAPI(title="Eventify Backend", lifespan=lifespan)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
 
 app.include_router(users_router, prefix="/users", tags=["users"])
 app.include_router(venues_router, prefix="/venues", tags=["venues"])
@@ -16,4 +52,6 @@ app.include_router(events_router, prefix="/events", tags=["events"])
 app.include_router(event_seats_router, prefix="/event-seats", tags=["event-seats"])
 app.include_router(bookings_router, prefix="/bookings", tags=["bookings"])
 app.include_router(analytics_router, prefix="/analytics", tags=["analytics"])
-app.include_router(payments_router, prefix="/payments", tags=["payments"])
\ No newline at end of file
+app.include_router(payments_router, prefix="/payments", tags=["payments"])
+app.include_router(internal_router, prefix="/internal", tags=["internal"])
+app.include_router(metrics_router, tags=["metrics"])
@@ -1,18 +1,23 @@
+import logging
 from fastapi import Request, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi import Depends
+from typing import Optional
 import jwt
 
+logger = logging.getLogger(__name__)
+
 SECRET_KEY = "your_secret_key"  # Use the same key as in user creation
 
 bearer_scheme = HTTPBearer()
+optional_bearer_scheme = HTTPBearer(auto_error=False)
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)):
     token = credentials.credentials
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
         user_id = payload.get("user_id")
-        print(user_id)
+        logger.debug("Authenticated user %s", user_id)
         role = payload.get("role")
         if not user_id or not role:
             raise HTTPException(status_code=401, detail="Invalid token payload")
@@ -20,4 +25,13 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(b
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
-        raise HTTPException(status_code=401, detail="Invalid token")
\ No newline at end of file
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+async def get_optional_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer_scheme)):
+    """Return the current user for a valid token, or None for anonymous requests"""
+    if credentials is None:
+        return None
+    try:
+        return await get_current_user(credentials)
+    except HTTPException:
+        return None
@@ -0,0 +1,40 @@
+"""Request latency and in-flight metrics
+
+A plain ASGI middleware, so it adds no extra task per request and sees the
+final status code, including responses from exception handlers. Requests are
+labelled with their route template (`/bookings/{booking_id}`), not the raw
+path, to keep the number of series bounded.
+"""
+
+import time
+from app.core.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS_IN_FLIGHT
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"], route.path if route else "unmatched", str(status_code)
+            ).observe(time.perf_counter() - start)
@@ -0,0 +1,52 @@
+"""On-demand request profiling
+
+A request is profiled when it carries an X-Profile header holding a token from
+POST /internal/profiles/token, or when it is picked by PROFILE_SAMPLE_RATE
+(optionally limited to the PROFILE_PATHS prefixes). Its samples are added to
+its route template's profile once the response is sent. Other requests pay one
+header lookup and, with sampling on, one random draw.
+"""
+
+import logging
+import random
+from app.core.config import settings
+from app.core.profiler import sampler
+from app.service.profile_service import ProfileService
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+
+def _sampled(path: str) -> bool:
+    if settings.PROFILE_SAMPLE_RATE <= 0 or random.random() >= settings.PROFILE_SAMPLE_RATE:
+        return False
+    prefixes = [prefix.strip() for prefix in settings.PROFILE_PATHS.split(",") if prefix.strip()]
+    return not prefixes or path.startswith(tuple(prefixes))
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = next((value for name, value in scope["headers"] if name == PROFILE_HEADER), None)
+        if not (token and ProfileService.verify_token(token.decode("latin-1"))) and not _sampled(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        handle = sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            stacks = sampler.stop(handle)
+            route = scope.get("route")
+            if route and stacks:
+                try:
+                    await ProfileService.record(f"{scope['method']} {route.path}", stacks)
+                except Exception as e:
+                    logger.warning("Error storing profile: %s", e)
@@ -0,0 +1,44 @@
+"""Per-request statement counts and N+1 warnings
+
+Counts the statements each request sends (see app/db/query_stats.py). With
+QUERY_STATS_HEADERS on, the count and DB time are added to the response
+headers. A statement shape repeating more than QUERY_REPEAT_WARN_THRESHOLD
+times is reported as a likely N+1 loop.
+"""
+
+import logging
+from app.core.config import settings
+from app.db.query_stats import collect_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with collect_queries(scope) as stats:
+
+            async def send_with_stats(message):
+                if message["type"] == "http.response.start" and settings.QUERY_STATS_HEADERS:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-db-query-count", str(stats.count).encode()),
+                        (b"x-db-query-time-ms", f"{stats.seconds * 1000:.2f}".encode()),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+        if settings.QUERY_REPEAT_WARN_THRESHOLD:
+            route = scope.get("route")
+            for shape, count in stats.repeated(settings.QUERY_REPEAT_WARN_THRESHOLD):
+                logger.warning(
+                    "Possible N+1 in %s %s: statement ran %d times: %s",
+                    scope["method"], route.path if route else scope["path"], count, shape[:200],
+                )
@@ -0,0 +1,54 @@
+"""Root span for each traced request
+
+Starts a trace per request (see app/core/tracing.py), continuing the caller's
+trace when a `traceparent` header is sent. The header's sampled flag is
+followed only while TRACE_SAMPLE_RATE > 0 or with TRACE_TRUST_INBOUND. The
+span is named after the route template once routing is done. Sampled responses carry the trace id in
+X-Trace-Id, so a slow request can be looked up in the trace viewer.
+"""
+
+from app.core.config import settings
+from app.core.tracing import SERVER, start_trace
+
+TRACEPARENT_HEADER = b"traceparent"
+
+
+class TracingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = next((value for name, value in scope["headers"] if name == TRACEPARENT_HEADER), None)
+        with start_trace(
+            f"{scope['method']} {scope['path']}",
+            traceparent.decode("latin-1") if traceparent else None,
+            SERVER,
+            # Any client can send a sampled traceparent; it only turns tracing on
+            # where tracing is already enabled or callers are trusted
+            trust_sampled=settings.TRACE_TRUST_INBOUND or settings.TRACE_SAMPLE_RATE > 0,
+            **{"http.method": scope["method"], "http.target": scope["path"]},
+        ) as span:
+            if span is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_with_trace_id(message):
+                if message["type"] == "http.response.start":
+                    span.attributes["http.status_code"] = message["status"]
+                    message["headers"] = [*message.get("headers", []), (b"x-trace-id", span.trace_id.encode())]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_trace_id)
+            finally:
+                route = scope.get("route")
+                if route:
+                    span.name = f"{scope['method']} {route.path}"
+                    span.attributes["http.route"] = route.path
+                endpoint = scope.get("endpoint")
+                if endpoint:
+                    span.attributes["code.function"] = endpoint.__name__
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from app.db.base import Base
+
+# One row per booking of an archived event, replacing its booking_seats rows
+class BookingSeatArchive(Base):
+    __tablename__ = "booking_seat_archives"
+
+    booking_id = Column(UUID, ForeignKey("bookings.id", ondelete="CASCADE"), primary_key=True)
+    event_id = Column(UUID, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    seat_labels = Column(ARRAY(String), nullable=False)  # e.g. ['A1', 'A2']
+
+    __table_args__ = (
+        Index('ix_booking_seat_archives_event_id', 'event_id'),
+    )
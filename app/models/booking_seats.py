@@ -1,15 +1,29 @@
-from sqlalchemy import Column, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, ForeignKey, ForeignKeyConstraint, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
-import uuid
+from app.db.partitioning import attach_hash_partitions
+from app.db.ids import uuid7
 
 class BookingSeat(Base):
     __tablename__ = "booking_seats"
 
-    id = Column(UUID, primary_key=True, index=True, default=uuid.uuid4)
+    id = Column(UUID, primary_key=True, default=uuid7)
     booking_id = Column(UUID, ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False)
-    event_seat_id = Column(UUID, ForeignKey("event_seats.id", ondelete="CASCADE"), nullable=False)
-    
+    event_seat_id = Column(UUID, nullable=False)
+    # Copied from the event seat so booking seats share its partition
+    event_id = Column(UUID, primary_key=True)
+
     __table_args__ = (
-        UniqueConstraint('booking_id', 'event_seat_id', name='unique_booking_seat'),
+        ForeignKeyConstraint(
+            ['event_seat_id', 'event_id'],
+            ['event_seats.id', 'event_seats.event_id'],
+            ondelete='CASCADE',
+            name='booking_seats_event_seat_fkey',
+        ),
+        UniqueConstraint('booking_id', 'event_seat_id', 'event_id', name='unique_booking_seat'),
+        Index('ix_booking_seats_event_seat_id', 'event_seat_id'),
+        {'postgresql_partition_by': 'HASH (event_id)'},
     )
+
+
+attach_hash_partitions(BookingSeat.__table__)
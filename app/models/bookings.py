@@ -1,13 +1,13 @@
-from sqlalchemy import Column, String, ForeignKey, CheckConstraint, DateTime
+from sqlalchemy import Column, String, ForeignKey, CheckConstraint, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID, NUMERIC
 from app.db.base import Base
 from datetime import datetime
-import uuid
+from app.db.ids import uuid7
 
 class Booking(Base):
     __tablename__ = "bookings"
 
-    id = Column(UUID, primary_key=True, index=True, default=uuid.uuid4)
+    id = Column(UUID, primary_key=True, default=uuid7)
     event_id = Column(UUID, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(UUID, ForeignKey("users.id"), nullable=False)
     total_amount = Column(NUMERIC(10, 2), nullable=False)
@@ -16,4 +16,7 @@ class Booking(Base):
     
     __table_args__ = (
         CheckConstraint("status IN ('PENDING', 'CONFIRMED', 'CANCELLED')", name='check_booking_status'),
+        Index('ix_bookings_user_id', 'user_id'),
+        Index('ix_bookings_status_created_at', 'status', 'created_at'),
+        Index('ix_bookings_event_id_status', 'event_id', 'status'),
     )
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+from datetime import datetime
+
+# Seat totals kept for a finished event once its seat rows are archived
+class EventArchive(Base):
+    __tablename__ = "event_archives"
+
+    event_id = Column(UUID, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    total_seats = Column(Integer, nullable=False)
+    booked_seats = Column(Integer, nullable=False)  # seats in CONFIRMED bookings
+    archived_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    purged_at = Column(DateTime(timezone=True), nullable=True)  # set once the hot rows are deleted
@@ -1,18 +1,25 @@
-from sqlalchemy import Column, String, ForeignKey, UniqueConstraint, CheckConstraint
+from sqlalchemy import Column, String, ForeignKey, UniqueConstraint, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, NUMERIC
 from app.db.base import Base
-import uuid
+from app.db.partitioning import attach_hash_partitions
+from app.db.ids import uuid7
 
 class EventSeat(Base):
     __tablename__ = "event_seats"
 
-    id = Column(UUID, primary_key=True, index=True, default=uuid.uuid4)
-    event_id = Column(UUID, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    id = Column(UUID, primary_key=True, default=uuid7)
+    # Partition key; Postgres requires it in every unique key of a partitioned table
+    event_id = Column(UUID, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
     seat_id = Column(UUID, ForeignKey("seats.id", ondelete="CASCADE"), nullable=False)
     price = Column(NUMERIC(10, 2), nullable=False)
     status = Column(String, default='AVAILABLE')
-    
+
     __table_args__ = (
         UniqueConstraint('event_id', 'seat_id', name='unique_event_seat'),
         CheckConstraint("status IN ('AVAILABLE', 'BOOKED', 'LOCKED')", name='check_seat_status'),
+        Index('ix_event_seats_event_id_status', 'event_id', 'status'),
+        {'postgresql_partition_by': 'HASH (event_id)'},
     )
+
+
+attach_hash_partitions(EventSeat.__table__)
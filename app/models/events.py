@@ -1,14 +1,14 @@
-from sqlalchemy import Column, String, ForeignKey, Boolean
+from sqlalchemy import Column, String, ForeignKey, Boolean, Index
 from app.db.base import Base
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy import Column, Integer, String, DateTime
 from datetime import datetime
-import uuid
+from app.db.ids import uuid7
 
 class Event(Base):
     __tablename__ = "events"
 
-    id = Column(UUID, primary_key=True, index=True, default=uuid.uuid4)
+    id = Column(UUID, primary_key=True, default=uuid7)
     venue_id = Column(UUID, ForeignKey("venues.id", ondelete="CASCADE"), nullable=False)
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
@@ -19,3 +19,7 @@ class Event(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
     
+    __table_args__ = (
+        Index('ix_events_venue_id_start_time', 'venue_id', 'start_time'),
+    )
+
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, DateTime, Integer, Text, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from app.db.base import Base
+from datetime import datetime
+from app.db.ids import uuid7
+
+# Side effect of a booking or payment state change, written in the same
+# transaction as the change and published by the outbox relay
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+
+    id = Column(UUID, primary_key=True, default=uuid7)
+    topic = Column(String(50), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    published_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)  # failed publish attempts
+    last_error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index('ix_outbox_events_unpublished', 'id', postgresql_where=text('published_at IS NULL')),
+        Index('ix_outbox_events_published_at', 'published_at'),
+    )
@@ -1,13 +1,13 @@
-from sqlalchemy import Column, String, ForeignKey, CheckConstraint, DateTime
+from sqlalchemy import Column, String, ForeignKey, CheckConstraint, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID, NUMERIC
 from app.db.base import Base
 from datetime import datetime
-import uuid
+from app.db.ids import uuid7
 
 class Payment(Base):
     __tablename__ = "payments"
 
-    id = Column(UUID, primary_key=True, index=True, default=uuid.uuid4)
+    id = Column(UUID, primary_key=True, default=uuid7)
     booking_id = Column(UUID, ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(UUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     amount = Column(NUMERIC(10, 2), nullable=False)
@@ -17,5 +17,6 @@ class Payment(Base):
     updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
     
     __table_args__ = (
-        CheckConstraint("status IN ('PENDING', 'SUCCESS', 'FAILED')", name='check_payment_status'),
+        CheckConstraint("status IN ('PENDING', 'SUCCESS', 'FAILED', 'REFUNDED')", name='check_payment_status'),
+        Index('ix_payments_booking_id', 'booking_id'),
     )
\ No newline at end of file
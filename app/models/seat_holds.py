@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, ForeignKey, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+
+# Short-lived seat hold taken while a booking is paid for, used when Redis is
+# unavailable (see app/service/seat_holds.py)
+class SeatHold(Base):
+    __tablename__ = "seat_holds"
+
+    event_id = Column(UUID, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    seat_id = Column(UUID, primary_key=True)
+    owner = Column(String(100), nullable=False)  # user holding the seat
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index('ix_seat_holds_expires_at', 'expires_at'),
+    )
@@ -1,13 +1,13 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, UniqueConstraint, DateTime
+from sqlalchemy import Column, String, Integer, ForeignKey, UniqueConstraint, DateTime, Index
 from app.db.base import Base
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
-import uuid
+from app.db.ids import uuid7
 
 class Seat(Base):
     __tablename__ = "seats"
 
-    id = Column(UUID, primary_key=True, index=True, default=uuid.uuid4)
+    id = Column(UUID, primary_key=True, default=uuid7)
     venue_id = Column(UUID, ForeignKey("venues.id", ondelete="CASCADE"), nullable=False)
     label = Column(String, nullable=False)  # e.g. A1, B2
     row_no = Column(String, nullable=False)  # e.g. A, B, C
@@ -16,4 +16,5 @@ class Seat(Base):
     
     __table_args__ = (
         UniqueConstraint('venue_id', 'label', name='unique_venue_seat_label'),
+        Index('ix_seats_venue_id_row_no', 'venue_id', 'row_no'),
     )
@@ -2,12 +2,12 @@ from sqlalchemy import Column, String, CheckConstraint, DateTime
 from app.db.base import Base
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
-import uuid
+from app.db.ids import uuid7
 
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID, primary_key=True, index=True, default=uuid.uuid4)
+    id = Column(UUID, primary_key=True, default=uuid7)
     name = Column(String, nullable=False)
     email = Column(String, unique=True, nullable=False)
     password_hash = Column(String, nullable=False)
@@ -2,12 +2,12 @@ from sqlalchemy import Column, Integer, String, DateTime
 from app.db.base import Base
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
-import uuid
+from app.db.ids import uuid7
 
 class Venue(Base):
     __tablename__ = "venues"
 
-    id = Column(UUID, primary_key=True, index=True, default=uuid.uuid4)
+    id = Column(UUID, primary_key=True, default=uuid7)
     name = Column(String, nullable=False)
     address = Column(String, nullable=True)
     total_rows = Column(Integer, nullable=False)
@@ -1,11 +1,20 @@
 """Analytics business logic processor"""
 
+import logging
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.schemas.analytics import AdminAnalytics, PopularEvent, CapacityUtilization
+from app.schemas.analytics import AdminAnalytics, PopularEvent, CapacityUtilization, EventReach
 from app.service.analytics_service import AnalyticsService
-from typing import List
+from app.core.config import settings
+from app.core.redis import redis
+from typing import List, Optional
+from app.core.tracing import traced
 
+logger = logging.getLogger(__name__)
 
+ADMIN_ANALYTICS_CACHE_KEY = "analytics:admin:{skip}:{limit}"
+
+
+@traced("processor")
 class AnalyticsProcessor:
     """Processor class for analytics business logic"""
     
@@ -37,26 +46,56 @@ class AnalyticsProcessor:
         return await AnalyticsService.get_most_popular_events(db, limit)
 
     @staticmethod
-    async def get_capacity_utilization(db: AsyncSession) -> List[CapacityUtilization]:
+    async def get_capacity_utilization(db: AsyncSession, skip: int = 0, limit: Optional[int] = None) -> List[CapacityUtilization]:
         """Process getting capacity utilization with business logic"""
-        # Business logic: No specific validation needed for this operation
-        # Could add business rules like:
-        # - Only show events with minimum booking threshold
-        # - Filter by date ranges
-        # - Apply access controls based on user permissions
+        # Business logic: Validate pagination parameters
+        if skip < 0:
+            raise ValueError("Skip must be non-negative")
+        
+        if limit is not None and not AnalyticsProcessor.validate_limit(limit):
+            raise ValueError("Limit must be between 1 and 100")
         
         # Call service layer
-        return await AnalyticsService.get_capacity_utilization(db)
+        return await AnalyticsService.get_capacity_utilization(db, skip, limit)
 
     @staticmethod
-    async def get_admin_analytics(db: AsyncSession) -> AdminAnalytics:
+    async def get_admin_analytics(skip: int = 0, limit: int = 20, refresh: bool = False) -> AdminAnalytics:
         """Process getting comprehensive admin analytics with business logic"""
-        # Business logic: This is a comprehensive analytics call
-        # Could add:
-        # - Performance optimization (parallel execution)
-        # - Caching strategies
-        # - Data aggregation rules
-        # - Access control validation
+        # Business logic: Validate pagination parameters
+        if skip < 0:
+            raise ValueError("Skip must be non-negative")
+        
+        if not AnalyticsProcessor.validate_limit(limit):
+            raise ValueError("Limit must be between 1 and 100")
+        
+        # Serve a recent snapshot from Redis so repeated dashboard loads skip Postgres
+        cache_key = ADMIN_ANALYTICS_CACHE_KEY.format(skip=skip, limit=limit)
+        if not refresh:
+            try:
+                cached = await redis.get(cache_key)
+                if cached:
+                    return AdminAnalytics.model_validate_json(cached)
+            except Exception as e:
+                logger.warning("Error reading analytics cache: %s", e)
+        
+        # Call service layer
+        snapshot = await AnalyticsService.get_admin_analytics(
+            popular_limit=10, utilization_skip=skip, utilization_limit=limit
+        )
+        
+        try:
+            await redis.set(cache_key, snapshot.model_dump_json(), ex=settings.ANALYTICS_CACHE_TTL_SECONDS)
+        except Exception as e:
+            logger.warning("Error writing analytics cache: %s", e)
+        
+        return snapshot
+
+    @staticmethod
+    async def get_event_reach(event_id: str) -> EventReach:
+        """Process getting approximate event reach with business logic"""
+        # Business logic: Validate event ID format
+        if not event_id or len(event_id) < 10:
+            raise ValueError("Invalid event ID")
         
         # Call service layer
-        return await AnalyticsService.get_admin_analytics(db)
+        return await AnalyticsService.get_event_reach(event_id)
@@ -0,0 +1,32 @@
+"""Archive business logic processor"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.service.archive_service import ArchiveService
+from typing import Optional
+from app.core.tracing import traced
+
+
+@traced("processor")
+class ArchiveProcessor:
+    """Processor class for event archival business logic"""
+
+    @staticmethod
+    async def archive_finished_events(
+        db: AsyncSession,
+        older_than_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_events: Optional[int] = None,
+    ) -> dict:
+        """Process archiving finished events with business logic"""
+        # Business logic: Never archive events that may still be running
+        if older_than_days is not None and older_than_days < 1:
+            raise ValueError("older_than_days must be at least 1")
+
+        if batch_size is not None and not 1 <= batch_size <= 50000:
+            raise ValueError("batch_size must be between 1 and 50000")
+
+        if max_events is not None and max_events < 1:
+            raise ValueError("max_events must be at least 1")
+
+        # Call service layer
+        return await ArchiveService.archive_finished_events(db, older_than_days, batch_size, max_events)
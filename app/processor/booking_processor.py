@@ -3,8 +3,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.bookings import BookingCreate, BookingUpdate
 from app.service.booking_service import BookingService
+from app.service.cancellation_service import CancellationService
+from typing import Optional
+from app.core.tracing import traced
 
 
+@traced("processor")
 class BookingProcessor:
     """Processor class for booking business logic"""
     
@@ -150,6 +154,22 @@ class BookingProcessor:
         # Call service layer
         return await BookingService.cancel_booking_and_release(db, booking_id)
 
+    @staticmethod
+    async def bulk_cancel_bookings(db: AsyncSession, booking_ids: Optional[list] = None, event_id: Optional[str] = None) -> Optional[dict]:
+        """Process bulk cancellation of a list of bookings or a whole event; None if the event doesn't exist"""
+        # Business logic: Exactly one target per request
+        if (booking_ids is None) == (event_id is None):
+            raise ValueError("Provide either booking_ids or event_id")
+
+        if event_id is not None:
+            return await CancellationService.cancel_event_bookings(db, event_id)
+
+        if not 1 <= len(booking_ids) <= 50000:
+            raise ValueError("booking_ids must contain between 1 and 50000 bookings")
+
+        # Call service layer
+        return await CancellationService.cancel_bookings(db, booking_ids)
+
     @staticmethod
     async def debug_redis_locks():
         """Process Redis debug operation with business logic"""
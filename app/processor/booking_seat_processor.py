@@ -3,8 +3,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.booking_seats import BookingSeatCreate
 from app.service.booking_seat_service import BookingSeatService
+from app.core.tracing import traced
 
 
+@traced("processor")
 class BookingSeatProcessor:
     """Processor class for booking seat business logic"""
     
@@ -4,8 +4,10 @@ from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.events import EventCreate, EventUpdate, EventStatusUpdate
 from app.service.event_service import EventService
+from app.core.tracing import traced
 
 
+@traced("processor")
 class EventProcessor:
     """Processor class for event business logic"""
     
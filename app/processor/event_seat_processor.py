@@ -3,8 +3,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.event_seats import EventSeatCreate, EventSeatUpdate
 from app.service.event_seat_service import EventSeatService
+from app.service.analytics_service import AnalyticsService
+from typing import Optional
+from app.core.tracing import traced
 
 
+@traced("processor")
 class EventSeatProcessor:
     """Processor class for event seat business logic"""
     
@@ -55,22 +59,29 @@ class EventSeatProcessor:
         return await EventSeatService.get_event_seat_by_id(db, event_seat_id)
 
     @staticmethod
-    async def get_event_seats_by_event(db: AsyncSession, event_id: str):
+    async def get_event_seats_by_event(db: AsyncSession, event_id: str, viewer_id: Optional[str] = None):
         """Process getting event seats by event with business logic"""
         # Business logic: Validate event ID format
         if not event_id or len(event_id) < 10:
             raise ValueError("Invalid event ID")
         
+        # Count the seat-map view towards the event's approximate reach
+        if viewer_id:
+            await AnalyticsService.record_event_view(event_id, viewer_id)
+        
         # Call service layer
         return await EventSeatService.get_event_seats_by_event(db, event_id)
 
     @staticmethod
-    async def get_available_event_seats(db: AsyncSession, event_id: str):
+    async def get_available_event_seats(db: AsyncSession, event_id: str, viewer_id: Optional[str] = None):
         """Process getting available event seats with business logic"""
         # Business logic: Validate event ID format
         if not event_id or len(event_id) < 10:
             raise ValueError("Invalid event ID")
         
+        if viewer_id:
+            await AnalyticsService.record_event_view(event_id, viewer_id)
+        
         # Call service layer
         return await EventSeatService.get_available_event_seats(db, event_id)
 
@@ -0,0 +1,34 @@
+"""Seat hold inspection business logic processor"""
+
+from app.service.lock_service import LockService
+from typing import Optional
+from app.core.tracing import traced
+
+
+@traced("processor")
+class LockProcessor:
+    """Processor class for seat hold inspection business logic"""
+
+    @staticmethod
+    async def list_locks(cursor: int = 0, count: int = 100, event_id: Optional[str] = None) -> dict:
+        """Process listing one page of seat holds with business logic"""
+        # Business logic: Keep pages small so each call stays cheap for Redis
+        if cursor < 0:
+            raise ValueError("cursor must not be negative")
+
+        if not 1 <= count <= 1000:
+            raise ValueError("count must be between 1 and 1000")
+
+        # Call service layer
+        return await LockService.list_locks(cursor, count, event_id)
+
+    @staticmethod
+    async def count_event_locks(event_id: str) -> dict:
+        """Process counting an event's seat holds with business logic"""
+        return {"event_id": event_id, "lock_count": await LockService.count_event_locks(event_id)}
+
+    @staticmethod
+    async def clear_locks(event_id: Optional[str] = None) -> dict:
+        """Process clearing seat holds with business logic"""
+        cleared = await LockService.clear_locks(event_id)
+        return {"message": f"Cleared {cleared} locks", "cleared": cleared}
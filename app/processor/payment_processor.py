@@ -1,13 +1,21 @@
 """Payment processor for handling payment operations"""
 
+import logging
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.service.payment_service import PaymentService
 from app.schemas.payments import PaymentCreate, PaymentStatusUpdate
 from app.core.redis import redis
+from app.core.config import settings
+from app.core.metrics import PAYMENT_OUTCOMES
+from app.service.payment_queue import PaymentQueue
 import asyncio
 import uuid
+from app.core.tracing import CLIENT, start_span, traced
 
+logger = logging.getLogger(__name__)
+
+@traced("processor")
 class PaymentProcessor:
     """Processor class for payment operations"""
     
@@ -42,6 +50,35 @@ class PaymentProcessor:
     @staticmethod
     async def process_payment(db: AsyncSession, booking_id: str, payment_data: dict = None) -> dict:
         """Process payment for a booking"""
+        if settings.PAYMENT_MODE != "async":
+            return await PaymentProcessor.settle_payment(db, booking_id, payment_data)
+
+        # Async mode: a payment worker calls the gateway; the client polls for the outcome
+        try:
+            booking = await PaymentService.get_booking_status(db, booking_id)
+            if not booking:
+                return {"success": False, "error": "Booking not found"}
+            if booking["status"] != "PENDING":
+                return {"success": False, "error": "Booking is not in PENDING status"}
+
+            state, queued = await PaymentQueue.enqueue(booking_id, payment_data)
+            return {
+                "success": True,
+                "queued": True,
+                "booking_id": booking_id,
+                "status": state["status"],
+                "message": "Payment accepted for processing" if queued else "Payment already in progress",
+                "status_url": f"/payments/status/{booking_id}?wait={settings.PAYMENT_STATUS_MAX_WAIT_SECONDS}"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    @staticmethod
+    async def settle_payment(db: AsyncSession, booking_id: str, payment_data: dict = None) -> dict:
+        """Call the payment gateway and confirm or cancel the booking with its answer"""
         try:
             # Mock payment processing - in real app, integrate with payment gateway
             payment_success = await PaymentProcessor._mock_payment_gateway(payment_data)
@@ -51,6 +88,7 @@ class PaymentProcessor:
                 result = await PaymentService.confirm_payment_and_booking(
                     db, booking_id, payment_data.get("transaction_ref") if payment_data else None
                 )
+                PAYMENT_OUTCOMES.labels("success").inc()
                 return {
                     "success": True,
                     "booking_id": result["booking_id"],
@@ -64,6 +102,7 @@ class PaymentProcessor:
                 result = await PaymentService.fail_payment_and_cancel_booking(
                     db, booking_id, payment_data.get("transaction_ref") if payment_data else None
                 )
+                PAYMENT_OUTCOMES.labels("failed").inc()
                 return {
                     "success": False,
                     "booking_id": result["booking_id"],
@@ -73,11 +112,55 @@ class PaymentProcessor:
                     "message": "Payment failed and booking cancelled"
                 }
         except Exception as e:
+            PAYMENT_OUTCOMES.labels("error").inc()
             return {
                 "success": False,
                 "error": str(e)
             }
 
+    @staticmethod
+    async def settle_queued_payment(db: AsyncSession, booking_id: str, payment_data: dict = None) -> dict:
+        """Settle a queued payment attempt unless its booking is no longer PENDING"""
+        try:
+            booking = await PaymentService.get_booking_status(db, booking_id)
+        except Exception as e:
+            return {"success": False, "booking_id": booking_id, "status": "ERROR", "error": str(e)}
+        if not booking:
+            return {"success": False, "booking_id": booking_id, "status": "ERROR", "error": "Booking not found"}
+        if booking["status"] != "PENDING":
+            # Settled or cancelled since the attempt was queued; the gateway is not called again
+            return PaymentProcessor._settled_attempt(booking)
+
+        result = await PaymentProcessor.settle_payment(db, booking_id, payment_data)
+        if "status" in result:
+            return result
+        return await PaymentProcessor.failed_attempt(db, booking_id, result["error"])
+
+    @staticmethod
+    async def failed_attempt(db: AsyncSession, booking_id: str, error: str) -> dict:
+        """Outcome of a failed attempt: the booking's final state if it has one, else ERROR"""
+        # Another attempt or the hold expiry may have settled the booking meanwhile;
+        # its final state is reported rather than this attempt's error
+        try:
+            await db.rollback()
+            booking = await PaymentService.get_booking_status(db, booking_id)
+        except Exception as e:
+            logger.warning("Error re-checking booking %s: %s", booking_id, e)
+            booking = None
+        if booking and booking["status"] in ("CONFIRMED", "CANCELLED"):
+            return PaymentProcessor._settled_attempt(booking)
+        return {"success": False, "booking_id": booking_id, "status": "ERROR", "error": error}
+
+    @staticmethod
+    def _settled_attempt(booking: dict) -> dict:
+        return {
+            "success": booking["status"] == "CONFIRMED",
+            "booking_id": booking["booking_id"],
+            "status": booking["status"],
+            "transaction_ref": booking["transaction_ref"],
+            "message": f"Booking is already {booking['status']}"
+        }
+
     @staticmethod
     async def cancel_booking(db: AsyncSession, booking_id: str) -> dict:
         """Cancel a pending booking"""
@@ -98,9 +181,17 @@ class PaymentProcessor:
             }
 
     @staticmethod
-    async def get_booking_status(db: AsyncSession, booking_id: str) -> dict:
-        """Get booking and payment status"""
+    async def get_booking_status(db: AsyncSession, booking_id: str, wait: int = 0) -> dict:
+        """Get booking and payment status, waiting up to wait seconds for a queued payment"""
         try:
+            attempt = None
+            if settings.PAYMENT_MODE == "async":
+                wait = max(0, min(wait, settings.PAYMENT_STATUS_MAX_WAIT_SECONDS))
+                if wait:
+                    attempt = await PaymentQueue.wait_for_result(booking_id, wait)
+                else:
+                    attempt = await PaymentQueue.get_result(booking_id)
+
             result = await PaymentService.get_booking_status(db, booking_id)
             if not result:
                 return {
@@ -108,10 +199,13 @@ class PaymentProcessor:
                     "error": "Booking not found"
                 }
             
-            return {
+            response = {
                 "success": True,
                 "booking": result
             }
+            if attempt is not None:
+                response["payment_attempt"] = attempt
+            return response
         except Exception as e:
             return {
                 "success": False,
@@ -121,29 +215,32 @@ class PaymentProcessor:
     @staticmethod
     async def _mock_payment_gateway(payment_data: dict = None) -> bool:
         """Mock payment gateway - returns True for successful payments"""
-        # Simulate payment processing delay
-        await asyncio.sleep(1)
-        
-        # Mock logic - 90% success rate
-        import random
-        return random.random() < 0.9
+        with start_span("payment gateway", CLIENT):
+            # Simulate payment processing delay
+            await asyncio.sleep(1)
+
+            # Mock logic - 90% success rate
+            import random
+            return random.random() < 0.9
 
     @staticmethod
     async def _schedule_cleanup(db: AsyncSession, booking_id: str, delay_seconds: int):
         """Schedule cleanup for expired booking"""
         await asyncio.sleep(delay_seconds)
-        
-        try:
-            # Check if booking is still pending
-            result = await PaymentService.get_booking_status(db, booking_id)
-            if result and result["status"] == "PENDING":
-                # Auto-cancel expired booking
-                await PaymentService.fail_payment_and_cancel_booking(
-                    db, booking_id, "AUTO_EXPIRED"
-                )
-                print(f"Auto-cancelled expired booking: {booking_id}")
-        except Exception as e:
-            print(f"Error in scheduled cleanup for booking {booking_id}: {e}")
+
+        # Runs in the booking request's trace, which create_task() carried over
+        with start_span("hold expiry", booking_id=str(booking_id)):
+            try:
+                # Check if booking is still pending
+                result = await PaymentService.get_booking_status(db, booking_id)
+                if result and result["status"] == "PENDING":
+                    # Auto-cancel expired booking
+                    await PaymentService.fail_payment_and_cancel_booking(
+                        db, booking_id, "AUTO_EXPIRED"
+                    )
+                    logger.info("Auto-cancelled expired booking: %s", booking_id)
+            except Exception:
+                logger.exception("Error in scheduled cleanup for booking %s", booking_id)
 
     @staticmethod
     async def cleanup_expired_bookings(db: AsyncSession) -> dict:
@@ -4,8 +4,10 @@ import re
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.seats import SeatCreate, SeatUpdate
 from app.service.seat_service import SeatService
+from app.core.tracing import traced
 
 
+@traced("processor")
 class SeatProcessor:
     """Processor class for seat business logic"""
     
@@ -4,8 +4,10 @@ import re
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.users import UserCreate, UserLogin
 from app.service.user_service import UserService
+from app.core.tracing import traced
 
 
+@traced("processor")
 class UserProcessor:
     """Processor class for user business logic"""
     
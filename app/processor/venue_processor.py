@@ -3,8 +3,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.venues import VenueCreate, VenueUpdate
 from app.service.venue_service import VenueService
+from app.core.tracing import traced
 
 
+@traced("processor")
 class VenueProcessor:
     """Processor class for venue business logic"""
     
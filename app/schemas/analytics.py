@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import List, Optional
 from decimal import Decimal
+from datetime import datetime
 
 
 class PopularEvent(BaseModel):
@@ -23,3 +24,13 @@ class AdminAnalytics(BaseModel):
     total_confirmed_bookings: int
     most_popular_events: List[PopularEvent]
     capacity_utilization: List[CapacityUtilization]
+    utilization_skip: int = 0
+    utilization_limit: Optional[int] = None
+    generated_at: Optional[datetime] = None
+
+
+class EventReach(BaseModel):
+    event_id: str
+    unique_viewers: int
+    unique_buyers: int
+    standard_error: float
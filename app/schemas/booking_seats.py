@@ -10,6 +10,7 @@ class BookingSeatCreate(BookingSeatBase):
 
 class BookingSeatOut(BookingSeatBase):
     id: uuid.UUID
+    event_id: uuid.UUID
 
     model_config = {
         "arbitrary_types_allowed": True
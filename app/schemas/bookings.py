@@ -37,3 +37,7 @@ class SeatBookingRequest(BaseModel):
 class CancelBookingRequest(BaseModel):
     booking_id: uuid.UUID
 
+
+class BulkCancelRequest(BaseModel):
+    booking_ids: Optional[List[uuid.UUID]] = None
+    event_id: Optional[uuid.UUID] = None
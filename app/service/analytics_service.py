@@ -1,19 +1,36 @@
 """Analytics database service operations"""
 
+import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, and_, union_all
 from app.models.bookings import Booking
 from app.models.events import Event
 from app.models.venues import Venue
 from app.models.seats import Seat
 from app.models.booking_seats import BookingSeat
 from app.models.event_seats import EventSeat
-from app.schemas.analytics import AdminAnalytics, PopularEvent, CapacityUtilization
-from typing import List
+from app.models.event_archives import EventArchive
+from app.schemas.analytics import AdminAnalytics, PopularEvent, CapacityUtilization, EventReach
+from app.core.redis import redis
+from app.db.replicas import replica_router
+from datetime import datetime, timezone
+from typing import List, Optional
+import asyncio
+from app.core.tracing import traced
 
+logger = logging.getLogger(__name__)
 
+# Approximate reach counters are Redis HyperLogLogs: each key uses at most 12 KB
+# (16384 six-bit registers) no matter how many ids are added, and estimates
+# distinct counts with a standard error of 0.81% (1.04 / sqrt(16384)).
+VIEWERS_HLL_KEY = "hll:event:{event_id}:viewers"
+BUYERS_HLL_KEY = "hll:event:{event_id}:buyers"
+HLL_STANDARD_ERROR = 0.0081
+
+
+@traced("service")
 class AnalyticsService:
     """Service class for analytics database operations"""
     
@@ -32,22 +49,37 @@ class AnalyticsService:
     async def get_most_popular_events(db: AsyncSession, limit: int = 10) -> List[PopularEvent]:
         """Get top 10 most popular events by total seats booked"""
         try:
-            # Query to get events with their booked seat counts
+            # Booked seat counts per event from the hot tables, skipping events
+            # already summarized in the archive
+            hot_booked = (
+                select(
+                    EventSeat.event_id.label('event_id'),
+                    func.count(BookingSeat.id).label('total_seats_booked')
+                )
+                .select_from(EventSeat)
+                .join(BookingSeat, and_(EventSeat.id == BookingSeat.event_seat_id, EventSeat.event_id == BookingSeat.event_id))
+                .join(Booking, BookingSeat.booking_id == Booking.id)
+                .where(Booking.status == 'CONFIRMED', EventSeat.event_id.not_in(select(EventArchive.event_id)))
+                .group_by(EventSeat.event_id)
+            )
+            archived_booked = (
+                select(EventArchive.event_id, EventArchive.booked_seats)
+                .where(EventArchive.booked_seats > 0)
+            )
+            booked = union_all(hot_booked, archived_booked).subquery()
+            
             query = (
                 select(
                     Event.id,
                     Event.title,
-                    func.count(BookingSeat.id).label('total_seats_booked'),
+                    booked.c.total_seats_booked,
                     Venue.name.label('venue_name')
                 )
                 .select_from(Event)
-                .join(EventSeat, Event.id == EventSeat.event_id)
-                .join(BookingSeat, EventSeat.id == BookingSeat.event_seat_id)
-                .join(Booking, BookingSeat.booking_id == Booking.id)
+                .join(booked, Event.id == booked.c.event_id)
                 .join(Venue, Event.venue_id == Venue.id)
-                .where(Booking.status == 'CONFIRMED', Event.is_active == True)
-                .group_by(Event.id, Event.title, Venue.name)
-                .order_by(desc('total_seats_booked'))
+                .where(Event.is_active == True)
+                .order_by(desc(booked.c.total_seats_booked))
                 .limit(limit)
             )
             
@@ -67,8 +99,8 @@ class AnalyticsService:
             raise Exception(f"Error fetching most popular events: {str(e)}")
 
     @staticmethod
-    async def get_capacity_utilization(db: AsyncSession) -> List[CapacityUtilization]:
-        """Get capacity utilization for all events"""
+    async def get_capacity_utilization(db: AsyncSession, skip: int = 0, limit: Optional[int] = None) -> List[CapacityUtilization]:
+        """Get capacity utilization for active events, most booked first"""
         try:
             # Subquery to get booked seats count per event
             booked_seats_subquery = (
@@ -77,29 +109,46 @@ class AnalyticsService:
                     func.count(BookingSeat.id).label('booked_seats')
                 )
                 .select_from(EventSeat)
-                .join(BookingSeat, EventSeat.id == BookingSeat.event_seat_id)
+                .join(BookingSeat, and_(EventSeat.id == BookingSeat.event_seat_id, EventSeat.event_id == BookingSeat.event_id))
                 .join(Booking, BookingSeat.booking_id == Booking.id)
                 .where(Booking.status == 'CONFIRMED')
                 .group_by(EventSeat.event_id)
             ).subquery()
             
+            # Total and booked seats per event still in the hot tables
+            hot_capacity = (
+                select(
+                    EventSeat.event_id.label('event_id'),
+                    func.count(EventSeat.id).label('total_seats'),
+                    func.coalesce(booked_seats_subquery.c.booked_seats, 0).label('booked_seats')
+                )
+                .select_from(EventSeat)
+                .outerjoin(booked_seats_subquery, EventSeat.event_id == booked_seats_subquery.c.event_id)
+                .where(EventSeat.event_id.not_in(select(EventArchive.event_id)))
+                .group_by(EventSeat.event_id, booked_seats_subquery.c.booked_seats)
+            )
+            # Archived events keep their totals in the archive summary
+            archived_capacity = select(EventArchive.event_id, EventArchive.total_seats, EventArchive.booked_seats)
+            capacity = union_all(hot_capacity, archived_capacity).subquery()
+            
             # Main query to get total seats and booked seats per event
             query = (
                 select(
                     Event.id,
                     Event.title,
-                    func.count(EventSeat.id).label('total_seats'),
-                    func.coalesce(booked_seats_subquery.c.booked_seats, 0).label('booked_seats'),
+                    capacity.c.total_seats,
+                    capacity.c.booked_seats,
                     Venue.name.label('venue_name')
                 )
                 .select_from(Event)
-                .join(EventSeat, Event.id == EventSeat.event_id)
+                .join(capacity, Event.id == capacity.c.event_id)
                 .join(Venue, Event.venue_id == Venue.id)
-                .outerjoin(booked_seats_subquery, Event.id == booked_seats_subquery.c.event_id)
                 .where(Event.is_active == True)
-                .group_by(Event.id, Event.title, Venue.name, booked_seats_subquery.c.booked_seats)
-                .order_by(desc('booked_seats'))
+                .order_by(desc(capacity.c.booked_seats), Event.id)
+                .offset(skip)
             )
+            if limit is not None:
+                query = query.limit(limit)
             
             result = await db.execute(query)
             rows = result.fetchall()
@@ -126,17 +175,69 @@ class AnalyticsService:
             raise Exception(f"Error fetching capacity utilization: {str(e)}")
 
     @staticmethod
-    async def get_admin_analytics(db: AsyncSession) -> AdminAnalytics:
-        """Get comprehensive admin analytics"""
+    async def _run_in_session(query_fn, *args):
+        """Run an analytics query on its own pooled read session"""
+        session_maker = await replica_router.choose()
+        async with session_maker() as session:
+            return await query_fn(session, *args)
+
+    @staticmethod
+    async def get_admin_analytics(popular_limit: int = 10, utilization_skip: int = 0, utilization_limit: int = 20) -> AdminAnalytics:
+        """Get comprehensive admin analytics, running each sub-query concurrently"""
         try:
-            total_bookings = await AnalyticsService.get_total_confirmed_bookings(db)
-            popular_events = await AnalyticsService.get_most_popular_events(db, limit=10)
-            capacity_utilization = await AnalyticsService.get_capacity_utilization(db)
+            # A session can only run one statement at a time, so each sub-query
+            # takes its own pooled connection and the total latency is the
+            # slowest query rather than the sum of all three.
+            total_bookings, popular_events, capacity_utilization = await asyncio.gather(
+                AnalyticsService._run_in_session(AnalyticsService.get_total_confirmed_bookings),
+                AnalyticsService._run_in_session(AnalyticsService.get_most_popular_events, popular_limit),
+                AnalyticsService._run_in_session(
+                    AnalyticsService.get_capacity_utilization, utilization_skip, utilization_limit
+                ),
+            )
             
             return AdminAnalytics(
                 total_confirmed_bookings=total_bookings,
                 most_popular_events=popular_events,
-                capacity_utilization=capacity_utilization
+                capacity_utilization=capacity_utilization,
+                utilization_skip=utilization_skip,
+                utilization_limit=utilization_limit,
+                generated_at=datetime.now(timezone.utc)
             )
         except Exception as e:
             raise Exception(f"Error generating admin analytics: {str(e)}")
+
+    @staticmethod
+    async def record_event_view(event_id: str, viewer_id: str) -> None:
+        """Add a viewer to the event's approximate unique-viewer counter"""
+        try:
+            await redis.pfadd(VIEWERS_HLL_KEY.format(event_id=event_id), viewer_id)
+        except Exception as e:
+            # Reach counters are best effort and must never fail a seat-map read
+            logger.warning("Error recording event view: %s", e)
+
+    @staticmethod
+    async def record_event_buyer(event_id: str, user_id: str) -> None:
+        """Add a buyer to the event's approximate unique-buyer counter"""
+        try:
+            await redis.pfadd(BUYERS_HLL_KEY.format(event_id=event_id), user_id)
+        except Exception as e:
+            logger.warning("Error recording event buyer: %s", e)
+
+    @staticmethod
+    async def get_event_reach(event_id: str) -> EventReach:
+        """Get approximate distinct viewers and buyers for an event"""
+        try:
+            pipe = redis.pipeline(transaction=False)
+            pipe.pfcount(VIEWERS_HLL_KEY.format(event_id=event_id))
+            pipe.pfcount(BUYERS_HLL_KEY.format(event_id=event_id))
+            unique_viewers, unique_buyers = await pipe.execute()
+
+            return EventReach(
+                event_id=event_id,
+                unique_viewers=unique_viewers,
+                unique_buyers=unique_buyers,
+                standard_error=HLL_STANDARD_ERROR
+            )
+        except Exception as e:
+            raise Exception(f"Error fetching event reach: {str(e)}")
@@ -0,0 +1,141 @@
+"""Archival of finished events' seat data"""
+
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import and_, delete, func, update
+from app.models.bookings import Booking
+from app.models.booking_seats import BookingSeat
+from app.models.booking_seat_archives import BookingSeatArchive
+from app.models.events import Event
+from app.models.event_archives import EventArchive
+from app.models.event_seats import EventSeat
+from app.models.seats import Seat
+from app.core.config import settings
+from typing import Optional
+from app.core.tracing import traced
+
+
+@traced("service")
+class ArchiveService:
+    """Service class for moving finished events out of the hot seat tables"""
+
+    @staticmethod
+    async def archive_finished_events(
+        db: AsyncSession,
+        older_than_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_events: Optional[int] = None,
+    ) -> dict:
+        """Summarize events that ended before the cutoff, then delete their hot seat rows in batches"""
+        older_than_days = settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+        batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+        try:
+            query = (
+                select(Event.id)
+                .outerjoin(EventArchive, Event.id == EventArchive.event_id)
+                .where(Event.end_time < cutoff, EventArchive.event_id.is_(None))
+                .order_by(Event.end_time)
+            )
+            if max_events is not None:
+                query = query.limit(max_events)
+            event_ids = (await db.execute(query)).scalars().all()
+            for event_id in event_ids:
+                await ArchiveService._summarize_event(db, event_id)
+
+            # Purge every summarized event still holding hot rows, including
+            # ones left over from an interrupted earlier run
+            pending = (await db.execute(
+                select(EventArchive.event_id).where(EventArchive.purged_at.is_(None))
+            )).scalars().all()
+            booking_seats_deleted = 0
+            event_seats_deleted = 0
+            for event_id in pending:
+                booking_seats_deleted += await ArchiveService._delete_in_batches(db, BookingSeat, event_id, batch_size)
+                event_seats_deleted += await ArchiveService._delete_in_batches(db, EventSeat, event_id, batch_size)
+                await db.execute(
+                    update(EventArchive)
+                    .where(EventArchive.event_id == event_id)
+                    .values(purged_at=datetime.now(timezone.utc))
+                )
+                await db.commit()
+
+            return {
+                "cutoff": cutoff,
+                "events_archived": len(event_ids),
+                "events_purged": len(pending),
+                "booking_seats_deleted": booking_seats_deleted,
+                "event_seats_deleted": event_seats_deleted,
+            }
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise Exception(f"Error archiving events: {str(e)}")
+
+    @staticmethod
+    async def _summarize_event(db: AsyncSession, event_id) -> None:
+        """Copy an event's seat totals and per-booking seat labels into the archive tables"""
+        seat_labels = (
+            select(BookingSeat.booking_id, BookingSeat.event_id, func.array_agg(Seat.label))
+            .join(EventSeat, and_(EventSeat.id == BookingSeat.event_seat_id, EventSeat.event_id == BookingSeat.event_id))
+            .join(Seat, Seat.id == EventSeat.seat_id)
+            .where(BookingSeat.event_id == event_id)
+            .group_by(BookingSeat.booking_id, BookingSeat.event_id)
+        )
+        await db.execute(
+            insert(BookingSeatArchive)
+            .from_select(['booking_id', 'event_id', 'seat_labels'], seat_labels)
+            .on_conflict_do_nothing(index_elements=['booking_id'])
+        )
+
+        total_seats = (await db.execute(
+            select(func.count(EventSeat.id)).where(EventSeat.event_id == event_id)
+        )).scalar() or 0
+        booked_seats = (await db.execute(
+            select(func.count(BookingSeat.id))
+            .join(Booking, BookingSeat.booking_id == Booking.id)
+            .where(BookingSeat.event_id == event_id, Booking.status == 'CONFIRMED')
+        )).scalar() or 0
+        await db.execute(
+            insert(EventArchive)
+            .values(event_id=event_id, total_seats=total_seats, booked_seats=booked_seats, archived_at=datetime.now(timezone.utc))
+            .on_conflict_do_nothing(index_elements=['event_id'])
+        )
+        await db.commit()
+
+    @staticmethod
+    async def _delete_in_batches(db: AsyncSession, model, event_id, batch_size: int) -> int:
+        """Delete an event's rows from a hot table, committing after every batch"""
+        deleted = 0
+        while True:
+            batch = (
+                select(model.id)
+                .where(model.event_id == event_id)
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            result = await db.execute(
+                delete(model)
+                .where(model.event_id == event_id, model.id.in_(batch))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted
+
+    @staticmethod
+    async def get_archived_seat_labels(db: AsyncSession, booking_ids: list) -> dict:
+        """Seat labels of archived bookings, keyed by booking id"""
+        if not booking_ids:
+            return {}
+        try:
+            result = await db.execute(
+                select(BookingSeatArchive.booking_id, BookingSeatArchive.seat_labels)
+                .where(BookingSeatArchive.booking_id.in_(booking_ids))
+            )
+            return {row.booking_id: list(row.seat_labels) for row in result.all()}
+        except SQLAlchemyError as e:
+            raise Exception(f"Error fetching archived seats: {str(e)}")
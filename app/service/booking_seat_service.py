@@ -5,10 +5,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.booking_seats import BookingSeat
+from app.models.event_seats import EventSeat
 from app.schemas.booking_seats import BookingSeatCreate
-import uuid
+from app.db.ids import uuid7
+from app.core.tracing import traced
 
 
+@traced("service")
 class BookingSeatService:
     """Service class for booking seat database operations"""
     
@@ -16,10 +19,14 @@ class BookingSeatService:
     async def create_booking_seat(db: AsyncSession, booking_seat: BookingSeatCreate):
         """Create booking seat in database"""
         try:
+            # booking_seats is partitioned by the event seat's event
+            result = await db.execute(select(EventSeat.event_id).where(EventSeat.id == booking_seat.event_seat_id))
+            event_id = result.scalar_one()
             db_booking_seat = BookingSeat(
-                id=uuid.uuid4(),
+                id=uuid7(),
                 booking_id=booking_seat.booking_id,
-                event_seat_id=booking_seat.event_seat_id
+                event_seat_id=booking_seat.event_seat_id,
+                event_id=event_id
             )
             db.add(db_booking_seat)
             await db.commit()
@@ -1,24 +1,34 @@
 """Booking database service operations"""
 
+import logging
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.bookings import Booking
 from app.models.booking_seats import BookingSeat
-from app.models.event_seats import EventSeat
-from app.models.events import Event
-from app.models.venues import Venue
-from app.models.seats import Seat
 from app.schemas.bookings import BookingCreate, BookingUpdate
 from app.service.event_service import EventService
+from app.service.outbox import BOOKING_CONFIRMED, Outbox
+from app.service.archive_service import ArchiveService
+from app.service.cancellation_service import CancellationService
+from app.service.seat_fastpath import SeatFastPath
+from app.core.config import settings
+from app.core.metrics import SEAT_HOLD_ATTEMPTS
+from app.service import queries
 from app.core.redis import redis
+from app.service.seat_holds import seat_holds
+from app.service.lock_service import LockService
 from decimal import Decimal
-import uuid
+from app.db.ids import uuid7
+from app.core.tracing import traced
+
+logger = logging.getLogger(__name__)
 
 LOCK_TTL_SECONDS = 180
 
 
+@traced("service")
 class BookingService:
     """Service class for booking database operations"""
     
@@ -27,7 +37,7 @@ class BookingService:
         """Create booking in database"""
         try:
             db_booking = Booking(
-                id=uuid.uuid4(),
+                id=uuid7(),
                 event_id=booking.event_id,
                 user_id=booking.user_id,
                 total_amount=booking.total_amount,
@@ -45,7 +55,7 @@ class BookingService:
     async def get_booking_by_id(db: AsyncSession, booking_id: str):
         """Get booking by ID from database"""
         try:
-            result = await db.execute(select(Booking).where(Booking.id == booking_id))
+            result = await db.execute(queries.BOOKING_BY_ID, {"booking_id": booking_id})
             return result.scalars().first()
         except SQLAlchemyError as e:
             raise Exception(f"Error fetching booking: {str(e)}")
@@ -54,37 +64,31 @@ class BookingService:
     async def get_bookings_by_user(db: AsyncSession, user_id: str):
         """Get bookings by user from database with event and venue details"""
         try:
-            # Join booking with event, venue, booking_seats, event_seats, and seats
-            query = (
-                select(
-                    Booking,
-                    Event.title.label('event_name'),
-                    Venue.name.label('venue_name'),
-                    Event.start_time,
-                    Event.end_time
-                )
-                .join(Event, Booking.event_id == Event.id)
-                .join(Venue, Event.venue_id == Venue.id)
-                .where(Booking.user_id == user_id)
-            )
-            
-            result = await db.execute(query)
+            # Join booking with event and venue
+            result = await db.execute(queries.USER_BOOKINGS, {"user_id": user_id})
             bookings_data = result.all()
             
+            # Bookings of archived events keep their seat labels in the archive table
+            booking_ids = [booking_row.Booking.id for booking_row in bookings_data]
+            seat_labels_by_booking = await ArchiveService.get_archived_seat_labels(db, booking_ids)
+
+            # Seat labels of the other bookings, in one query
+            live_bookings = [
+                booking_row.Booking for booking_row in bookings_data
+                if booking_row.Booking.id not in seat_labels_by_booking
+            ]
+            if live_bookings:
+                seats_result = await db.execute(queries.BOOKINGS_SEAT_LABELS, {
+                    "booking_ids": [booking.id for booking in live_bookings],
+                    "event_ids": list({booking.event_id for booking in live_bookings}),
+                })
+                seat_labels_by_booking.update((row.booking_id, list(row.labels)) for row in seats_result.all())
+            
             # Format the response
             formatted_bookings = []
             for booking_row in bookings_data:
                 booking = booking_row.Booking
-                
-                # Get seat labels for this booking
-                seats_query = (
-                    select(Seat.label)
-                    .join(EventSeat, Seat.id == EventSeat.seat_id)
-                    .join(BookingSeat, EventSeat.id == BookingSeat.event_seat_id)
-                    .where(BookingSeat.booking_id == booking.id)
-                )
-                seats_result = await db.execute(seats_query)
-                seat_labels = [row.label for row in seats_result.all()]
+                seat_labels = seat_labels_by_booking.get(booking.id, [])
                 
                 formatted_booking = {
                     "id": booking.id,
@@ -109,7 +113,7 @@ class BookingService:
     async def get_bookings_by_event(db: AsyncSession, event_id: str):
         """Get bookings by event from database"""
         try:
-            result = await db.execute(select(Booking).where(Booking.event_id == event_id))
+            result = await db.execute(queries.BOOKINGS_BY_EVENT, {"event_id": event_id})
             return result.scalars().all()
         except SQLAlchemyError as e:
             raise Exception(f"Error fetching event bookings: {str(e)}")
@@ -127,7 +131,7 @@ class BookingService:
     async def update_booking(db: AsyncSession, booking_id: str, booking_update: BookingUpdate):
         """Update booking in database"""
         try:
-            result = await db.execute(select(Booking).where(Booking.id == booking_id))
+            result = await db.execute(queries.BOOKING_BY_ID, {"booking_id": booking_id})
             db_booking = result.scalars().first()
             if not db_booking:
                 return None
@@ -148,7 +152,7 @@ class BookingService:
     async def delete_booking(db: AsyncSession, booking_id: str):
         """Delete booking from database"""
         try:
-            result = await db.execute(select(Booking).where(Booking.id == booking_id))
+            result = await db.execute(queries.BOOKING_BY_ID, {"booking_id": booking_id})
             db_booking = result.scalars().first()
             if not db_booking:
                 return None
@@ -168,29 +172,28 @@ class BookingService:
             raise Exception("Event is not available for booking (inactive or finished)")
         
         # Step 1: Validate all seats are AVAILABLE
-        result = await db.execute(select(EventSeat).where(EventSeat.event_id == event_id, EventSeat.seat_id.in_(seat_ids)))
-        seats = result.scalars().all()
+        if settings.DB_FASTPATH_ENABLED:
+            seats = await SeatFastPath.get_seats_for_booking(db, event_id, seat_ids)
+        else:
+            result = await db.execute(queries.EVENT_SEATS_FOR_BOOKING, {"event_id": event_id, "seat_ids": seat_ids})
+            seats = result.scalars().all()
         if len(seats) != len(seat_ids):
             raise Exception("One or more seats do not exist for this event")
         if any(s.status != "AVAILABLE" for s in seats):
             raise Exception("One or more selected seats are not available")
 
-        # Step 2: Acquire locks in Redis
-        acquired_keys: list[str] = []
+        # Step 2: Hold the seats (Redis, or Postgres while Redis is down)
+        held = await seat_holds.acquire(db, event_id, seat_ids, user_id, LOCK_TTL_SECONDS)
+        SEAT_HOLD_ATTEMPTS.labels(str(event_id), "acquired" if held else "conflict").inc()
+        if not held:
+            raise Exception("Seat not available")
         try:
-            for seat_id in seat_ids:
-                lock_key = f"lock:{event_id}:{seat_id}"
-                ok = await redis.set(lock_key, user_id, ex=LOCK_TTL_SECONDS, nx=True)
-                if not ok:
-                    raise Exception("Seat not available")
-                acquired_keys.append(lock_key)
-
             # Step 3: Compute total amount from event_seats price
             total_amount = sum(Decimal(str(s.price)) for s in seats)
 
             # Step 4: Create Booking and BookingSeat rows; mark event seats as BOOKED
             booking = Booking(
-                id=uuid.uuid4(),
+                id=uuid7(),
                 event_id=event_id,
                 user_id=user_id,
                 total_amount=total_amount,
@@ -199,93 +202,61 @@ class BookingService:
             db.add(booking)
             await db.flush()
 
-            for s in seats:
-                db.add(BookingSeat(id=uuid.uuid4(), booking_id=booking.id, event_seat_id=s.id))
-                s.status = "BOOKED"
-                db.add(s)
+            if settings.DB_FASTPATH_ENABLED:
+                await SeatFastPath.claim_seats(db, booking.id, event_id, [s.id for s in seats], "BOOKED")
+            else:
+                for s in seats:
+                    db.add(BookingSeat(id=uuid7(), booking_id=booking.id, event_seat_id=s.id, event_id=s.event_id))
+                    s.status = "BOOKED"
+                    db.add(s)
 
+            # Buyer analytics run from the outbox after commit
+            await Outbox.add(db, BOOKING_CONFIRMED, {
+                "booking_id": str(booking.id),
+                "event_id": str(event_id),
+                "user_id": str(user_id),
+                "seat_ids": [str(seat_id) for seat_id in seat_ids],
+            })
             await db.commit()
             return {"booking_id": str(booking.id), "total_amount": str(total_amount)}
-        except Exception as e:
+        except Exception:
             await db.rollback()
-            # Release any acquired locks
-            if acquired_keys:
-                await redis.delete(*acquired_keys)
             raise
         finally:
-            # Release locks after success as well
-            if acquired_keys:
-                await redis.delete(*acquired_keys)
+            # Release the holds after success as well
+            await seat_holds.release(db, event_id, seat_ids)
 
     @staticmethod
     async def cancel_booking_and_release(db: AsyncSession, booking_id: str) -> bool:
         """Cancel a booking and mark seats AVAILABLE again."""
-        try:
-            result = await db.execute(select(Booking).where(Booking.id == booking_id))
-            booking = result.scalars().first()
-            if not booking:
-                return False
-
-            # Fetch booking seats
-            bs_result = await db.execute(select(BookingSeat).where(BookingSeat.booking_id == booking_id))
-            bs_list = bs_result.scalars().all()
-
-            # Mark event seats AVAILABLE
-            es_ids = [bs.event_seat_id for bs in bs_list]
-            if es_ids:
-                es_result = await db.execute(select(EventSeat).where(EventSeat.id.in_(es_ids)))
-                for es in es_result.scalars().all():
-                    es.status = "AVAILABLE"
-                    db.add(es)
-
-            # Delete booking and booking_seats
-            for bs in bs_list:
-                await db.delete(bs)
-            await db.delete(booking)
-
-            await db.commit()
-            return True
-        except SQLAlchemyError:
-            await db.rollback()
-            raise
+        result = await CancellationService.cancel_bookings(db, [booking_id])
+        return result["bookings_cancelled"] > 0
 
     @staticmethod
     async def debug_redis_locks():
-        """Debug function to see all lock keys in Redis"""
+        """Debug function to see the first page of lock keys in Redis"""
         try:
             # Test Redis connection
             await redis.ping()
-            print("Redis connection: OK")
-            
-            # Get all keys first
-            all_keys = await redis.keys("*")
-            print(f"Total keys in Redis: {len(all_keys)}")
-            
-            # Get all lock keys
-            lock_keys = await redis.keys("lock:*")
-            print(f"Found {len(lock_keys)} lock keys:")
-            
-            lock_details = []
-            for key in lock_keys:
-                value = await redis.get(key)
-                ttl = await redis.ttl(key)
-                print(f"Key: {key}, Value: {value}, TTL: {ttl}s")
-                lock_details.append({
-                    "key": key,
-                    "value": value,
-                    "ttl": ttl
-                })
-            
+            logger.debug("Redis connection: OK")
+
+            # SCAN one page rather than KEYS, which blocks Redis
+            page = await LockService.list_locks(count=1000)
+            lock_keys = [lock["key"] for lock in page["locks"]]
+            logger.debug("Found %d lock keys in the first page", len(lock_keys))
+
             return {
                 "redis_connection": "OK",
-                "total_keys": len(all_keys),
+                "total_keys": await redis.dbsize(),
                 "lock_keys": lock_keys,
                 "lock_count": len(lock_keys),
-                "lock_details": lock_details,
-                "all_keys": all_keys
+                "lock_details": [
+                    {"key": lock["key"], "value": lock["value"], "ttl": lock["ttl"]} for lock in page["locks"]
+                ],
+                "cursor": page["cursor"]
             }
         except Exception as e:
-            print(f"Error checking Redis locks: {e}")
+            logger.warning("Error checking Redis locks: %s", e)
             return {
                 "redis_connection": "ERROR",
                 "error": str(e),
@@ -0,0 +1,173 @@
+"""Bulk booking cancellation
+
+Cancels single bookings, lists of bookings or every open booking of an event
+with set-based statements. Bookings are processed BULK_CANCEL_CHUNK_SIZE at a
+time, one transaction per chunk. Each chunk is a single statement that marks
+the bookings CANCELLED, releases their seats and records a REFUNDED payment for
+every successful payment. The chunk's seat holds are released through the
+outbox once it commits.
+"""
+
+from decimal import Decimal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import any_, bindparam, func, insert, literal, update
+from app.models.bookings import Booking
+from app.models.booking_seats import BookingSeat
+from app.models.events import Event
+from app.models.event_seats import EventSeat
+from app.models.payments import Payment
+from app.core.config import settings
+from app.service.outbox import BOOKINGS_CANCELLED, Outbox
+from app.db.ids import uuid7
+from typing import Optional
+from app.core.tracing import traced
+
+# Bookings in these states still hold seats
+OPEN_BOOKING_STATUSES = ("PENDING", "CONFIRMED")
+
+
+def _bulk_cancel_statement():
+    """Cancel a chunk of bookings, release their seats and refund what was paid"""
+    cancelled = (
+        update(Booking)
+        .where(
+            Booking.id == any_(bindparam("booking_ids", type_=ARRAY(Booking.id.type))),
+            Booking.status.in_(OPEN_BOOKING_STATUSES),
+        )
+        .values(status="CANCELLED")
+        .returning(Booking.id, Booking.event_id, Booking.user_id)
+        .cte("cancelled")
+    )
+    released = (
+        update(EventSeat)
+        .where(
+            BookingSeat.booking_id == cancelled.c.id,
+            BookingSeat.event_id == cancelled.c.event_id,
+            EventSeat.id == BookingSeat.event_seat_id,
+            EventSeat.event_id == BookingSeat.event_id,
+        )
+        .values(status="AVAILABLE")
+        .returning(EventSeat.event_id, EventSeat.seat_id)
+        .cte("released")
+    )
+    # One pre-generated payment id per booking in the chunk
+    refund_ids = func.unnest(
+        bindparam("booking_ids", type_=ARRAY(Booking.id.type)),
+        bindparam("refund_ids", type_=ARRAY(Payment.id.type)),
+    ).table_valued("booking_id", "refund_id").alias("refund_ids")
+    refunds = (
+        insert(Payment)
+        .from_select(
+            ["id", "booking_id", "user_id", "amount", "status", "transaction_ref"],
+            select(
+                refund_ids.c.refund_id,
+                cancelled.c.id,
+                cancelled.c.user_id,
+                Payment.amount,
+                literal("REFUNDED"),
+                func.concat("REFUND_", Payment.transaction_ref),
+            )
+            .select_from(cancelled)
+            .join(refund_ids, refund_ids.c.booking_id == cancelled.c.id)
+            .join(Payment, Payment.booking_id == cancelled.c.id)
+            .where(Payment.status == "SUCCESS"),
+        )
+        .returning(Payment.amount)
+        .cte("refunds")
+    )
+    return select(
+        select(func.count()).select_from(cancelled).scalar_subquery().label("bookings"),
+        select(func.count()).select_from(refunds).scalar_subquery().label("refunds"),
+        select(func.coalesce(func.sum(refunds.c.amount), 0)).scalar_subquery().label("refunded_amount"),
+        select(
+            func.array_agg(func.concat(released.c.event_id, ":", released.c.seat_id))
+        ).scalar_subquery().label("seats"),
+    )
+
+
+BULK_CANCEL = _bulk_cancel_statement()
+
+OPEN_EVENT_BOOKINGS = (
+    select(Booking.id)
+    .where(Booking.event_id == bindparam("event_id"), Booking.status.in_(OPEN_BOOKING_STATUSES))
+    .order_by(Booking.id)
+    .limit(bindparam("limit"))
+    .with_for_update()
+)
+
+
+@traced("service")
+class CancellationService:
+    """Service class for cancelling bookings in bulk"""
+
+    @staticmethod
+    async def cancel_bookings(db: AsyncSession, booking_ids: list, chunk_size: Optional[int] = None) -> dict:
+        """Cancel the given bookings; ones already cancelled or missing are skipped"""
+        chunk_size = chunk_size or settings.BULK_CANCEL_CHUNK_SIZE
+        booking_ids = list(dict.fromkeys(str(booking_id) for booking_id in booking_ids))
+        totals = CancellationService._empty_totals()
+        try:
+            for start in range(0, len(booking_ids), chunk_size):
+                await CancellationService._cancel_chunk(db, booking_ids[start:start + chunk_size], totals)
+            return CancellationService._format_totals(totals)
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise Exception(f"Error cancelling bookings: {str(e)}")
+
+    @staticmethod
+    async def cancel_event_bookings(db: AsyncSession, event_id: str, chunk_size: Optional[int] = None) -> Optional[dict]:
+        """Deactivate an event and cancel every open booking it has; None if the event doesn't exist"""
+        chunk_size = chunk_size or settings.BULK_CANCEL_CHUNK_SIZE
+        totals = CancellationService._empty_totals()
+        try:
+            # Stop new bookings first so the loop below drains the event
+            result = await db.execute(
+                update(Event).where(Event.id == event_id).values(is_active=False).returning(Event.id)
+            )
+            if result.first() is None:
+                await db.rollback()
+                return None
+            await db.commit()
+
+            while True:
+                booking_ids = (await db.execute(
+                    OPEN_EVENT_BOOKINGS, {"event_id": event_id, "limit": chunk_size}
+                )).scalars().all()
+                if not booking_ids:
+                    await db.rollback()
+                    break
+                await CancellationService._cancel_chunk(db, booking_ids, totals)
+
+            return {"event_id": str(event_id), **CancellationService._format_totals(totals)}
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise Exception(f"Error cancelling event bookings: {str(e)}")
+
+    @staticmethod
+    async def _cancel_chunk(db: AsyncSession, booking_ids: list, totals: dict) -> None:
+        """Cancel one chunk in its own transaction; its seat holds are cleared via the outbox"""
+        row = (await db.execute(BULK_CANCEL, {
+            "booking_ids": booking_ids,
+            "refund_ids": [uuid7() for _ in booking_ids],
+        })).one()
+        seats = row.seats or []
+        if seats:
+            # Hold release runs from the outbox after commit
+            await Outbox.add(db, BOOKINGS_CANCELLED, {"booking_count": row.bookings, "seats": seats})
+        await db.commit()
+
+        totals["bookings_cancelled"] += row.bookings
+        totals["seats_released"] += len(seats)
+        totals["refunds"] += row.refunds
+        totals["refunded_amount"] += Decimal(row.refunded_amount)
+
+    @staticmethod
+    def _empty_totals() -> dict:
+        return {"bookings_cancelled": 0, "seats_released": 0, "refunds": 0, "refunded_amount": Decimal("0")}
+
+    @staticmethod
+    def _format_totals(totals: dict) -> dict:
+        return {**totals, "refunded_amount": str(totals["refunded_amount"])}
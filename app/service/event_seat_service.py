@@ -8,9 +8,14 @@ from sqlalchemy import and_
 from app.models.event_seats import EventSeat
 from app.schemas.event_seats import EventSeatCreate, EventSeatUpdate
 from app.service.seat_service import SeatService
-import uuid
+from app.service.seat_fastpath import SeatFastPath
+from app.service import queries
+from app.core.config import settings
+from app.db.ids import uuid7
+from app.core.tracing import traced
 
 
+@traced("service")
 class EventSeatService:
     """Service class for event seat database operations"""
     
@@ -19,7 +24,7 @@ class EventSeatService:
         """Create event seat in database"""
         try:
             db_event_seat = EventSeat(
-                id=uuid.uuid4(),
+                id=uuid7(),
                 event_id=event_seat.event_id,
                 seat_id=event_seat.seat_id,
                 price=event_seat.price,
@@ -37,7 +42,7 @@ class EventSeatService:
     async def get_event_seat_by_id(db: AsyncSession, event_seat_id: str):
         """Get event seat by ID from database"""
         try:
-            result = await db.execute(select(EventSeat).where(EventSeat.id == event_seat_id))
+            result = await db.execute(queries.EVENT_SEAT_BY_ID, {"event_seat_id": event_seat_id})
             return result.scalars().first()
         except SQLAlchemyError as e:
             raise Exception(f"Error fetching event seat: {str(e)}")
@@ -45,23 +50,11 @@ class EventSeatService:
     @staticmethod
     async def get_event_seats_by_event(db: AsyncSession, event_id: str):
         """Get all event seats with row/seat details (label, row_no, seat_no)"""
+        if settings.DB_FASTPATH_ENABLED:
+            return await SeatFastPath.get_event_seats_by_event(db, event_id)
         try:
-            from app.models.seats import Seat
             # Join with Seat to fetch label/row_no/seat_no
-            result = await db.execute(
-                select(
-                    EventSeat.id,
-                    EventSeat.event_id,
-                    EventSeat.seat_id,
-                    EventSeat.price,
-                    EventSeat.status,
-                    Seat.label,
-                    Seat.row_no,
-                    Seat.seat_no,
-                ).join(Seat, EventSeat.seat_id == Seat.id).where(
-                    EventSeat.event_id == event_id
-                )
-            )
+            result = await db.execute(queries.SEAT_MAP, {"event_id": event_id})
 
             rows = result.all()
             # Build serializable dicts compatible with response schema
@@ -84,24 +77,11 @@ class EventSeatService:
     @staticmethod
     async def get_available_event_seats(db: AsyncSession, event_id: str):
         """Get available event seats with row/seat details"""
+        if settings.DB_FASTPATH_ENABLED:
+            return await SeatFastPath.get_available_event_seats(db, event_id)
         try:
-            from app.models.seats import Seat
             # Join with Seat to include label/row_no/seat_no and filter AVAILABLE
-            result = await db.execute(
-                select(
-                    EventSeat.id,
-                    EventSeat.event_id,
-                    EventSeat.seat_id,
-                    EventSeat.price,
-                    EventSeat.status,
-                    Seat.label,
-                    Seat.row_no,
-                    Seat.seat_no,
-                ).join(Seat, EventSeat.seat_id == Seat.id).where(
-                    EventSeat.event_id == event_id,
-                    EventSeat.status == "AVAILABLE"
-                )
-            )
+            result = await db.execute(queries.AVAILABLE_SEAT_MAP, {"event_id": event_id})
 
             rows = result.all()
             return [
@@ -124,7 +104,7 @@ class EventSeatService:
     async def update_event_seat(db: AsyncSession, event_seat_id: str, event_seat_update: EventSeatUpdate):
         """Update event seat in database"""
         try:
-            result = await db.execute(select(EventSeat).where(EventSeat.id == event_seat_id))
+            result = await db.execute(queries.EVENT_SEAT_BY_ID, {"event_seat_id": event_seat_id})
             db_event_seat = result.scalars().first()
             if not db_event_seat:
                 return None
@@ -145,7 +125,7 @@ class EventSeatService:
     async def delete_event_seat(db: AsyncSession, event_seat_id: str):
         """Delete event seat from database"""
         try:
-            result = await db.execute(select(EventSeat).where(EventSeat.id == event_seat_id))
+            result = await db.execute(queries.EVENT_SEAT_BY_ID, {"event_seat_id": event_seat_id})
             db_event_seat = result.scalars().first()
             if not db_event_seat:
                 return None
@@ -171,7 +151,7 @@ class EventSeatService:
             event_seats = []
             for seat in venue_seats:
                 event_seat = EventSeat(
-                    id=uuid.uuid4(),
+                    id=uuid7(),
                     event_id=event_id,
                     seat_id=seat.id,
                     price=default_price,
@@ -231,16 +211,7 @@ class EventSeatService:
     async def get_event_seats_by_row(db: AsyncSession, event_id: str, row_no: str):
         """Get all event seats for a specific event and row"""
         try:
-            from app.models.seats import Seat
-            
-            result = await db.execute(
-                select(EventSeat).join(Seat, EventSeat.seat_id == Seat.id).where(
-                    and_(
-                        EventSeat.event_id == event_id,
-                        Seat.row_no == row_no
-                    )
-                )
-            )
+            result = await db.execute(queries.EVENT_SEATS_BY_ROW, {"event_id": event_id, "row_no": row_no})
             return result.scalars().all()
         except SQLAlchemyError as e:
             raise Exception(f"Error fetching event seats by row: {str(e)}")
@@ -2,17 +2,16 @@
 
 from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import func
 from app.models.events import Event
-from app.models.event_seats import EventSeat
 from app.schemas.events import EventCreate, EventUpdate, EventStatusUpdate
 from app.service.event_seat_service import EventSeatService
-from app.models.venues import Venue
-import uuid
+from app.db.ids import uuid7
+from app.service import queries
+from app.core.tracing import traced
 
 
+@traced("service")
 class EventService:
     """Service class for event database operations"""
     
@@ -31,7 +30,7 @@ class EventService:
         """Create event in database"""
         try:
             db_event = Event(
-                id=uuid.uuid4(),
+                id=uuid7(),
                 venue_id=event.venue_id,
                 title=event.title,
                 description=event.description,
@@ -58,17 +57,7 @@ class EventService:
         """Get event by ID from database with venue name"""
         try:
             # Query to get event with venue name
-            query = (
-                select(
-                    Event,
-                    Venue.name.label('venue_name')
-                )
-                .select_from(Event)
-                .join(Venue, Event.venue_id == Venue.id)
-                .where(Event.id == event_id)
-            )
-            
-            result = await db.execute(query)
+            result = await db.execute(queries.EVENT_WITH_VENUE_BY_ID, {"event_id": event_id})
             row = result.first()
             
             if not row:
@@ -86,19 +75,8 @@ class EventService:
         """Get events from database with venue names"""
         try:
             # Query to get events with venue names
-            query = (
-                select(
-                    Event,
-                    Venue.name.label('venue_name')
-                )
-                .select_from(Event)
-                .join(Venue, Event.venue_id == Venue.id)
-            )
-            
-            if active_only:
-                query = query.where(Event.is_active == True)
-            
-            result = await db.execute(query.offset(skip).limit(limit))
+            query = queries.ACTIVE_EVENTS_WITH_VENUE if active_only else queries.EVENTS_WITH_VENUE
+            result = await db.execute(query, {"skip": skip, "limit": limit})
             rows = result.all()
             
             # Format the response to include venue name
@@ -117,7 +95,7 @@ class EventService:
     async def update_event(db: AsyncSession, event_id: str, event_update: EventUpdate):
         """Update event in database"""
         try:
-            result = await db.execute(select(Event).where(Event.id == event_id))
+            result = await db.execute(queries.EVENT_BY_ID, {"event_id": event_id})
             db_event = result.scalars().first()
             if not db_event:
                 return None
@@ -138,7 +116,7 @@ class EventService:
     async def update_event_status(db: AsyncSession, event_id: str, status_update: EventStatusUpdate):
         """Update event active status in database"""
         try:
-            result = await db.execute(select(Event).where(Event.id == event_id))
+            result = await db.execute(queries.EVENT_BY_ID, {"event_id": event_id})
             db_event = result.scalars().first()
             if not db_event:
                 return None
@@ -156,7 +134,7 @@ class EventService:
     async def is_event_bookable(db: AsyncSession, event_id: str) -> bool:
         """Check if an event is bookable (active and not finished)"""
         try:
-            result = await db.execute(select(Event).where(Event.id == event_id))
+            result = await db.execute(queries.EVENT_BY_ID, {"event_id": event_id})
             event = result.scalars().first()
             if not event:
                 return False
@@ -179,42 +157,8 @@ class EventService:
     async def get_upcoming_events_with_capacity(db: AsyncSession, skip: int = 0, limit: int = 10):
         """Get upcoming events with capacity details from database"""
         try:
-            from datetime import datetime, timezone
-            from sqlalchemy import case
-            
             # Query to get upcoming events with venue names and capacity
-            query = (
-                select(
-                    Event.id,
-                    Event.title,
-                    Event.start_time,
-                    Event.end_time,
-                    Event.default_price,
-                    Venue.name.label('venue_name'),
-                    func.count(EventSeat.id).label('total_capacity'),
-                    func.sum(
-                        case(
-                            (EventSeat.status == 'AVAILABLE', 1),
-                            else_=0
-                        )
-                    ).label('available_seats')
-                )
-                .select_from(Event)
-                .join(Venue, Event.venue_id == Venue.id)
-                .join(EventSeat, Event.id == EventSeat.event_id)
-                .where(Event.is_active == True)
-                .group_by(
-                    Event.id, 
-                    Event.title, 
-                    Event.start_time, 
-                    Event.end_time, 
-                    Event.default_price, 
-                    Venue.name
-                )
-                .order_by(Event.start_time)
-            )
-            
-            result = await db.execute(query.offset(skip).limit(limit))
+            result = await db.execute(queries.UPCOMING_EVENTS_WITH_CAPACITY, {"skip": skip, "limit": limit})
             rows = result.all()
             
             # Format the response
@@ -240,7 +184,7 @@ class EventService:
     async def delete_event(db: AsyncSession, event_id: str):
         """Delete event from database"""
         try:
-            result = await db.execute(select(Event).where(Event.id == event_id))
+            result = await db.execute(queries.EVENT_BY_ID, {"event_id": event_id})
             db_event = result.scalars().first()
             if not db_event:
                 return None
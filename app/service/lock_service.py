@@ -0,0 +1,104 @@
+"""Seat hold inspection on Redis
+
+Lists and clears `lock:{event_id}:{seat_id}` keys without blocking Redis. The
+whole keyspace is walked with incremental SCAN, one page per call. A single
+event's holds come from its `lockidx:{event_id}` sorted set instead. Values and
+TTLs for a page are fetched in one pipeline, so this is safe to run during a
+live on-sale.
+"""
+
+import time
+from app.core.redis import redis
+from app.service.seat_holds import HOLD_INDEX_KEY, hold_key
+from typing import Optional
+from app.core.tracing import traced
+
+LOCK_KEY_PATTERN = "lock:*"
+
+
+@traced("service")
+class LockService:
+    """Service class for paginated seat hold inspection"""
+
+    @staticmethod
+    async def list_locks(cursor: int = 0, count: int = 100, event_id: Optional[str] = None) -> dict:
+        """One page of holds; pass the returned cursor back until it is 0"""
+        try:
+            if event_id:
+                keys, next_cursor = await LockService._event_page(event_id, cursor, count)
+            else:
+                next_cursor, keys = await redis.scan(cursor=cursor, match=LOCK_KEY_PATTERN, count=count)
+
+            pipe = redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.get(key)
+                pipe.ttl(key)
+            replies = await pipe.execute() if keys else []
+
+            locks = []
+            for key, value, ttl in zip(keys, replies[::2], replies[1::2]):
+                if value is None:
+                    continue  # released or expired since the page was read
+                _, lock_event_id, seat_id = key.split(":", 2)
+                locks.append({"key": key, "event_id": lock_event_id, "seat_id": seat_id, "value": value, "ttl": ttl})
+            return {"cursor": int(next_cursor), "locks": locks}
+        except Exception as e:
+            raise Exception(f"Error listing locks: {str(e)}")
+
+    @staticmethod
+    async def count_event_locks(event_id: str) -> int:
+        """Live holds of an event, from its index"""
+        try:
+            return await redis.zcount(HOLD_INDEX_KEY.format(event_id=event_id), time.time(), "+inf")
+        except Exception as e:
+            raise Exception(f"Error counting locks: {str(e)}")
+
+    @staticmethod
+    async def clear_locks(event_id: Optional[str] = None, batch_size: int = 500) -> int:
+        """Delete every hold, or every hold of one event, a page at a time"""
+        try:
+            cleared = 0
+            cursor = 0
+            while True:
+                if event_id:
+                    # Always read the first page; it shrinks as holds are deleted
+                    keys, more = await LockService._event_page(event_id, 0, batch_size)
+                    if keys:
+                        pipe = redis.pipeline(transaction=False)
+                        pipe.unlink(*keys)
+                        pipe.zrem(HOLD_INDEX_KEY.format(event_id=event_id), *(key.rsplit(":", 1)[1] for key in keys))
+                        deleted, _ = await pipe.execute()
+                        cleared += deleted
+                    if not more:
+                        return cleared
+                else:
+                    cursor, keys = await redis.scan(cursor=cursor, match=LOCK_KEY_PATTERN, count=batch_size)
+                    if keys:
+                        # Drop the cleared seats from their events' indexes too, or
+                        # count_event_locks keeps reporting them until they expire
+                        seats_by_event: dict[str, list[str]] = {}
+                        for key in keys:
+                            _, key_event_id, seat_id = key.split(":", 2)
+                            seats_by_event.setdefault(key_event_id, []).append(seat_id)
+                        pipe = redis.pipeline(transaction=False)
+                        pipe.unlink(*keys)
+                        for key_event_id, seat_ids in seats_by_event.items():
+                            pipe.zrem(HOLD_INDEX_KEY.format(event_id=key_event_id), *seat_ids)
+                        deleted, *_ = await pipe.execute()
+                        cleared += deleted
+                    if cursor == 0:
+                        return cleared
+        except Exception as e:
+            raise Exception(f"Error clearing locks: {str(e)}")
+
+    @staticmethod
+    async def _event_page(event_id: str, offset: int, count: int) -> tuple[list[str], int]:
+        """Lock keys of one page of an event's unexpired holds, plus the next offset (0 at the end)"""
+        index_key = HOLD_INDEX_KEY.format(event_id=event_id)
+        now = time.time()
+        pipe = redis.pipeline(transaction=False)
+        pipe.zremrangebyscore(index_key, "-inf", now)  # drop expired entries as we go
+        pipe.zrangebyscore(index_key, now, "+inf", start=offset, num=count)
+        _, seat_ids = await pipe.execute()
+        next_offset = offset + len(seat_ids) if len(seat_ids) == count else 0
+        return [hold_key(event_id, seat_id) for seat_id in seat_ids], next_offset
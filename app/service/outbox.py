@@ -0,0 +1,192 @@
+"""Transactional outbox for booking and payment side effects
+
+Services call Outbox.add() inside the transaction that changes a booking, so
+the side effect is recorded if and only if the change commits. The relay
+(run_relay, in the API process or app/workers/outbox_relay.py) claims
+unpublished entries in batches with FOR UPDATE SKIP LOCKED and runs the local
+handlers for their topic: seat hold release and buyer analytics. It then
+appends the entries to the `outbox:{topic}` Redis stream for other consumers
+and marks them published. An entry whose handlers fail stays unpublished and is
+retried, so every side effect runs at least once. After OUTBOX_MAX_ATTEMPTS
+failures an entry is left for an operator.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import delete, func, insert, update
+from app.models.outbox_events import OutboxEvent
+from app.core.config import settings
+from app.core.redis import redis
+from app.db.ids import uuid7
+from app.db.session import async_session_maker
+from app.service.analytics_service import AnalyticsService
+from app.service.seat_holds import seat_holds
+from app.core.tracing import CONSUMER, current_traceparent, start_trace, traced
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_STREAM_KEY = "outbox:{topic}"
+
+BOOKING_CONFIRMED = "booking.confirmed"
+BOOKING_CANCELLED = "booking.cancelled"
+BOOKINGS_CANCELLED = "bookings.cancelled"
+
+# Published entries are purged at most this often
+PURGE_INTERVAL_SECONDS = 60
+
+
+# Handlers get their own session: the Postgres hold backend commits, which must
+# not release the relay's row locks mid-batch
+
+async def _release_holds(payload: dict) -> None:
+    async with async_session_maker() as db:
+        await seat_holds.release(db, payload["event_id"], payload["seat_ids"])
+
+
+async def _release_bulk_holds(payload: dict) -> None:
+    seats_by_event: dict[str, list[str]] = {}
+    for seat in payload["seats"]:
+        event_id, seat_id = seat.split(":")
+        seats_by_event.setdefault(event_id, []).append(seat_id)
+    async with async_session_maker() as db:
+        for event_id, seat_ids in seats_by_event.items():
+            await seat_holds.release(db, event_id, seat_ids)
+
+
+async def _record_buyer(payload: dict) -> None:
+    await AnalyticsService.record_event_buyer(payload["event_id"], payload["user_id"])
+
+
+# Local consumers run by the relay, per topic
+HANDLERS = {
+    BOOKING_CONFIRMED: [_release_holds, _record_buyer],
+    BOOKING_CANCELLED: [_release_holds],
+    BOOKINGS_CANCELLED: [_release_bulk_holds],
+}
+
+UNPUBLISHED_EVENTS = (
+    select(OutboxEvent)
+    .where(OutboxEvent.published_at.is_(None), OutboxEvent.attempts < settings.OUTBOX_MAX_ATTEMPTS)
+    .order_by(OutboxEvent.id)
+    .limit(settings.OUTBOX_BATCH_SIZE)
+    .with_for_update(skip_locked=True)
+)
+
+
+@traced("service")
+class Outbox:
+    """Service class for writing and relaying outbox entries"""
+
+    @staticmethod
+    async def add(db: AsyncSession, topic: str, payload: dict) -> None:
+        """Record a side effect in the caller's transaction; the caller commits"""
+        traceparent = current_traceparent()
+        if traceparent:
+            # The relay continues the request's trace
+            payload = {**payload, "traceparent": traceparent}
+        await db.execute(insert(OutboxEvent).values(id=uuid7(), topic=topic, payload=payload, attempts=0))
+
+    @staticmethod
+    async def relay_batch(db: AsyncSession) -> int:
+        """Publish one batch of entries; returns how many were claimed"""
+        try:
+            events = (await db.execute(UNPUBLISHED_EVENTS)).scalars().all()
+            if not events:
+                await db.rollback()
+                return 0
+
+            published, failed = [], []
+            for event in events:
+                try:
+                    with start_trace(f"outbox {event.topic}", event.payload.get("traceparent"), CONSUMER,
+                                     sample_new=False, **{"outbox.id": str(event.id)}):
+                        for handler in HANDLERS.get(event.topic, []):
+                            await handler(event.payload)
+                    published.append(event)
+                except Exception as e:
+                    failed.append((event, e))
+
+            if published:
+                pipe = redis.pipeline(transaction=False)
+                for event in published:
+                    pipe.xadd(
+                        OUTBOX_STREAM_KEY.format(topic=event.topic),
+                        {"id": str(event.id), "topic": event.topic, "payload": json.dumps(event.payload)},
+                        maxlen=settings.OUTBOX_STREAM_MAXLEN,
+                        approximate=True,
+                    )
+                try:
+                    await pipe.execute()
+                except Exception as e:
+                    failed.extend((event, e) for event in published)
+                    published = []
+
+            if published:
+                await db.execute(
+                    update(OutboxEvent)
+                    .where(OutboxEvent.id.in_([event.id for event in published]))
+                    .values(published_at=func.now())
+                )
+            for event, error in failed:
+                logger.warning("Error publishing outbox event %s (%s): %s", event.id, event.topic, error)
+                event.attempts += 1
+                event.last_error = str(error)
+            await db.commit()
+            return len(events)
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise Exception(f"Error relaying outbox events: {str(e)}")
+
+    @staticmethod
+    async def purge_published(db: AsyncSession) -> int:
+        """Delete entries published more than OUTBOX_RETENTION_HOURS ago"""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+        result = await db.execute(delete(OutboxEvent).where(OutboxEvent.published_at < cutoff))
+        await db.commit()
+        return result.rowcount
+
+    @staticmethod
+    async def stats(db: AsyncSession) -> dict:
+        """Unpublished and dead (out of attempts) entry counts, and the oldest unpublished age"""
+        try:
+            row = (await db.execute(
+                select(
+                    func.count().filter(OutboxEvent.attempts < settings.OUTBOX_MAX_ATTEMPTS),
+                    func.count().filter(OutboxEvent.attempts >= settings.OUTBOX_MAX_ATTEMPTS),
+                    func.min(OutboxEvent.created_at),
+                ).where(OutboxEvent.published_at.is_(None))
+            )).one()
+            pending, dead, oldest = row
+            return {
+                "pending": pending,
+                "dead": dead,
+                "oldest_pending_seconds": (datetime.now(timezone.utc) - oldest).total_seconds() if oldest else 0,
+            }
+        except SQLAlchemyError as e:
+            raise Exception(f"Error fetching outbox stats: {str(e)}")
+
+
+async def run_relay(stop: asyncio.Event) -> None:
+    """Relay entries until stop is set, sleeping between batches only when idle"""
+    purged_at = 0.0
+    while not stop.is_set():
+        claimed = 0
+        try:
+            async with async_session_maker() as db:
+                claimed = await Outbox.relay_batch(db)
+                if time.monotonic() - purged_at >= PURGE_INTERVAL_SECONDS:
+                    purged_at = time.monotonic()
+                    await Outbox.purge_published(db)
+        except Exception:
+            logger.exception("Outbox relay error")
+        if claimed < settings.OUTBOX_BATCH_SIZE:
+            try:
+                await asyncio.wait_for(stop.wait(), settings.OUTBOX_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
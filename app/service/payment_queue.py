@@ -0,0 +1,146 @@
+"""Redis-backed queue of payment attempts
+
+In async payment mode the API pushes each attempt onto PAYMENT_QUEUE_KEY and
+returns straight away. Payment workers (app/workers/payment_worker.py) move an
+attempt onto PAYMENT_PROCESSING_KEY while they work on it. When the outcome is
+applied they remove it again. The outcome is stored under
+`payment:result:{booking_id}` for polling and published on a channel of the
+same name for subscribers.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from app.core.config import settings
+from app.core.redis import redis
+from typing import Optional
+from app.core.tracing import current_traceparent, traced
+
+PAYMENT_QUEUE_KEY = "payments:queue"
+PAYMENT_PROCESSING_KEY = "payments:processing"
+PAYMENT_RESULT_KEY = "payment:result:{booking_id}"
+
+# Queues an attempt unless one is already QUEUED or PROCESSING for the booking,
+# in which case that attempt's state is returned and nothing is written
+_ENQUEUE_SCRIPT = redis.register_script("""
+local current = redis.call('GET', KEYS[1])
+if current then
+    local status = cjson.decode(current)['status']
+    if status == 'QUEUED' or status == 'PROCESSING' then
+        return current
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('LPUSH', KEYS[2], ARGV[3])
+return false
+""")
+
+
+@traced("service")
+class PaymentQueue:
+    """Service class for queueing payment attempts and reporting their outcome"""
+
+    @staticmethod
+    async def enqueue(booking_id: str, payment_data: Optional[dict] = None) -> tuple[dict, bool]:
+        """Queue a payment attempt and mark it QUEUED; returns (state, queued)
+
+        While an earlier attempt for the booking is QUEUED or PROCESSING nothing
+        is queued and that attempt's state is returned instead.
+        """
+        attempt = {
+            "booking_id": booking_id,
+            "payment_data": payment_data or {},
+            "enqueued_at": datetime.now(timezone.utc).isoformat(),
+            # The payment worker continues the request's trace
+            "traceparent": current_traceparent(),
+        }
+        try:
+            state = {"booking_id": booking_id, "status": "QUEUED", "enqueued_at": attempt["enqueued_at"]}
+            in_flight = await _ENQUEUE_SCRIPT(
+                keys=[PAYMENT_RESULT_KEY.format(booking_id=booking_id), PAYMENT_QUEUE_KEY],
+                args=[json.dumps(state), settings.PAYMENT_RESULT_TTL_SECONDS, json.dumps(attempt)],
+            )
+            if in_flight:
+                return json.loads(in_flight), False
+            return state, True
+        except Exception as e:
+            raise Exception(f"Error queueing payment: {str(e)}")
+
+    @staticmethod
+    async def claim(timeout: float) -> Optional[tuple[str, dict]]:
+        """Wait up to timeout seconds for an attempt; returns (raw entry, attempt)"""
+        raw = await redis.blmove(PAYMENT_QUEUE_KEY, PAYMENT_PROCESSING_KEY, timeout, "RIGHT", "LEFT")
+        if raw is None:
+            return None
+        return raw, json.loads(raw)
+
+    @staticmethod
+    async def mark_processing(booking_id: str) -> None:
+        """Mark a claimed attempt as being worked on"""
+        key = PAYMENT_RESULT_KEY.format(booking_id=booking_id)
+        state = {"booking_id": booking_id, "status": "PROCESSING"}
+        await redis.set(key, json.dumps(state), ex=settings.PAYMENT_RESULT_TTL_SECONDS)
+
+    @staticmethod
+    async def complete(raw: str, booking_id: str, result: dict) -> None:
+        """Store and publish an attempt's outcome, then drop it from the processing list"""
+        key = PAYMENT_RESULT_KEY.format(booking_id=booking_id)
+        payload = json.dumps({**result, "completed_at": datetime.now(timezone.utc).isoformat()})
+        pipe = redis.pipeline(transaction=True)
+        pipe.set(key, payload, ex=settings.PAYMENT_RESULT_TTL_SECONDS)
+        pipe.publish(key, payload)
+        pipe.lrem(PAYMENT_PROCESSING_KEY, 1, raw)
+        await pipe.execute()
+
+    @staticmethod
+    async def requeue_stalled() -> int:
+        """Move attempts left in the processing list back onto the queue
+
+        Run when no worker is processing, e.g. at start-up of a single worker
+        deployment. Settling is idempotent, so a repeated attempt cannot
+        confirm a booking twice.
+        """
+        moved = 0
+        while await redis.lmove(PAYMENT_PROCESSING_KEY, PAYMENT_QUEUE_KEY, "RIGHT", "RIGHT"):
+            moved += 1
+        return moved
+
+    @staticmethod
+    async def get_result(booking_id: str) -> Optional[dict]:
+        """Latest state of a queued payment attempt, if any"""
+        try:
+            raw = await redis.get(PAYMENT_RESULT_KEY.format(booking_id=booking_id))
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            raise Exception(f"Error fetching payment result: {str(e)}")
+
+    @staticmethod
+    async def wait_for_result(booking_id: str, timeout: float) -> Optional[dict]:
+        """Block up to timeout seconds until the attempt has an outcome"""
+        key = PAYMENT_RESULT_KEY.format(booking_id=booking_id)
+        pubsub = redis.pubsub()
+        try:
+            # Subscribe before reading the stored state so no outcome is missed
+            await pubsub.subscribe(key)
+            state = await PaymentQueue.get_result(booking_id)
+            if state is None or state["status"] not in ("QUEUED", "PROCESSING"):
+                return state
+            deadline = asyncio.get_running_loop().time() + timeout
+            while (remaining := deadline - asyncio.get_running_loop().time()) > 0:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+                if message is not None:
+                    return json.loads(message["data"])
+            return state
+        except Exception as e:
+            raise Exception(f"Error waiting for payment result: {str(e)}")
+        finally:
+            await pubsub.aclose()
+
+    @staticmethod
+    async def depth() -> dict:
+        """Attempts waiting and in flight"""
+        pipe = redis.pipeline(transaction=False)
+        pipe.llen(PAYMENT_QUEUE_KEY)
+        pipe.llen(PAYMENT_PROCESSING_KEY)
+        queued, processing = await pipe.execute()
+        return {"queued": queued, "processing": processing}
@@ -0,0 +1,101 @@
+"""Aggregated request profiles on Redis
+
+Each profiled request adds its sampled stacks to the `profile:stacks:{route}`
+hash (collapsed stack -> samples) and bumps the route's request count in
+`profile:routes`, in one pipeline, so every API worker contributes to the same
+profile. Profiles expire PROFILE_RETENTION_SECONDS after the last profiled
+request. Downloads are collapsed stacks, one "frame;frame;frame count" line per
+stack, ready for flamegraph.pl or speedscope.
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional
+import jwt
+from app.core.config import settings
+from app.core.redis import redis
+from app.middleware.authenticated import SECRET_KEY
+
+PROFILE_STACKS_KEY = "profile:stacks:{route}"
+PROFILE_ROUTES_KEY = "profile:routes"
+
+
+class ProfileService:
+    """Service class for storing and exporting request profiles"""
+
+    @staticmethod
+    async def record(route: str, stacks: Counter) -> None:
+        """Add one request's samples to its route's profile"""
+        try:
+            key = PROFILE_STACKS_KEY.format(route=route)
+            pipe = redis.pipeline(transaction=False)
+            for stack, samples in stacks.items():
+                pipe.hincrby(key, stack, samples)
+            pipe.hincrby(PROFILE_ROUTES_KEY, route, 1)
+            pipe.expire(key, settings.PROFILE_RETENTION_SECONDS)
+            pipe.expire(PROFILE_ROUTES_KEY, settings.PROFILE_RETENTION_SECONDS)
+            await pipe.execute()
+        except Exception as e:
+            raise Exception(f"Error recording profile: {str(e)}")
+
+    @staticmethod
+    async def list_routes() -> list[dict]:
+        """Profiled routes with their request and sample counts"""
+        try:
+            requests = await redis.hgetall(PROFILE_ROUTES_KEY)
+            routes = sorted(requests)
+            pipe = redis.pipeline(transaction=False)
+            for route in routes:
+                pipe.hvals(PROFILE_STACKS_KEY.format(route=route))
+            samples = await pipe.execute() if routes else []
+            return [
+                {"route": route, "requests": int(requests[route]), "samples": sum(map(int, counts))}
+                for route, counts in zip(routes, samples)
+            ]
+        except Exception as e:
+            raise Exception(f"Error listing profiles: {str(e)}")
+
+    @staticmethod
+    async def collapsed(route: Optional[str] = None) -> str:
+        """Collapsed stacks of one route, or of every route under a root frame per route"""
+        try:
+            routes = [route] if route else sorted(await redis.hkeys(PROFILE_ROUTES_KEY))
+            pipe = redis.pipeline(transaction=False)
+            for name in routes:
+                pipe.hgetall(PROFILE_STACKS_KEY.format(route=name))
+            replies = await pipe.execute() if routes else []
+            lines = []
+            for name, stacks in zip(routes, replies):
+                prefix = "" if route else f"{name};"
+                lines.extend(f"{prefix}{stack} {samples}" for stack, samples in sorted(stacks.items()))
+            return "\n".join(lines) + "\n" if lines else ""
+        except Exception as e:
+            raise Exception(f"Error exporting profiles: {str(e)}")
+
+    @staticmethod
+    async def reset() -> int:
+        """Delete every stored profile; returns the number of routes cleared"""
+        try:
+            routes = await redis.hkeys(PROFILE_ROUTES_KEY)
+            await redis.delete(PROFILE_ROUTES_KEY, *(PROFILE_STACKS_KEY.format(route=route) for route in routes))
+            return len(routes)
+        except Exception as e:
+            raise Exception(f"Error clearing profiles: {str(e)}")
+
+    @staticmethod
+    def issue_token(ttl_seconds: Optional[int] = None) -> dict:
+        """A signed X-Profile header value that profiles every request carrying it"""
+        ttl_seconds = ttl_seconds or settings.PROFILE_TOKEN_TTL_SECONDS
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+        token = jwt.encode({"profile": True, "exp": expires_at}, SECRET_KEY, algorithm="HS256")
+        return {"header": "X-Profile", "token": token, "expires_at": expires_at.isoformat() + "Z"}
+
+    @staticmethod
+    def verify_token(token: str) -> bool:
+        """Whether an X-Profile header value is a valid, unexpired profiling token"""
+        try:
+            return jwt.decode(token, SECRET_KEY, algorithms=["HS256"]).get("profile") is True
+        except jwt.InvalidTokenError:
+            return False
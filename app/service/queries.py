@@ -0,0 +1,285 @@
+"""Prebuilt statements for the hot service-layer queries
+
+Each statement is built once at import time with bindparam() placeholders, and
+services execute it with a dict of values. That skips select() construction on
+every request, and because the statement object never changes its cache key is
+computed once and always hits SQLAlchemy's compiled statement cache.
+GET /internal/db/statement-cache shows the hit rate.
+"""
+
+from sqlalchemy import and_, any_, bindparam, case, func, insert, literal, true, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.future import select
+from app.models.bookings import Booking
+from app.models.booking_seats import BookingSeat
+from app.models.events import Event
+from app.models.event_seats import EventSeat
+from app.models.payments import Payment
+from app.models.seats import Seat
+from app.models.venues import Venue
+
+# Events
+
+EVENT_BY_ID = select(Event).where(Event.id == bindparam("event_id"))
+
+_EVENTS_WITH_VENUE = (
+    select(
+        Event,
+        Venue.name.label('venue_name')
+    )
+    .select_from(Event)
+    .join(Venue, Event.venue_id == Venue.id)
+)
+
+EVENT_WITH_VENUE_BY_ID = _EVENTS_WITH_VENUE.where(Event.id == bindparam("event_id"))
+
+EVENTS_WITH_VENUE = _EVENTS_WITH_VENUE.offset(bindparam("skip")).limit(bindparam("limit"))
+
+ACTIVE_EVENTS_WITH_VENUE = (
+    _EVENTS_WITH_VENUE
+    .where(Event.is_active == True)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+
+UPCOMING_EVENTS_WITH_CAPACITY = (
+    select(
+        Event.id,
+        Event.title,
+        Event.start_time,
+        Event.end_time,
+        Event.default_price,
+        Venue.name.label('venue_name'),
+        func.count(EventSeat.id).label('total_capacity'),
+        func.sum(
+            case(
+                (EventSeat.status == 'AVAILABLE', 1),
+                else_=0
+            )
+        ).label('available_seats')
+    )
+    .select_from(Event)
+    .join(Venue, Event.venue_id == Venue.id)
+    .join(EventSeat, Event.id == EventSeat.event_id)
+    .where(Event.is_active == True)
+    .group_by(
+        Event.id,
+        Event.title,
+        Event.start_time,
+        Event.end_time,
+        Event.default_price,
+        Venue.name
+    )
+    .order_by(Event.start_time)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+
+# Event seats
+
+EVENT_SEAT_BY_ID = select(EventSeat).where(EventSeat.id == bindparam("event_seat_id"))
+
+SEAT_MAP = (
+    select(
+        EventSeat.id,
+        EventSeat.event_id,
+        EventSeat.seat_id,
+        EventSeat.price,
+        EventSeat.status,
+        Seat.label,
+        Seat.row_no,
+        Seat.seat_no,
+    )
+    .join(Seat, EventSeat.seat_id == Seat.id)
+    .where(EventSeat.event_id == bindparam("event_id"))
+)
+
+AVAILABLE_SEAT_MAP = SEAT_MAP.where(EventSeat.status == "AVAILABLE")
+
+EVENT_SEATS_BY_ROW = (
+    select(EventSeat)
+    .join(Seat, EventSeat.seat_id == Seat.id)
+    .where(EventSeat.event_id == bindparam("event_id"), Seat.row_no == bindparam("row_no"))
+)
+
+# The seats a booking request asks for, by venue seat id
+EVENT_SEATS_FOR_BOOKING = select(EventSeat).where(
+    EventSeat.event_id == bindparam("event_id"),
+    EventSeat.seat_id.in_(bindparam("seat_ids", expanding=True)),
+)
+
+EVENT_SEATS_BY_IDS = select(EventSeat).where(
+    EventSeat.id.in_(bindparam("event_seat_ids", expanding=True)),
+    EventSeat.event_id == bindparam("event_id"),
+)
+
+# Bookings
+
+BOOKING_BY_ID = select(Booking).where(Booking.id == bindparam("booking_id"))
+
+BOOKINGS_BY_EVENT = select(Booking).where(Booking.event_id == bindparam("event_id"))
+
+EXPIRED_PENDING_BOOKINGS = select(Booking.id).where(
+    Booking.status == "PENDING",
+    Booking.created_at < bindparam("cutoff"),
+)
+
+USER_BOOKINGS = (
+    select(
+        Booking,
+        Event.title.label('event_name'),
+        Venue.name.label('venue_name'),
+        Event.start_time,
+        Event.end_time
+    )
+    .join(Event, Booking.event_id == Event.id)
+    .join(Venue, Event.venue_id == Venue.id)
+    .where(Booking.user_id == bindparam("user_id"))
+)
+
+# Seat labels of many bookings in one round trip; event_ids lets Postgres
+# prune booking_seats partitions
+BOOKINGS_SEAT_LABELS = (
+    select(BookingSeat.booking_id, func.array_agg(Seat.label).label("labels"))
+    .join(EventSeat, and_(EventSeat.id == BookingSeat.event_seat_id, EventSeat.event_id == BookingSeat.event_id))
+    .join(Seat, Seat.id == EventSeat.seat_id)
+    .where(
+        BookingSeat.booking_id.in_(bindparam("booking_ids", expanding=True)),
+        BookingSeat.event_id.in_(bindparam("event_ids", expanding=True)),
+    )
+    .group_by(BookingSeat.booking_id)
+)
+
+BOOKING_SEATS_BY_BOOKING = select(BookingSeat).where(
+    BookingSeat.booking_id == bindparam("booking_id"),
+    BookingSeat.event_id == bindparam("event_id"),
+)
+
+# Payments
+
+BOOKING_WITH_PAYMENT = (
+    select(Booking, Payment)
+    .outerjoin(Payment, Booking.id == Payment.booking_id)
+    .where(Booking.id == bindparam("booking_id"))
+)
+
+
+def _settle_booking(booking_status: str, seat_status: str, payment_status: str):
+    """One statement that closes a PENDING booking
+
+    Flips the booking and all of its event seats and records the payment, then
+    returns one row per seat with the seat_id needed to release its hold. No
+    rows means the booking was missing or no longer PENDING.
+    """
+    booking = (
+        update(Booking)
+        .where(Booking.id == bindparam("booking_id"), Booking.status == "PENDING")
+        .values(status=booking_status)
+        .returning(Booking.id, Booking.event_id, Booking.user_id, Booking.total_amount)
+        .cte("settled_booking")
+    )
+    seats = (
+        update(EventSeat)
+        .where(
+            BookingSeat.booking_id == booking.c.id,
+            BookingSeat.event_id == booking.c.event_id,
+            EventSeat.id == BookingSeat.event_seat_id,
+            EventSeat.event_id == BookingSeat.event_id,
+        )
+        .values(status=seat_status)
+        .returning(EventSeat.seat_id)
+        .cte("settled_seats")
+    )
+    payment = (
+        insert(Payment)
+        .from_select(
+            ["id", "booking_id", "user_id", "amount", "status", "transaction_ref"],
+            select(
+                bindparam("payment_id", type_=Payment.id.type),
+                booking.c.id,
+                booking.c.user_id,
+                booking.c.total_amount,
+                literal(payment_status),
+                bindparam("transaction_ref", type_=Payment.transaction_ref.type),
+            ),
+        )
+        .returning(Payment.id, Payment.transaction_ref)
+        .cte("settled_payment")
+    )
+    return (
+        select(
+            booking.c.id.label("booking_id"),
+            booking.c.event_id,
+            booking.c.user_id,
+            payment.c.id.label("payment_id"),
+            payment.c.transaction_ref,
+            seats.c.seat_id,
+        )
+        .select_from(booking.join(payment, true()).outerjoin(seats, true()))
+    )
+
+
+CONFIRM_BOOKING = _settle_booking("CONFIRMED", "BOOKED", "SUCCESS")
+
+FAIL_BOOKING = _settle_booking("CANCELLED", "AVAILABLE", "FAILED")
+
+
+def _fail_bookings():
+    """FAIL_BOOKING for a list of bookings, in one statement
+
+    Bookings that already left PENDING are skipped. Returns the number of
+    bookings failed and their released seats as "event_id:seat_id" strings.
+    """
+    failed = (
+        update(Booking)
+        .where(
+            Booking.id == any_(bindparam("booking_ids", type_=ARRAY(Booking.id.type))),
+            Booking.status == "PENDING",
+        )
+        .values(status="CANCELLED")
+        .returning(Booking.id, Booking.event_id, Booking.user_id, Booking.total_amount)
+        .cte("failed_bookings")
+    )
+    released = (
+        update(EventSeat)
+        .where(
+            BookingSeat.booking_id == failed.c.id,
+            BookingSeat.event_id == failed.c.event_id,
+            EventSeat.id == BookingSeat.event_seat_id,
+            EventSeat.event_id == BookingSeat.event_id,
+        )
+        .values(status="AVAILABLE")
+        .returning(EventSeat.event_id, EventSeat.seat_id)
+        .cte("released_seats")
+    )
+    # One pre-generated payment id per booking in the list
+    payment_ids = func.unnest(
+        bindparam("booking_ids", type_=ARRAY(Booking.id.type)),
+        bindparam("payment_ids", type_=ARRAY(Payment.id.type)),
+    ).table_valued("booking_id", "payment_id").alias("payment_ids")
+    payments = (
+        insert(Payment)
+        .from_select(
+            ["id", "booking_id", "user_id", "amount", "status", "transaction_ref"],
+            select(
+                payment_ids.c.payment_id,
+                failed.c.id,
+                failed.c.user_id,
+                failed.c.total_amount,
+                literal("FAILED"),
+                bindparam("transaction_ref", type_=Payment.transaction_ref.type),
+            ).join(payment_ids, payment_ids.c.booking_id == failed.c.id),
+        )
+        .returning(Payment.id)
+        .cte("failed_payments")
+    )
+    return select(
+        select(func.count()).select_from(failed).scalar_subquery().label("bookings"),
+        select(func.count()).select_from(payments).scalar_subquery().label("payments"),
+        select(
+            func.array_agg(func.concat(released.c.event_id, ":", released.c.seat_id))
+        ).scalar_subquery().label("seats"),
+    )
+
+
+FAIL_BOOKINGS = _fail_bookings()
@@ -0,0 +1,124 @@
+"""Direct asyncpg access for the hottest seat queries
+
+Seat maps for large venues return tens of thousands of rows. Going through
+SQLAlchemy costs statement compilation, a Row object per row and a dict per row
+on every request. The queries here run as plain SQL on the session's pooled
+asyncpg connection, inside the session's transaction. asyncpg prepares each
+statement once per connection and caches it, and responses are built straight
+from the returned records.
+"""
+
+from typing import NamedTuple
+import uuid
+import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.ids import uuid7
+from app.db.query_stats import timed_query
+from app.db.slow_queries import watch_statement
+from app.core.tracing import traced
+
+SEAT_MAP_SQL = """
+SELECT es.id, es.event_id, es.seat_id, es.price, es.status, s.label, s.row_no, s.seat_no
+FROM event_seats es
+JOIN seats s ON s.id = es.seat_id
+WHERE es.event_id = $1
+"""
+
+AVAILABLE_SEATS_SQL = """
+SELECT es.id, es.event_id, es.seat_id, es.price, es.status, s.label, s.row_no, s.seat_no
+FROM event_seats es
+JOIN seats s ON s.id = es.seat_id
+WHERE es.event_id = $1 AND es.status = 'AVAILABLE'
+"""
+
+BOOKING_SEATS_SQL = """
+SELECT id, event_id, seat_id, price, status
+FROM event_seats
+WHERE event_id = $1 AND seat_id = ANY($2::uuid[])
+"""
+
+# Flips only seats that are still AVAILABLE, so a concurrent claim cannot win twice
+CLAIM_SEATS_SQL = """
+UPDATE event_seats
+SET status = $3
+WHERE event_id = $1 AND id = ANY($2::uuid[]) AND status = 'AVAILABLE'
+RETURNING id
+"""
+
+INSERT_BOOKING_SEATS_SQL = """
+INSERT INTO booking_seats (id, booking_id, event_seat_id, event_id)
+SELECT unnest($1::uuid[]), $2::uuid, unnest($3::uuid[]), $4::uuid
+"""
+
+
+class ClaimableSeat(NamedTuple):
+    id: uuid.UUID
+    event_id: uuid.UUID
+    seat_id: uuid.UUID
+    price: object
+    status: str
+
+
+@traced("service")
+class SeatFastPath:
+    """Hand-written SQL on the raw asyncpg connection for seat maps and seat claims"""
+
+    @staticmethod
+    async def _driver_connection(db: AsyncSession) -> asyncpg.Connection:
+        """The asyncpg connection behind the session, in the session's transaction"""
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        return raw.driver_connection
+
+    @staticmethod
+    async def _fetch(conn: asyncpg.Connection, sql: str, *args) -> list:
+        # Counted here because these statements bypass SQLAlchemy's events
+        with timed_query(sql), watch_statement(sql, args):
+            return await conn.fetch(sql, *args)
+
+    @staticmethod
+    async def get_event_seats_by_event(db: AsyncSession, event_id: str) -> list[dict]:
+        """Seat map rows with label/row_no/seat_no"""
+        try:
+            conn = await SeatFastPath._driver_connection(db)
+            return [dict(record) for record in await SeatFastPath._fetch(conn, SEAT_MAP_SQL, event_id)]
+        except (asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+            raise Exception(f"Error fetching event seats: {str(e)}")
+
+    @staticmethod
+    async def get_available_event_seats(db: AsyncSession, event_id: str) -> list[dict]:
+        """AVAILABLE seat map rows with label/row_no/seat_no"""
+        try:
+            conn = await SeatFastPath._driver_connection(db)
+            return [dict(record) for record in await SeatFastPath._fetch(conn, AVAILABLE_SEATS_SQL, event_id)]
+        except (asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+            raise Exception(f"Error fetching available event seats: {str(e)}")
+
+    @staticmethod
+    async def get_seats_for_booking(db: AsyncSession, event_id: str, seat_ids: list[str]) -> list[ClaimableSeat]:
+        """Event seats a booking asks for, for the availability and price check"""
+        try:
+            conn = await SeatFastPath._driver_connection(db)
+            records = await SeatFastPath._fetch(conn, BOOKING_SEATS_SQL, event_id, seat_ids)
+            return [ClaimableSeat(*record) for record in records]
+        except (asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+            raise Exception(f"Error fetching event seats: {str(e)}")
+
+    @staticmethod
+    async def claim_seats(db: AsyncSession, booking_id, event_id, event_seat_ids: list, status: str) -> None:
+        """Move the seats from AVAILABLE to status and attach them to the booking"""
+        try:
+            conn = await SeatFastPath._driver_connection(db)
+            claimed = await SeatFastPath._fetch(conn, CLAIM_SEATS_SQL, event_id, event_seat_ids, status)
+            if len(claimed) != len(event_seat_ids):
+                raise Exception("One or more selected seats are not available")
+            with timed_query(INSERT_BOOKING_SEATS_SQL), watch_statement(INSERT_BOOKING_SEATS_SQL):
+                await conn.execute(
+                    INSERT_BOOKING_SEATS_SQL,
+                    [uuid7() for _ in event_seat_ids],
+                    booking_id,
+                    event_seat_ids,
+                    event_id,
+                )
+        except (asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+            raise Exception(f"Error claiming seats: {str(e)}")
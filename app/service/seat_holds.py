@@ -0,0 +1,209 @@
+"""Seat hold backends
+
+A seat hold keeps other buyers off a seat while a booking is being made and
+paid for. Holds are taken all-or-nothing per booking and expire after a TTL.
+
+- RedisSeatHolds: `lock:{event_id}:{seat_id}` keys set with NX and EX
+- PostgresSeatHolds: rows in `seat_holds`, taken with INSERT ... ON CONFLICT
+  that only overwrites expired holds
+- FailoverSeatHolds: Redis, switching to Postgres while Redis is failing
+
+SEAT_HOLD_BACKEND picks one of "redis", "postgres" or "failover".
+"""
+
+import logging
+import time
+from datetime import timedelta
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy import any_, delete, func, literal
+from app.models.seat_holds import SeatHold
+from app.core.config import settings
+from app.core.redis import redis
+from app.core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+# Sorted set of an event's held seat ids, scored by hold expiry (unix time), so
+# one event's holds can be listed without scanning the keyspace
+HOLD_INDEX_KEY = "lockidx:{event_id}"
+
+
+def hold_key(event_id, seat_id) -> str:
+    """Redis key of a seat hold; also used to report holds to clients"""
+    return f"lock:{event_id}:{seat_id}"
+
+
+@traced("service")
+class RedisSeatHolds:
+    """Seat holds as expiring Redis keys"""
+
+    name = "redis"
+
+    async def acquire(self, db: AsyncSession, event_id, seat_ids: list, owner: str, ttl: int) -> bool:
+        """Hold every seat or none of them"""
+        acquired_keys: list[str] = []
+        for seat_id in seat_ids:
+            key = hold_key(event_id, seat_id)
+            try:
+                ok = await redis.set(key, owner, ex=ttl, nx=True)
+            except RedisError:
+                if acquired_keys:
+                    await self._delete(acquired_keys)
+                raise
+            if not ok:
+                if acquired_keys:
+                    await self._delete(acquired_keys)
+                return False
+            acquired_keys.append(key)
+        if seat_ids:
+            index_key = HOLD_INDEX_KEY.format(event_id=event_id)
+            expires_at = time.time() + ttl
+            pipe = redis.pipeline(transaction=False)
+            pipe.zadd(index_key, {str(seat_id): expires_at for seat_id in seat_ids})
+            pipe.expire(index_key, ttl)  # outlives every hold it lists
+            await pipe.execute()
+        return True
+
+    async def release(self, db: AsyncSession, event_id, seat_ids: list) -> None:
+        if seat_ids:
+            pipe = redis.pipeline(transaction=False)
+            pipe.delete(*(hold_key(event_id, seat_id) for seat_id in seat_ids))
+            pipe.zrem(HOLD_INDEX_KEY.format(event_id=event_id), *(str(seat_id) for seat_id in seat_ids))
+            await pipe.execute()
+
+    async def purge_expired(self, db: AsyncSession) -> int:
+        return 0  # Redis expires keys itself
+
+    @staticmethod
+    async def _delete(keys: list[str]) -> None:
+        try:
+            await redis.delete(*keys)
+        except RedisError as e:
+            logger.warning("Error releasing locks: %s", e)
+
+
+@traced("service")
+class PostgresSeatHolds:
+    """Seat holds as rows in seat_holds, written in the caller's transaction
+
+    A hold becomes visible to other sessions when the caller commits and goes
+    away if it rolls back. A concurrent hold on the same seat waits on the row
+    lock, so two bookings can never both win a seat.
+    """
+
+    name = "postgres"
+
+    async def acquire(self, db: AsyncSession, event_id, seat_ids: list, owner: str, ttl: int) -> bool:
+        """Hold every seat or none of them"""
+        seat_ids = list(dict.fromkeys(str(seat_id) for seat_id in seat_ids))
+        if not seat_ids:
+            return True
+        expires_at = func.now() + timedelta(seconds=ttl)
+        statement = insert(SeatHold).values([
+            {"event_id": event_id, "seat_id": seat_id, "owner": owner, "expires_at": expires_at}
+            for seat_id in seat_ids
+        ])
+        # Take over a seat only once its previous hold has expired
+        statement = statement.on_conflict_do_update(
+            index_elements=[SeatHold.event_id, SeatHold.seat_id],
+            set_={"owner": statement.excluded.owner, "expires_at": statement.excluded.expires_at},
+            where=SeatHold.expires_at < func.now(),
+        ).returning(SeatHold.seat_id)
+        savepoint = await db.begin_nested()
+        held = (await db.execute(statement)).all()
+        if len(held) != len(seat_ids):
+            # Undo the seats that were taken
+            await savepoint.rollback()
+            return False
+        await savepoint.commit()
+        return True
+
+    async def release(self, db: AsyncSession, event_id, seat_ids: list) -> None:
+        if seat_ids:
+            await db.execute(
+                delete(SeatHold).where(
+                    SeatHold.event_id == event_id,
+                    SeatHold.seat_id == any_(literal([str(seat_id) for seat_id in seat_ids], ARRAY(SeatHold.seat_id.type))),
+                )
+            )
+            await db.commit()
+
+    async def purge_expired(self, db: AsyncSession) -> int:
+        result = await db.execute(delete(SeatHold).where(SeatHold.expires_at < func.now()))
+        await db.commit()
+        return result.rowcount
+
+
+@traced("service")
+class FailoverSeatHolds:
+    """Redis holds that fall back to Postgres while Redis is failing
+
+    After a Redis error, holds go to Postgres for one TTL. For the TTL after
+    that, holds are taken in both stores, because Postgres holds from the
+    outage may still be live. Redis errors in either phase restart the outage.
+    Releases always go to both stores, since another worker may have taken the
+    hold while it was failing over.
+    """
+
+    name = "failover"
+
+    def __init__(self, primary: RedisSeatHolds, fallback: PostgresSeatHolds):
+        self.primary = primary
+        self.fallback = fallback
+        self._failed_at = None
+
+    def _phase(self, ttl: int) -> str:
+        if self._failed_at is None:
+            return "primary"
+        elapsed = time.monotonic() - self._failed_at
+        if elapsed < ttl:
+            return "fallback"
+        if elapsed < 2 * ttl:
+            return "both"
+        self._failed_at = None
+        return "primary"
+
+    async def acquire(self, db: AsyncSession, event_id, seat_ids: list, owner: str, ttl: int) -> bool:
+        phase = self._phase(ttl)
+        if phase != "fallback":
+            try:
+                if not await self.primary.acquire(db, event_id, seat_ids, owner, ttl):
+                    return False
+            except RedisError as e:
+                logger.warning("Redis seat holds unavailable, failing over to Postgres: %s", e)
+                self._failed_at = time.monotonic()
+                phase = "fallback"
+        if phase == "primary":
+            return True
+        if not await self.fallback.acquire(db, event_id, seat_ids, owner, ttl):
+            if phase == "both":
+                await self.primary._delete([hold_key(event_id, seat_id) for seat_id in seat_ids])
+            return False
+        return True
+
+    async def release(self, db: AsyncSession, event_id, seat_ids: list) -> None:
+        try:
+            await self.primary.release(db, event_id, seat_ids)
+        except RedisError as e:
+            logger.warning("Error releasing locks: %s", e)
+        await self.fallback.release(db, event_id, seat_ids)
+
+    async def purge_expired(self, db: AsyncSession) -> int:
+        return await self.fallback.purge_expired(db)
+
+
+def build_seat_holds(backend: str):
+    """Seat hold backend for a SEAT_HOLD_BACKEND value"""
+    if backend == "redis":
+        return RedisSeatHolds()
+    if backend == "postgres":
+        return PostgresSeatHolds()
+    if backend == "failover":
+        return FailoverSeatHolds(RedisSeatHolds(), PostgresSeatHolds())
+    raise ValueError(f"Unknown SEAT_HOLD_BACKEND: {backend}")
+
+
+seat_holds = build_seat_holds(settings.SEAT_HOLD_BACKEND)
@@ -6,10 +6,12 @@ from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.seats import Seat
 from app.schemas.seats import SeatCreate, SeatUpdate
-import uuid
+from app.db.ids import uuid7
 import string
+from app.core.tracing import traced
 
 
+@traced("service")
 class SeatService:
     """Service class for seat database operations"""
     
@@ -18,7 +20,7 @@ class SeatService:
         """Create seat in database"""
         try:
             db_seat = Seat(
-                id=uuid.uuid4(),
+                id=uuid7(),
                 venue_id=seat.venue_id,
                 label=seat.label,
                 row_no=seat.row_no,
@@ -108,7 +110,7 @@ class SeatService:
             for row_idx, row_letter in enumerate(row_letters):
                 for seat_num in range(1, seats_per_row + 1):
                     seat = Seat(
-                        id=uuid.uuid4(),
+                        id=uuid7(),
                         venue_id=venue_id,
                         label=f"{row_letter}{seat_num}",
                         row_no=row_letter,
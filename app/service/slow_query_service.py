@@ -0,0 +1,112 @@
+"""Ranked slow statements on Redis
+
+Every slow statement (see app/db/slow_queries.py) is aggregated by shape in
+sorted sets that rank shapes by total time, worst duration and count. A hash per
+shape holds the statement text, the last route and caller and, when one was
+captured, the latest EXPLAIN (ANALYZE, BUFFERS) plan. All API workers write to
+the same keys, and entries expire SLOW_QUERY_RETENTION_SECONDS after the last
+slow run.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Optional
+from app.core.config import settings
+from app.core.redis import redis
+
+SLOW_RANK_KEY = "slowq:rank:{order}"
+SLOW_STATEMENT_KEY = "slowq:stmt:{digest}"
+ORDERS = ("total", "max", "count")
+
+
+def statement_digest(shape: str) -> str:
+    return hashlib.sha1(shape.encode()).hexdigest()[:16]
+
+
+class SlowQueryService:
+    """Service class for the ranked slow statement view"""
+
+    @staticmethod
+    async def record(shape: str, duration_ms: float, route: Optional[str], caller: Optional[str]) -> None:
+        """Add one slow run of a statement shape"""
+        try:
+            digest = statement_digest(shape)
+            key = SLOW_STATEMENT_KEY.format(digest=digest)
+            ttl = settings.SLOW_QUERY_RETENTION_SECONDS
+            pipe = redis.pipeline(transaction=False)
+            pipe.zincrby(SLOW_RANK_KEY.format(order="total"), duration_ms, digest)
+            pipe.zadd(SLOW_RANK_KEY.format(order="max"), {digest: duration_ms}, gt=True)
+            pipe.zincrby(SLOW_RANK_KEY.format(order="count"), 1, digest)
+            pipe.hset(key, mapping={
+                "statement": shape,
+                "last_route": route or "",
+                "last_caller": caller or "",
+                "last_seen": datetime.now(timezone.utc).isoformat(),
+            })
+            pipe.expire(key, ttl)
+            for order in ORDERS:
+                pipe.expire(SLOW_RANK_KEY.format(order=order), ttl)
+            await pipe.execute()
+        except Exception as e:
+            raise Exception(f"Error recording slow statement: {str(e)}")
+
+    @staticmethod
+    async def record_plan(shape: str, plan) -> None:
+        """Store the latest EXPLAIN plan of a statement shape"""
+        try:
+            key = SLOW_STATEMENT_KEY.format(digest=statement_digest(shape))
+            await redis.hset(key, mapping={"plan": json.dumps(plan), "plan_at": datetime.now(timezone.utc).isoformat()})
+        except Exception as e:
+            raise Exception(f"Error recording query plan: {str(e)}")
+
+    @staticmethod
+    async def top(order: str = "total", limit: int = 20) -> list[dict]:
+        """Slowest statement shapes, ranked by total time, worst duration or count"""
+        if order not in ORDERS:
+            raise ValueError(f"order must be one of {', '.join(ORDERS)}")
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        try:
+            digests = [digest for digest, _ in await redis.zrevrange(SLOW_RANK_KEY.format(order=order), 0, limit - 1, withscores=True)]
+            pipe = redis.pipeline(transaction=False)
+            for digest in digests:
+                for rank in ORDERS:
+                    pipe.zscore(SLOW_RANK_KEY.format(order=rank), digest)
+                pipe.hgetall(SLOW_STATEMENT_KEY.format(digest=digest))
+            replies = await pipe.execute() if digests else []
+
+            statements = []
+            step = len(ORDERS) + 1
+            for index, digest in enumerate(digests):
+                total, worst, count, details = replies[index * step:(index + 1) * step]
+                count = int(count or 0)
+                statements.append({
+                    "digest": digest,
+                    "statement": details.get("statement"),
+                    "count": count,
+                    "total_ms": round(total or 0, 2),
+                    "mean_ms": round((total or 0) / count, 2) if count else None,
+                    "max_ms": round(worst or 0, 2),
+                    "last_route": details.get("last_route") or None,
+                    "last_caller": details.get("last_caller") or None,
+                    "last_seen": details.get("last_seen"),
+                    "plan": json.loads(details["plan"]) if "plan" in details else None,
+                    "plan_at": details.get("plan_at"),
+                })
+            return statements
+        except Exception as e:
+            raise Exception(f"Error fetching slow statements: {str(e)}")
+
+    @staticmethod
+    async def reset() -> int:
+        """Forget every recorded slow statement; returns how many shapes were cleared"""
+        try:
+            digests = await redis.zrange(SLOW_RANK_KEY.format(order="count"), 0, -1)
+            await redis.delete(
+                *(SLOW_RANK_KEY.format(order=order) for order in ORDERS),
+                *(SLOW_STATEMENT_KEY.format(digest=digest) for digest in digests),
+            )
+            return len(digests)
+        except Exception as e:
+            raise Exception(f"Error clearing slow statements: {str(e)}")
@@ -8,10 +8,12 @@ from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.users import User
 from app.schemas.users import UserCreate
+from app.core.tracing import traced
 
 SECRET_KEY = "your_secret_key"  # Use a secure key and keep it secret
 
 
+@traced("service")
 class UserService:
     """Service class for user database operations"""
     
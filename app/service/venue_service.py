@@ -7,9 +7,11 @@ from sqlalchemy.exc import SQLAlchemyError
 from app.models.venues import Venue
 from app.schemas.venues import VenueCreate, VenueUpdate
 from app.service.seat_service import SeatService
-import uuid
+from app.db.ids import uuid7
+from app.core.tracing import traced
 
 
+@traced("service")
 class VenueService:
     """Service class for venue database operations"""
     
@@ -18,7 +20,7 @@ class VenueService:
         """Create venue in database"""
         try:
             db_venue = Venue(
-                id=uuid.uuid4(),
+                id=uuid7(),
                 name=venue.name,
                 address=venue.address,
                 total_rows=venue.total_rows,
@@ -0,0 +1,129 @@
+"""Benchmark the asyncpg fast path against the ORM path
+
+Times the seat-map read, the availability check and the seat claim both ways
+against a local database, reporting wall time and process CPU time per call.
+Claims run inside a transaction that is rolled back, so the data is left as is:
+
+    python -m app.test.bench_fastpath                      # largest event
+    python -m app.test.bench_fastpath --event-id <uuid> --iterations 50
+
+Seed a large venue first (e.g. `python -m app.test.query_plans --seed
+--rows 100 --seats-per-row 120`) to see the 10k+ row case.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from sqlalchemy import select, text
+from app.core.config import settings
+from app.db.ids import uuid7
+from app.db.session import async_session_maker, engine
+from app.models.bookings import Booking
+from app.models.booking_seats import BookingSeat
+from app.models.event_seats import EventSeat
+from app.service.event_seat_service import EventSeatService
+from app.service.seat_fastpath import SeatFastPath
+
+
+async def pick_event(event_id: str = None) -> tuple[str, str, list[str]]:
+    """Event id, a user id and a handful of AVAILABLE seat ids to claim"""
+    async with engine.connect() as conn:
+        if not event_id:
+            event_id = (await conn.execute(text(
+                "SELECT event_id FROM event_seats GROUP BY event_id ORDER BY count(*) DESC LIMIT 1"
+            ))).scalar()
+            if not event_id:
+                raise SystemExit("No event seats found; seed a dataset first")
+        user_id = (await conn.execute(text("SELECT id FROM users LIMIT 1"))).scalar()
+        seat_ids = (await conn.execute(text(
+            "SELECT seat_id FROM event_seats WHERE event_id = :event_id AND status = 'AVAILABLE' LIMIT 4"
+        ), {"event_id": event_id})).scalars().all()
+    return str(event_id), str(user_id), [str(seat_id) for seat_id in seat_ids]
+
+
+async def claim_and_rollback(event_id: str, user_id: str, seat_ids: list[str]) -> None:
+    """Availability check plus seat claim for one booking, rolled back afterwards"""
+    async with async_session_maker() as db:
+        # Same steps as PaymentService.create_pending_booking_with_locks, minus
+        # Redis and the final commit
+        if settings.DB_FASTPATH_ENABLED:
+            seats = await SeatFastPath.get_seats_for_booking(db, event_id, seat_ids)
+        else:
+            seats = (await db.execute(
+                select(EventSeat).where(EventSeat.event_id == event_id, EventSeat.seat_id.in_(seat_ids))
+            )).scalars().all()
+        booking = Booking(id=uuid7(), event_id=event_id, user_id=user_id, total_amount=0, status="PENDING")
+        db.add(booking)
+        await db.flush()
+        if settings.DB_FASTPATH_ENABLED:
+            await SeatFastPath.claim_seats(db, booking.id, event_id, [s.id for s in seats], "LOCKED")
+        else:
+            for s in seats:
+                db.add(BookingSeat(id=uuid7(), booking_id=booking.id, event_seat_id=s.id, event_id=s.event_id))
+                s.status = "LOCKED"
+            await db.flush()
+        await db.rollback()
+
+
+async def seat_map(event_id: str) -> int:
+    async with async_session_maker() as db:
+        return len(await EventSeatService.get_event_seats_by_event(db, event_id))
+
+
+async def available(event_id: str) -> int:
+    async with async_session_maker() as db:
+        return len(await EventSeatService.get_available_event_seats(db, event_id))
+
+
+async def measure(call, iterations: int) -> dict:
+    await call()  # warm the connection and the statement caches
+    walls, cpus = [], []
+    for _ in range(iterations):
+        wall, cpu = time.perf_counter(), time.process_time()
+        await call()
+        walls.append((time.perf_counter() - wall) * 1000)
+        cpus.append((time.process_time() - cpu) * 1000)
+    return {
+        "wall_p50": statistics.median(walls),
+        "wall_p95": sorted(walls)[int(len(walls) * 0.95) - 1],
+        "cpu_mean": statistics.fmean(cpus),
+    }
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--event-id", default=None)
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    try:
+        event_id, user_id, seat_ids = await pick_event(args.event_id)
+        rows = await seat_map(event_id)
+        print(f"Event {event_id}: {rows} seats, {args.iterations} iterations per case\n")
+
+        cases = [
+            ("seat map", lambda: seat_map(event_id)),
+            ("available seats", lambda: available(event_id)),
+        ]
+        if seat_ids and user_id:
+            cases.append(("check + claim", lambda: claim_and_rollback(event_id, user_id, seat_ids)))
+
+        print(f"{'case':<18}{'path':<10}{'wall p50 ms':>14}{'wall p95 ms':>14}{'cpu ms/call':>14}")
+        for name, call in cases:
+            results = {}
+            for path, enabled in (("orm", False), ("asyncpg", True)):
+                settings.DB_FASTPATH_ENABLED = enabled
+                results[path] = await measure(call, args.iterations)
+                r = results[path]
+                print(f"{name:<18}{path:<10}{r['wall_p50']:>14.2f}{r['wall_p95']:>14.2f}{r['cpu_mean']:>14.2f}")
+            saved = 1 - results["asyncpg"]["cpu_mean"] / results["orm"]["cpu_mean"] if results["orm"]["cpu_mean"] else 0
+            print(f"{'':<18}{'':<10}{'':>14}{'':>14}{saved:>13.0%} less CPU")
+    finally:
+        await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
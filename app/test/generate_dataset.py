@@ -0,0 +1,279 @@
+"""Synthetic dataset generator
+
+Fills a local database with production-like volume for benchmarks: users,
+venues with their seats, events, event seats, bookings, booking seats and
+payments. Rows are generated in Python and bulk loaded with COPY, bypassing the
+ORM. Event seats and everything sold are generated by --jobs worker processes,
+each with its own connection, a batch of events per transaction.
+
+    alembic upgrade head
+    python -m app.test.generate_dataset                                   # ~10M event seats
+    python -m app.test.generate_dataset --users 2000000 --venues 2000 \\
+        --events 100000 --jobs 8                                          # ~200M event seats
+
+Distributions are weighted lists of `value:weight`:
+
+    --venue-sizes 20x25:6,40x50:3,100x120:1     rows x seats per row
+    --booking-sizes 1:30,2:40,3:15,4:10,6:5      seats per booking
+    --status-mix CONFIRMED:85,CANCELLED:10,PENDING:5
+    --sell-through 0.2-0.95                      share of seats sold, per event
+
+Each run tags its users and venues (--tag), so runs can be stacked. Generated
+users can log in with password "password".
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+import asyncpg
+import bcrypt
+from app.db.ids import uuid7
+from app.db.session import DATABASE_URL
+
+DSN = DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+EVENT_PRICES = [25, 40, 50, 75, 100, 150]
+
+# event seat and payment status for each booking status
+BOOKED_SEAT_STATUS = {"CONFIRMED": "BOOKED", "PENDING": "LOCKED", "CANCELLED": "AVAILABLE"}
+PAYMENT_STATUS = {"CONFIRMED": "SUCCESS", "CANCELLED": "FAILED"}
+
+COLUMNS = {
+    "users": ["id", "name", "email", "password_hash", "role", "created_at"],
+    "venues": ["id", "name", "address", "total_rows", "seats_per_row", "created_at"],
+    "seats": ["id", "venue_id", "label", "row_no", "seat_no", "created_at"],
+    "events": ["id", "venue_id", "title", "description", "default_price", "start_time", "end_time",
+               "created_by", "is_active", "created_at"],
+    "event_seats": ["id", "event_id", "seat_id", "price", "status"],
+    "bookings": ["id", "event_id", "user_id", "total_amount", "status", "created_at"],
+    "booking_seats": ["id", "booking_id", "event_seat_id", "event_id"],
+    "payments": ["id", "booking_id", "user_id", "amount", "status", "transaction_ref", "created_at", "updated_at"],
+}
+
+
+def weighted(spec: str, parse=str) -> tuple[list, list[float]]:
+    """'a:3,b:1' -> ([a, b], [3.0, 1.0])"""
+    values, weights = [], []
+    for part in spec.split(","):
+        value, _, weight = part.strip().rpartition(":")
+        values.append(parse(value))
+        weights.append(float(weight))
+    return values, weights
+
+
+def venue_size(value: str) -> tuple[int, int]:
+    rows, seats_per_row = value.lower().split("x")
+    return int(rows), int(seats_per_row)
+
+
+def row_name(index: int) -> str:
+    """0 -> A, 25 -> Z, 26 -> AA"""
+    name = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(65 + remainder) + name
+    return name
+
+
+async def copy(conn: asyncpg.Connection, table: str, records: list) -> None:
+    if records:
+        await conn.copy_records_to_table(table, records=records, columns=COLUMNS[table])
+
+
+async def load_base(args, rng: random.Random) -> tuple[list, list]:
+    """Users, venues, seats and events; returns user ids and event descriptors"""
+    now = datetime.now(timezone.utc)
+    password_hash = bcrypt.hashpw(b"password", bcrypt.gensalt()).decode()
+    sizes, size_weights = weighted(args.venue_sizes, venue_size)
+
+    conn = await asyncpg.connect(DSN)
+    try:
+        await conn.execute("SET synchronous_commit = off")
+        async with conn.transaction():
+            admin_id = uuid7()
+            users = [(admin_id, "Generated Admin", f"gen-{args.tag}-admin@example.com", password_hash, "ADMIN", now)]
+            users += [
+                (uuid7(), f"Generated User {n}", f"gen-{args.tag}-{n}@example.com", password_hash, "USER", now)
+                for n in range(1, args.users + 1)
+            ]
+            await copy(conn, "users", users)
+            user_ids = [user[0] for user in users[1:]]
+            del users
+
+            venues = []
+            for n in range(1, args.venues + 1):
+                rows, seats_per_row = rng.choices(sizes, size_weights)[0]
+                venues.append((uuid7(), f"Generated Venue {args.tag}-{n}", None, rows, seats_per_row, now))
+            await copy(conn, "venues", venues)
+            for venue_id, _, _, rows, seats_per_row, _ in venues:
+                await copy(conn, "seats", [
+                    (uuid7(), venue_id, f"{row_name(r)}{s}", row_name(r), s, now)
+                    for r in range(rows) for s in range(1, seats_per_row + 1)
+                ])
+
+            events = []
+            for n in range(1, args.events + 1):
+                venue_id = rng.choice(venues)[0]
+                if rng.random() < args.past_fraction:
+                    start = now - timedelta(days=rng.uniform(1, args.days))
+                else:
+                    start = now + timedelta(days=rng.uniform(1, args.days))
+                events.append((uuid7(), venue_id, f"Generated Event {args.tag}-{n}", None, rng.choice(EVENT_PRICES),
+                               start, start + timedelta(hours=3), admin_id, True, now))
+            await copy(conn, "events", events)
+    finally:
+        await conn.close()
+    return user_ids, [(event[0], event[1], event[4], event[5]) for event in events]
+
+
+def generate_event(args, rng: random.Random, event: tuple, seat_ids: list, user_ids: list, now: datetime) -> dict:
+    """Event seat, booking, booking seat and payment rows of one event"""
+    event_id, _, default_price, start = event
+    price = Decimal(default_price)
+    booking_sizes, size_weights = weighted(args.booking_sizes, int)
+    statuses, status_weights = weighted(args.status_mix)
+    low, high = (float(bound) for bound in args.sell_through.split("-"))
+
+    event_seat_ids = [uuid7() for _ in seat_ids]
+    seat_status = ["AVAILABLE"] * len(seat_ids)
+    rows = {"bookings": [], "booking_seats": [], "payments": []}
+
+    # Bookings take neighbouring seats, as buyers do
+    sold = sorted(rng.sample(range(len(seat_ids)), int(len(seat_ids) * rng.uniform(low, high))))
+    position = 0
+    while position < len(sold):
+        size = rng.choices(booking_sizes, size_weights)[0]
+        group = sold[position:position + size]
+        position += size
+        status = rng.choices(statuses, status_weights)[0]
+        if status == "PENDING" and start < now:
+            status = "CANCELLED"  # a finished event has no open checkouts
+        booking_id = uuid7()
+        user_id = rng.choice(user_ids)
+        amount = price * len(group)
+        created_at = min(start, now) - timedelta(days=rng.uniform(0, 60))
+        rows["bookings"].append((booking_id, event_id, user_id, amount, status, created_at))
+        for index in group:
+            rows["booking_seats"].append((uuid7(), booking_id, event_seat_ids[index], event_id))
+            seat_status[index] = BOOKED_SEAT_STATUS[status]
+        if status in PAYMENT_STATUS:
+            rows["payments"].append((uuid7(), booking_id, user_id, amount, PAYMENT_STATUS[status],
+                                     f"GEN_{booking_id.hex[-12:].upper()}", created_at, created_at))
+
+    rows["event_seats"] = [
+        (event_seat_ids[index], event_id, seat_id, price, seat_status[index])
+        for index, seat_id in enumerate(seat_ids)
+    ]
+    return rows
+
+
+async def load_events(args, events: list, user_ids: list, seed: int) -> dict:
+    """Load the seats and sales of a slice of events, a batch per transaction"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    counts = dict.fromkeys(["event_seats", "bookings", "booking_seats", "payments"], 0)
+    venue_seats: dict = {}
+
+    conn = await asyncpg.connect(DSN)
+    try:
+        await conn.execute("SET synchronous_commit = off")
+        for start in range(0, len(events), args.batch_events):
+            batch = {table: [] for table in counts}
+            for event in events[start:start + args.batch_events]:
+                venue_id = event[1]
+                if venue_id not in venue_seats:
+                    venue_seats[venue_id] = await conn.fetchval(
+                        "SELECT array_agg(id ORDER BY length(row_no), row_no, seat_no) FROM seats WHERE venue_id = $1",
+                        venue_id,
+                    )
+                for table, rows in generate_event(args, rng, event, venue_seats[venue_id], user_ids, now).items():
+                    batch[table].extend(rows)
+            # Parents before children for the foreign keys
+            async with conn.transaction():
+                for table in ("event_seats", "bookings", "booking_seats", "payments"):
+                    await copy(conn, table, batch[table])
+                    counts[table] += len(batch[table])
+    finally:
+        await conn.close()
+    return counts
+
+
+# Set once per worker process, so the user ids aren't pickled for every slice
+_user_ids: list = []
+
+
+def init_worker(user_ids: list) -> None:
+    global _user_ids
+    _user_ids = user_ids
+
+
+def load_events_process(args, events: list, seed: int) -> dict:
+    return asyncio.run(load_events(args, events, _user_ids, seed))
+
+
+async def analyze() -> None:
+    conn = await asyncpg.connect(DSN)
+    try:
+        await conn.execute("ANALYZE")
+    finally:
+        await conn.close()
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--venues", type=int, default=200)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--venue-sizes", default="20x25:6,40x50:3,100x120:1")
+    parser.add_argument("--booking-sizes", default="1:30,2:40,3:15,4:10,6:5")
+    parser.add_argument("--status-mix", default="CONFIRMED:85,CANCELLED:10,PENDING:5")
+    parser.add_argument("--sell-through", default="0.2-0.95", help="per-event range of the share of seats sold")
+    parser.add_argument("--past-fraction", type=float, default=0.5, help="share of events that already took place")
+    parser.add_argument("--days", type=int, default=180, help="events start up to this many days away")
+    parser.add_argument("--jobs", type=int, default=4, help="worker processes loading events")
+    parser.add_argument("--batch-events", type=int, default=20, help="events per COPY transaction")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for a reproducible dataset")
+    parser.add_argument("--tag", default=None, help="suffix for generated names and emails (default: random)")
+    args = parser.parse_args()
+    args.tag = args.tag or uuid.uuid4().hex[:6]
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+
+    started = time.perf_counter()
+    user_ids, events = await load_base(args, random.Random(seed))
+    print(f"Loaded {len(user_ids)} users, {args.venues} venues and {len(events)} events "
+          f"in {time.perf_counter() - started:.1f}s (tag {args.tag}, seed {seed})")
+
+    # Several slices per process so a slice of large venues doesn't hold up the rest
+    slices = [events[index::args.jobs * 4] for index in range(args.jobs * 4)]
+    totals = dict.fromkeys(["event_seats", "bookings", "booking_seats", "payments"], 0)
+    loop = asyncio.get_running_loop()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(args.jobs, mp_context=context, initializer=init_worker, initargs=(user_ids,)) as pool:
+        futures = [
+            loop.run_in_executor(pool, load_events_process, args, events_slice, seed + index + 1)
+            for index, events_slice in enumerate(slices) if events_slice
+        ]
+        for future in asyncio.as_completed(futures):
+            for table, count in (await future).items():
+                totals[table] += count
+    elapsed = time.perf_counter() - started
+    for table, count in totals.items():
+        print(f"  {table}: {count} rows")
+    rows = sum(totals.values())
+    print(f"Loaded {rows} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+
+    print("Analyzing...")
+    await analyze()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
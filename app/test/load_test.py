@@ -0,0 +1,304 @@
+"""On-sale load test
+
+Seeds a fresh venue, event and set of users into the local Postgres, clears
+the event's seat holds in Redis, then drives concurrent book + pay flows
+against a running API (`POST /bookings/book` then `POST /payments/process`).
+Two seat-picking scenarios:
+
+- contention: every flow wants seats from a small hot block, so most lose
+- spread: flows pick seats across the whole map, so few collide
+
+Reports throughput, p50/p95/p99 latency per step, the conflict rate and
+double-booking violations, which must be zero. Results are written as JSON
+(with the git commit and relevant settings) so runs can be compared:
+
+    uvicorn app.main:app --workers 4 &
+    python -m app.test.load_test --scenario contention --flows 2000 --concurrency 200
+    python -m app.test.load_test --scenario spread --rows 50 --seats-per-row 100
+
+Exits with status 1 when a violation is found.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+import httpx
+from sqlalchemy import text
+from app.core.config import settings
+from app.db.session import engine
+from app.service.lock_service import LockService
+from app.service.user_service import UserService
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO users (id, name, email, password_hash, role, created_at)
+    SELECT gen_random_uuid(), 'Load User ' || g, 'load-' || :run || '-' || g || '@example.com', 'x', 'USER', now()
+    FROM generate_series(1, :users) AS g
+    """,
+    """
+    INSERT INTO venues (id, name, address, total_rows, seats_per_row, created_at)
+    VALUES (:venue_id, 'LoadTest Venue ' || :run, NULL, :rows, :seats_per_row, now())
+    """,
+    """
+    INSERT INTO seats (id, venue_id, label, row_no, seat_no, created_at)
+    SELECT gen_random_uuid(), :venue_id, 'R' || r || '-' || s, 'R' || r, s, now()
+    FROM generate_series(1, :rows) AS r, generate_series(1, :seats_per_row) AS s
+    """,
+    """
+    INSERT INTO events (id, venue_id, title, description, default_price, start_time, end_time, created_by, is_active, created_at)
+    SELECT :event_id, :venue_id, 'LoadTest Event ' || :run, NULL, 50,
+           now() + interval '30 days', now() + interval '30 days 3 hours',
+           (SELECT id FROM users WHERE email LIKE 'load-' || :run || '-%' LIMIT 1), true, now()
+    """,
+    """
+    INSERT INTO event_seats (id, event_id, seat_id, price, status)
+    SELECT gen_random_uuid(), :event_id, s.id, 50, 'AVAILABLE'
+    FROM seats s WHERE s.venue_id = :venue_id
+    """,
+]
+
+# Seats held by more than one live booking
+DOUBLE_BOOKED_SQL = """
+SELECT bs.event_seat_id, count(*) AS bookings
+FROM booking_seats bs
+JOIN bookings b ON b.id = bs.booking_id
+WHERE bs.event_id = :event_id AND b.status IN ('PENDING', 'CONFIRMED')
+GROUP BY bs.event_seat_id
+HAVING count(*) > 1
+"""
+
+# Seats of confirmed bookings that aren't BOOKED, and BOOKED seats without one
+SEAT_STATUS_MISMATCH_SQL = """
+SELECT count(*) FROM event_seats es
+LEFT JOIN (
+    SELECT bs.event_seat_id
+    FROM booking_seats bs
+    JOIN bookings b ON b.id = bs.booking_id
+    WHERE bs.event_id = :event_id AND b.status = 'CONFIRMED'
+) confirmed ON confirmed.event_seat_id = es.id
+WHERE es.event_id = :event_id
+  AND (es.status = 'BOOKED') <> (confirmed.event_seat_id IS NOT NULL)
+"""
+
+
+async def seed(args) -> dict:
+    """Create this run's venue, event and users; returns their ids"""
+    run = uuid.uuid4().hex[:8]
+    params = {
+        "run": run,
+        "venue_id": str(uuid.uuid4()),
+        "event_id": str(uuid.uuid4()),
+        "users": args.users,
+        "rows": args.rows,
+        "seats_per_row": args.seats_per_row,
+    }
+    async with engine.begin() as conn:
+        for statement in SEED_STATEMENTS:
+            await conn.execute(text(statement), params)
+        user_ids = (await conn.execute(
+            text("SELECT id FROM users WHERE email LIKE 'load-' || :run || '-%'"), params
+        )).scalars().all()
+        seat_ids = (await conn.execute(
+            text("SELECT seat_id FROM event_seats WHERE event_id = :event_id"), params
+        )).scalars().all()
+    # Start from an empty hold set in Redis
+    await LockService.clear_locks(params["event_id"])
+    return {
+        "run": run,
+        "event_id": params["event_id"],
+        "user_ids": [str(user_id) for user_id in user_ids],
+        "seat_ids": [str(seat_id) for seat_id in seat_ids],
+    }
+
+
+def pick_seats(args, seat_ids: list[str]) -> list[str]:
+    pool = seat_ids[:args.hot_seats] if args.scenario == "contention" else seat_ids
+    return random.sample(pool, min(args.seats_per_booking, len(pool)))
+
+
+async def run_flow(client: httpx.AsyncClient, args, dataset: dict, tokens: dict, results: dict) -> None:
+    """One buyer: book seats, then pay for them"""
+    user_id = random.choice(dataset["user_ids"])
+    headers = {"Authorization": f"Bearer {tokens[user_id]}"}
+    body = {"event_id": dataset["event_id"], "seat_ids": pick_seats(args, dataset["seat_ids"])}
+
+    flow_start = time.perf_counter()
+    start = flow_start
+    try:
+        response = await client.post("/bookings/book", json=body, headers=headers)
+    except httpx.HTTPError as e:
+        results["outcomes"]["error"] += 1
+        results["errors"].append(f"book: {type(e).__name__}")
+        return
+    results["latency"]["book"].append(time.perf_counter() - start)
+    if response.status_code == 400 and "not available" in response.text:
+        results["outcomes"]["conflict"] += 1
+        return
+    if response.status_code != 201:
+        results["outcomes"]["error"] += 1
+        results["errors"].append(f"book: HTTP {response.status_code} {response.text[:120]}")
+        return
+    booking_id = response.json()["booking_id"]
+
+    start = time.perf_counter()
+    try:
+        response = await client.post(f"/payments/process/{booking_id}", headers=headers)
+        if response.status_code == 202:
+            # Async payment mode: long-poll the outcome
+            response = await client.get(
+                f"/payments/status/{booking_id}",
+                params={"wait": settings.PAYMENT_STATUS_MAX_WAIT_SECONDS},
+                headers=headers,
+            )
+    except httpx.HTTPError as e:
+        results["outcomes"]["error"] += 1
+        results["errors"].append(f"pay: {type(e).__name__}")
+        return
+    results["latency"]["pay"].append(time.perf_counter() - start)
+    results["latency"]["flow"].append(time.perf_counter() - flow_start)
+    if response.status_code not in (200, 400):
+        results["outcomes"]["error"] += 1
+        results["errors"].append(f"pay: HTTP {response.status_code} {response.text[:120]}")
+        return
+    payload = response.json()
+    status = payload.get("status") or payload.get("booking", {}).get("status")
+    results["outcomes"]["confirmed" if status == "CONFIRMED" else "payment_failed"] += 1
+
+
+def percentiles(samples: list[float]) -> dict:
+    if len(samples) < 2:
+        return {"count": len(samples)}
+    cuts = statistics.quantiles(samples, n=100)
+    return {
+        "count": len(samples),
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p95_ms": round(cuts[94] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+    }
+
+
+async def check_violations(event_id: str) -> dict:
+    async with engine.connect() as conn:
+        double_booked = (await conn.execute(text(DOUBLE_BOOKED_SQL), {"event_id": event_id})).all()
+        mismatched = (await conn.execute(text(SEAT_STATUS_MISMATCH_SQL), {"event_id": event_id})).scalar()
+    return {"double_booked_seats": len(double_booked), "seat_status_mismatches": mismatched}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args) -> dict:
+    started_at = datetime.now(timezone.utc).isoformat()
+    dataset = await seed(args)
+    tokens = {user_id: UserService.generate_jwt_token(user_id, "USER") for user_id in dataset["user_ids"]}
+    print(f"Seeded event {dataset['event_id']}: {len(dataset['seat_ids'])} seats, {len(dataset['user_ids'])} users")
+
+    results = {
+        "latency": {"book": [], "pay": [], "flow": []},
+        "outcomes": {"confirmed": 0, "payment_failed": 0, "conflict": 0, "error": 0},
+        "errors": [],
+    }
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async def bounded(client):
+        async with semaphore:
+            await run_flow(client, args, dataset, tokens, results)
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(bounded(client) for _ in range(args.flows)))
+        elapsed = time.perf_counter() - start
+
+    violations = await check_violations(dataset["event_id"])
+    outcomes = results["outcomes"]
+    attempted = sum(outcomes.values())
+    return {
+        "started_at": started_at,
+        "commit": git_commit(),
+        "scenario": args.scenario,
+        "params": {
+            "flows": args.flows,
+            "concurrency": args.concurrency,
+            "seats": len(dataset["seat_ids"]),
+            "users": len(dataset["user_ids"]),
+            "seats_per_booking": args.seats_per_booking,
+            "hot_seats": args.hot_seats if args.scenario == "contention" else None,
+        },
+        "settings": {
+            "PAYMENT_MODE": settings.PAYMENT_MODE,
+            "SEAT_HOLD_BACKEND": settings.SEAT_HOLD_BACKEND,
+            "DB_FASTPATH_ENABLED": settings.DB_FASTPATH_ENABLED,
+        },
+        "event_id": dataset["event_id"],
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_flows_per_second": round(attempted / elapsed, 2) if elapsed else 0,
+        "outcomes": outcomes,
+        "conflict_rate": round(outcomes["conflict"] / attempted, 4) if attempted else 0,
+        "latency": {step: percentiles(samples) for step, samples in results["latency"].items()},
+        "violations": violations,
+        "sample_errors": results["errors"][:20],
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"\n{report['scenario']}: {report['params']['flows']} flows at concurrency {report['params']['concurrency']} "
+          f"in {report['elapsed_seconds']}s ({report['throughput_flows_per_second']} flows/s)")
+    print("outcomes: " + ", ".join(f"{name}={count}" for name, count in report["outcomes"].items())
+          + f", conflict rate {report['conflict_rate']:.1%}")
+    for step, stats in report["latency"].items():
+        if "p50_ms" in stats:
+            print(f"{step:5} n={stats['count']:<6} p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms "
+                  f"p99={stats['p99_ms']}ms max={stats['max_ms']}ms")
+    violations = report["violations"]
+    print(f"double-booked seats: {violations['double_booked_seats']}, "
+          f"seat status mismatches: {violations['seat_status_mismatches']}")
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scenario", choices=["contention", "spread"], default="contention")
+    parser.add_argument("--flows", type=int, default=2000, help="book + pay flows to run")
+    parser.add_argument("--concurrency", type=int, default=200, help="flows in flight at once")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--seats-per-row", type=int, default=50)
+    parser.add_argument("--seats-per-booking", type=int, default=2)
+    parser.add_argument("--hot-seats", type=int, default=20, help="size of the contended block")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout in seconds")
+    parser.add_argument("--output", help="results file (default: load-results/<time>-<scenario>.json)")
+    args = parser.parse_args()
+
+    try:
+        report = await run(args)
+    finally:
+        await engine.dispose()
+
+    print_report(report)
+    output = Path(args.output or f"load-results/{datetime.now():%Y%m%d-%H%M%S}-{args.scenario}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+
+    violations = report["violations"]
+    return 1 if violations["double_booked_seats"] or violations["seat_status_mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,75 @@
+"""Per-endpoint query budgets
+
+Calls the read endpoints in-process against a local Postgres and Redis, counts
+the statements each request sends and fails when an endpoint goes over its
+budget or repeats one statement shape (an N+1 loop). Use the dataset seeded by
+the query-plan suite:
+
+    python -m app.test.query_plans --seed    # once
+    python -m app.test.query_budgets
+
+Exits with status 1 when a budget is exceeded. When a change legitimately adds
+a statement, raise the endpoint's budget here in the same commit.
+"""
+
+import asyncio
+import sys
+import httpx
+from app.db.query_stats import query_budget
+from app.db.session import engine
+from app.main import app
+from app.service.user_service import UserService
+from app.test.query_plans import sample_ids
+
+# A statement shape may run at most this many times in one request
+MAX_REPEATS = 1
+
+
+def endpoint_budgets(ids: dict) -> list:
+    """(method, path, token role, statement budget) for every checked endpoint"""
+    return [
+        ("GET", f"/events/{ids['event_id']}", None, 1),
+        ("GET", "/events/upcoming", None, 1),
+        ("GET", f"/venues/{ids['venue_id']}", None, 1),
+        ("GET", f"/event-seats/event/{ids['event_id']}", None, 1),
+        ("GET", f"/event-seats/event/{ids['event_id']}/available", None, 1),
+        # bookings, archived seat labels, live seat labels
+        ("GET", "/bookings/get-bookings-by-user", "USER", 3),
+        ("GET", f"/payments/status/{ids['booking_id']}", "USER", 1),
+    ]
+
+
+async def check_budgets() -> int:
+    ids = await sample_ids()
+    token = UserService.generate_jwt_token(ids["user_id"], "USER")
+    failures = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://budget") as client:
+        for method, path, role, budget in endpoint_budgets(ids):
+            headers = {"Authorization": f"Bearer {token}"} if role else {}
+            try:
+                with query_budget(budget, MAX_REPEATS) as stats:
+                    response = await client.request(method, path, headers=headers)
+            except AssertionError as e:
+                failures += 1
+                print(f"FAIL {method} {path}: {e}")
+                continue
+            if response.status_code >= 400:
+                failures += 1
+                print(f"FAIL {method} {path}: HTTP {response.status_code}")
+            else:
+                print(f"ok   {method} {path}: {stats.count}/{budget} statements, {stats.seconds * 1000:.1f} ms")
+    return failures
+
+
+async def main() -> int:
+    try:
+        failures = await check_budgets()
+    finally:
+        await engine.dispose()
+    print(f"{failures} endpoint(s) over budget" if failures else "All endpoints within budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,250 @@
+"""Query-plan regression suite
+
+Runs the service-layer read queries against a local Postgres, EXPLAINs every
+statement they send and fails when the plan sequentially scans one of the
+large tables. Run against a database migrated with `alembic upgrade head`:
+
+    python -m app.test.query_plans --seed    # seed a dataset, then check
+    python -m app.test.query_plans           # check the existing data
+
+Exits with status 1 when a plan regresses.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from sqlalchemy import event, text
+from app.core.config import settings
+from app.db.session import engine, async_session_maker
+from app.service.analytics_service import AnalyticsService
+from app.service.booking_service import BookingService
+from app.service.event_seat_service import EventSeatService
+from app.service.event_service import EventService
+from app.service.payment_service import PaymentService
+from app.service.seat_fastpath import AVAILABLE_SEATS_SQL, BOOKING_SEATS_SQL, SEAT_MAP_SQL
+from app.service.seat_service import SeatService
+from app.service.user_service import UserService
+
+# Tables that grow with every event or booking; a seq scan on them is a regression
+LARGE_TABLES = {"event_seats", "booking_seats", "bookings", "payments", "seats"}
+
+SEED_MARKER = "QueryPlan Venue"
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO users (id, name, email, password_hash, role, created_at)
+    SELECT gen_random_uuid(), 'Plan User ' || g, 'plan-user-' || g || '@example.com', 'x', 'USER', now()
+    FROM generate_series(1, :users) AS g
+    """,
+    """
+    INSERT INTO venues (id, name, address, total_rows, seats_per_row, created_at)
+    SELECT gen_random_uuid(), :marker || ' ' || g, NULL, :rows, :seats_per_row, now()
+    FROM generate_series(1, :venues) AS g
+    """,
+    """
+    INSERT INTO seats (id, venue_id, label, row_no, seat_no, created_at)
+    SELECT gen_random_uuid(), v.id, chr(64 + r) || s, chr(64 + r), s, now()
+    FROM venues v, generate_series(1, v.total_rows) AS r, generate_series(1, v.seats_per_row) AS s
+    WHERE v.name LIKE :marker || '%'
+    """,
+    """
+    INSERT INTO events (id, venue_id, title, description, default_price, start_time, end_time, created_by, is_active, created_at)
+    SELECT gen_random_uuid(), v.id, 'Plan Event ' || e, NULL, 50,
+           now() + make_interval(days => e), now() + make_interval(days => e, hours => 3),
+           (SELECT id FROM users WHERE email LIKE 'plan-user-%' LIMIT 1), true, now()
+    FROM venues v, generate_series(1, :events_per_venue) AS e
+    WHERE v.name LIKE :marker || '%'
+    """,
+    """
+    INSERT INTO event_seats (id, event_id, seat_id, price, status)
+    SELECT gen_random_uuid(), e.id, s.id, 50,
+           CASE WHEN random() < :sell_through THEN 'BOOKED' ELSE 'AVAILABLE' END
+    FROM events e
+    JOIN venues v ON v.id = e.venue_id
+    JOIN seats s ON s.venue_id = v.id
+    WHERE v.name LIKE :marker || '%'
+    """,
+    """
+    CREATE TEMP TABLE plan_seed_bookings ON COMMIT DROP AS
+    WITH plan_users AS (
+        SELECT array_agg(id) AS ids FROM users WHERE email LIKE 'plan-user-%'
+    )
+    SELECT gen_random_uuid() AS booking_id, es.id AS event_seat_id, es.event_id, es.price,
+           plan_users.ids[1 + floor(random() * array_length(plan_users.ids, 1))::int] AS user_id
+    FROM event_seats es
+    JOIN events e ON e.id = es.event_id
+    JOIN venues v ON v.id = e.venue_id
+    CROSS JOIN plan_users
+    WHERE es.status = 'BOOKED' AND v.name LIKE :marker || '%'
+    """,
+    """
+    INSERT INTO bookings (id, event_id, user_id, total_amount, status, created_at)
+    SELECT booking_id, event_id, user_id, price, 'CONFIRMED', now() - random() * interval '30 days'
+    FROM plan_seed_bookings
+    """,
+    """
+    INSERT INTO booking_seats (id, booking_id, event_seat_id, event_id)
+    SELECT gen_random_uuid(), booking_id, event_seat_id, event_id FROM plan_seed_bookings
+    """,
+    """
+    INSERT INTO payments (id, booking_id, user_id, amount, status, transaction_ref, created_at, updated_at)
+    SELECT gen_random_uuid(), booking_id, user_id, price, 'SUCCESS', 'PLAN', now(), now()
+    FROM plan_seed_bookings
+    """,
+]
+
+
+async def seed(args) -> None:
+    """Bulk-load a dataset large enough for the planner to prefer indexes"""
+    params = {
+        "marker": SEED_MARKER,
+        "users": args.users,
+        "venues": args.venues,
+        "rows": args.rows,
+        "seats_per_row": args.seats_per_row,
+        "events_per_venue": args.events_per_venue,
+        "sell_through": args.sell_through,
+    }
+    async with engine.begin() as conn:
+        for statement in SEED_STATEMENTS:
+            await conn.execute(text(statement), params)
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+
+
+async def sample_ids() -> dict:
+    """Pick real ids to feed the service calls"""
+    async with engine.connect() as conn:
+        row = (await conn.execute(text(
+            """
+            SELECT b.id AS booking_id, b.user_id, b.event_id, e.venue_id, u.email, es.seat_id
+            FROM bookings b
+            JOIN events e ON e.id = b.event_id
+            JOIN users u ON u.id = b.user_id
+            JOIN event_seats es ON es.event_id = b.event_id
+            ORDER BY b.created_at DESC
+            LIMIT 1
+            """
+        ))).mappings().first()
+    if not row:
+        raise SystemExit("No bookings found; run with --seed first")
+    return {key: str(value) for key, value in row.items()}
+
+
+def service_checks(ids: dict) -> list:
+    """(name, call, tables allowed to be fully scanned) for every service read"""
+    # Dashboard aggregates read every confirmed booking by design
+    aggregate = {"bookings", "booking_seats", "event_seats"}
+    return [
+        ("EventService.get_event_by_id", lambda db: EventService.get_event_by_id(db, ids["event_id"]), set()),
+        ("EventService.is_event_bookable", lambda db: EventService.is_event_bookable(db, ids["event_id"]), set()),
+        ("EventService.get_events", lambda db: EventService.get_events(db, 0, 10), set()),
+        ("EventService.get_upcoming_events_with_capacity", lambda db: EventService.get_upcoming_events_with_capacity(db, 0, 10), set()),
+        ("EventSeatService.get_event_seats_by_event", lambda db: EventSeatService.get_event_seats_by_event(db, ids["event_id"]), set()),
+        ("EventSeatService.get_available_event_seats", lambda db: EventSeatService.get_available_event_seats(db, ids["event_id"]), set()),
+        ("EventSeatService.get_event_seats_by_row", lambda db: EventSeatService.get_event_seats_by_row(db, ids["event_id"], "A"), set()),
+        ("SeatService.get_seats_by_venue", lambda db: SeatService.get_seats_by_venue(db, ids["venue_id"]), set()),
+        ("BookingService.get_booking_by_id", lambda db: BookingService.get_booking_by_id(db, ids["booking_id"]), set()),
+        ("BookingService.get_bookings_by_user", lambda db: BookingService.get_bookings_by_user(db, ids["user_id"]), set()),
+        ("BookingService.get_bookings_by_event", lambda db: BookingService.get_bookings_by_event(db, ids["event_id"]), set()),
+        ("PaymentService.get_booking_status", lambda db: PaymentService.get_booking_status(db, ids["booking_id"]), set()),
+        ("UserService.get_user_by_email", lambda db: UserService.get_user_by_email(db, ids["email"]), set()),
+        ("AnalyticsService.get_total_confirmed_bookings", lambda db: AnalyticsService.get_total_confirmed_bookings(db), aggregate),
+        ("AnalyticsService.get_most_popular_events", lambda db: AnalyticsService.get_most_popular_events(db, 10), aggregate),
+        ("AnalyticsService.get_capacity_utilization", lambda db: AnalyticsService.get_capacity_utilization(db, 0, 20), aggregate),
+    ]
+
+
+def fastpath_checks(ids: dict) -> list:
+    """(name, sql, args) for the hand-written asyncpg queries, which bypass SQLAlchemy events"""
+    return [
+        ("SeatFastPath.get_event_seats_by_event", SEAT_MAP_SQL, [ids["event_id"]]),
+        ("SeatFastPath.get_available_event_seats", AVAILABLE_SEATS_SQL, [ids["event_id"]]),
+        ("SeatFastPath.get_seats_for_booking", BOOKING_SEATS_SQL, [ids["event_id"], [ids["seat_id"]]]),
+    ]
+
+
+def seq_scans(plan: dict) -> list[str]:
+    """Relations read by a Seq Scan anywhere in an EXPLAIN (FORMAT JSON) plan"""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+async def check_plans() -> int:
+    ids = await sample_ids()
+    captured: list = []
+    # Service checks cover the ORM queries; the fast path SQL is checked separately below
+    settings.DB_FASTPATH_ENABLED = False
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    failures = 0
+    for name, call, allowed in service_checks(ids):
+        captured.clear()
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            async with async_session_maker() as db:
+                await call(db)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+        for statement, parameters in list(captured):
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            scanned = {table for table in seq_scans(plan[0]["Plan"]) if table in LARGE_TABLES - allowed}
+            if scanned:
+                failures += 1
+                print(f"FAIL {name}: seq scan on {', '.join(sorted(scanned))}")
+                print(f"     {' '.join(statement.split())}")
+            else:
+                print(f"ok   {name}")
+
+    for name, sql, args in fastpath_checks(ids):
+        async with engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            plan = await raw.driver_connection.fetchval(f"EXPLAIN (FORMAT JSON) {sql}", *args)
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        scanned = {table for table in seq_scans(plan[0]["Plan"]) if table in LARGE_TABLES}
+        if scanned:
+            failures += 1
+            print(f"FAIL {name}: seq scan on {', '.join(sorted(scanned))}")
+        else:
+            print(f"ok   {name}")
+    return failures
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="load a dataset before checking")
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--venues", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=26)
+    parser.add_argument("--seats-per-row", type=int, default=40)
+    parser.add_argument("--events-per-venue", type=int, default=10)
+    parser.add_argument("--sell-through", type=float, default=0.3)
+    args = parser.parse_args()
+
+    try:
+        if args.seed:
+            await seed(args)
+        failures = await check_plans()
+    finally:
+        await engine.dispose()
+
+    print(f"\n{failures} plan regression(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
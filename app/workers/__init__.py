@@ -0,0 +1 @@
+# Background workers
\ No newline at end of file
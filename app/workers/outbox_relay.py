@@ -0,0 +1,45 @@
+"""Outbox relay worker
+
+Publishes outbox entries (seat hold release, buyer analytics, outbox:{topic}
+Redis streams) outside the API processes. Relays claim entries with SKIP
+LOCKED, so any number of them can run next to each other and next to the
+in-process relay. Set OUTBOX_RELAY_IN_PROCESS=false on the API to leave
+relaying to this worker:
+
+    python -m app.workers.outbox_relay
+"""
+
+import asyncio
+import logging
+import signal
+from app.core.config import settings
+from app.core.log import configure_logging
+from app.core.loop_monitor import loop_monitor
+from app.core.tracing import configure_tracing
+from app.db.session import engine
+from app.service.outbox import run_relay
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    configure_logging()
+    configure_tracing("eventify-outbox-relay")
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    try:
+        logger.info("Outbox relay started")
+        await run_relay(stop)
+    finally:
+        if settings.LOOP_MONITOR_ENABLED:
+            loop_monitor.stop()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
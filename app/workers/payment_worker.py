@@ -0,0 +1,113 @@
+"""Payment worker
+
+Runs queued payment attempts when PAYMENT_MODE is "async". Each worker process
+runs PAYMENT_WORKER_CONCURRENCY consumers. Each consumer takes one attempt at a
+time, calls the payment gateway, confirms or cancels the booking, and publishes
+the outcome. Scale gateway concurrency with --concurrency or more processes,
+independently of the API workers:
+
+    python -m app.workers.payment_worker
+    python -m app.workers.payment_worker --concurrency 32 --requeue-stalled
+
+Payment outcomes and Redis/database latency of the worker are counted in the
+worker process; --metrics-port serves them for Prometheus.
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+from prometheus_client import start_http_server
+from app.core.config import settings
+from app.core.log import configure_logging
+from app.core.loop_monitor import loop_monitor
+from app.core.tracing import CONSUMER, configure_tracing, start_trace
+from app.db.session import async_session_maker, engine
+from app.processor.payment_processor import PaymentProcessor
+from app.service.payment_queue import PaymentQueue
+
+logger = logging.getLogger(__name__)
+
+CLAIM_TIMEOUT_SECONDS = 1
+# Tries at storing the outcome of an attempt that failed midway
+REPORT_FAILURE_ATTEMPTS = 3
+
+
+async def handle_attempt(raw: str, attempt: dict) -> None:
+    """Settle one payment attempt and report its outcome"""
+    booking_id = attempt["booking_id"]
+    with start_trace("payment attempt", attempt.get("traceparent"), CONSUMER, sample_new=False, booking_id=booking_id):
+        await PaymentQueue.mark_processing(booking_id)
+        async with async_session_maker() as db:
+            result = await PaymentProcessor.settle_queued_payment(db, booking_id, attempt.get("payment_data"))
+        await PaymentQueue.complete(raw, booking_id, result)
+
+
+async def report_failure(raw: str, booking_id: str, error: Exception) -> None:
+    """Finish an attempt that raised, so it isn't left PROCESSING and blocking new attempts"""
+    for tries in range(1, REPORT_FAILURE_ATTEMPTS + 1):
+        try:
+            async with async_session_maker() as db:
+                result = await PaymentProcessor.failed_attempt(db, booking_id, str(error))
+            await PaymentQueue.complete(raw, booking_id, result)
+            return
+        except Exception as e:
+            if tries == REPORT_FAILURE_ATTEMPTS:
+                # Left on the processing list; --requeue-stalled retries it
+                logger.error("Error reporting failed payment for booking %s: %s", booking_id, e)
+                return
+            await asyncio.sleep(CLAIM_TIMEOUT_SECONDS * tries)
+
+
+async def consume(stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        try:
+            claimed = await PaymentQueue.claim(CLAIM_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning("Error claiming payment attempt: %s", e)
+            await asyncio.sleep(CLAIM_TIMEOUT_SECONDS)
+            continue
+        if claimed is None:
+            continue
+        raw, attempt = claimed
+        try:
+            await handle_attempt(raw, attempt)
+        except Exception as e:
+            logger.exception("Error processing payment for booking %s", attempt.get("booking_id"))
+            await report_failure(raw, attempt["booking_id"], e)
+
+
+async def main() -> None:
+    configure_logging()
+    configure_tracing("eventify-payment-worker")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=settings.PAYMENT_WORKER_CONCURRENCY)
+    parser.add_argument("--requeue-stalled", action="store_true",
+                        help="first move attempts left by a crashed worker back onto the queue")
+    parser.add_argument("--metrics-port", type=int, default=0,
+                        help="serve Prometheus metrics on this port (0 disables)")
+    args = parser.parse_args()
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    try:
+        if args.requeue_stalled:
+            logger.info("Requeued %d stalled payment attempts", await PaymentQueue.requeue_stalled())
+        logger.info("Payment worker started with %d consumers", args.concurrency)
+        # Consumers finish their current attempt before exiting
+        await asyncio.gather(*(consume(stop) for _ in range(args.concurrency)))
+    finally:
+        if settings.LOOP_MONITOR_ENABLED:
+            loop_monitor.stop()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Archive finished events' seat data into the archive tables
+Run with: python archive_events.py [--older-than-days N] [--batch-size N] [--max-events N]
+Schedule it (e.g. nightly cron) to keep event_seats and booking_seats small.
+"""
+
+import argparse
+import asyncio
+from app.db.session import async_session_maker, engine
+from app.processor.archive_processor import ArchiveProcessor
+
+async def run_archive(args):
+    try:
+        async with async_session_maker() as db:
+            result = await ArchiveProcessor.archive_finished_events(
+                db, args.older_than_days, args.batch_size, args.max_events
+            )
+        print(f"Archived events ended before {result['cutoff']:%Y-%m-%d %H:%M}")
+        print(f"  Events summarized: {result['events_archived']}")
+        print(f"  Events purged: {result['events_purged']}")
+        print(f"  booking_seats rows deleted: {result['booking_seats_deleted']}")
+        print(f"  event_seats rows deleted: {result['event_seats_deleted']}")
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive finished events")
+    parser.add_argument("--older-than-days", type=int, default=None, help="defaults to ARCHIVE_AFTER_DAYS")
+    parser.add_argument("--batch-size", type=int, default=None, help="defaults to ARCHIVE_BATCH_SIZE")
+    parser.add_argument("--max-events", type=int, default=None, help="summarize at most this many new events")
+    asyncio.run(run_archive(parser.parse_args()))
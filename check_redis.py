@@ -1,36 +1,73 @@
 #!/usr/bin/env python3
 """
 Simple script to check Redis values
-Run with: python check_redis.py
+Run with: python check_redis.py [event_id]
+
+Walks the keyspace with SCAN and fetches values and TTLs in pipelined
+batches, so it is safe to run against a live Redis.
 """
 
 import asyncio
+import sys
 import redis.asyncio as aioredis
 
-async def check_redis_values():
+BATCH_SIZE = 500
+
+
+async def print_batch(redis_client, keys):
+    pipe = redis_client.pipeline(transaction=False)
+    for key in keys:
+        pipe.type(key)
+        pipe.ttl(key)
+    replies = await pipe.execute()
+
+    pipe = redis_client.pipeline(transaction=False)
+    string_keys = [key for key, key_type in zip(keys, replies[::2]) if key_type == "string"]
+    for key in string_keys:
+        pipe.get(key)
+    values = dict(zip(string_keys, await pipe.execute())) if string_keys else {}
+
+    for key, key_type, ttl in zip(keys, replies[::2], replies[1::2]):
+        value = values.get(key, f"<{key_type}>")
+        print(f"  {key}: {value} (TTL: {ttl}s)")
+
+
+async def check_redis_values(event_id=None):
     # Connect to Redis
     redis_client = aioredis.from_url("redis://localhost:6379/0", decode_responses=True)
     
     try:
-        # Get all keys
-        all_keys = await redis_client.keys("*")
-        print(f"Total keys in Redis: {len(all_keys)}")
-        
-        # Get all lock keys
-        lock_keys = await redis_client.keys("lock:*")
-        print(f"Lock keys: {len(lock_keys)}")
-        
-        for key in lock_keys:
-            value = await redis_client.get(key)
-            ttl = await redis_client.ttl(key)
-            print(f"  {key}: {value} (TTL: {ttl}s)")
-        
+        print(f"Total keys in Redis: {await redis_client.dbsize()}")
+
+        # Lock keys, from the event's lock index or by scanning
+        if event_id:
+            seat_ids = await redis_client.zrange(f"lockidx:{event_id}", 0, -1)
+            lock_keys = [f"lock:{event_id}:{seat_id}" for seat_id in seat_ids]
+            print(f"Lock keys for event {event_id}: {len(lock_keys)}")
+            for start in range(0, len(lock_keys), BATCH_SIZE):
+                await print_batch(redis_client, lock_keys[start:start + BATCH_SIZE])
+            return
+
+        print("Lock keys:")
+        batch = []
+        async for key in redis_client.scan_iter(match="lock:*", count=BATCH_SIZE):
+            batch.append(key)
+            if len(batch) == BATCH_SIZE:
+                await print_batch(redis_client, batch)
+                batch = []
+        if batch:
+            await print_batch(redis_client, batch)
+
         # Get all keys and their values
         print("\nAll keys and values:")
-        for key in all_keys:
-            value = await redis_client.get(key)
-            ttl = await redis_client.ttl(key)
-            print(f"  {key}: {value} (TTL: {ttl}s)")
+        batch = []
+        async for key in redis_client.scan_iter(count=BATCH_SIZE):
+            batch.append(key)
+            if len(batch) == BATCH_SIZE:
+                await print_batch(redis_client, batch)
+                batch = []
+        if batch:
+            await print_batch(redis_client, batch)
             
     except Exception as e:
         print(f"Error: {e}")
@@ -38,4 +75,4 @@ async def check_redis_values():
         await redis_client.close()
 
 if __name__ == "__main__":
-    asyncio.run(check_redis_values())
+    asyncio.run(check_redis_values(sys.argv[1] if len(sys.argv) > 1 else None))